@@ -50,10 +50,6 @@ from ..utils.helpers import expand_exe_path
 #   - Path to the redis-server executable
 #   - Default: /SmartSim/smartsim/bin/redis-server
 #
-# REDIS_CLI_PATH
-#   - Path to the redis-cli executable
-#   - Default: /SmartSim/smartsim/bin/redis-cli
-#
 # SMARTSIM_LOG_LEVEL
 #   - Log level for SmartSim
 #   - Default: info
@@ -122,18 +118,6 @@ class Config:
                 "Specified Redis binary at REDIS_PATH could not be used"
             ) from e
 
-    @property
-    def redis_cli(self) -> str:
-        try:
-            redis_cli_exe = self.bin_path / "redis-cli"
-            redis_cli = Path(os.environ.get("REDIS_CLI_PATH", redis_cli_exe)).resolve()
-            exe = expand_exe_path(str(redis_cli))
-            return exe
-        except (TypeError, FileNotFoundError) as e:
-            raise SSConfigError(
-                "Specified Redis binary at REDIS_CLI_PATH could not be used"
-            ) from e
-
     @property
     def log_level(self) -> str:
         return os.environ.get("SMARTSIM_LOG_LEVEL", "info")
@@ -142,6 +126,22 @@ class Config:
     def jm_interval(self) -> int:
         return int(os.environ.get("SMARTSIM_JM_INTERVAL", 10))
 
+    @property
+    def db_ready_timeout(self) -> int:
+        return int(os.environ.get("SMARTSIM_DB_READY_TIMEOUT", 120))
+
+    @property
+    def db_register_timeout(self) -> int:
+        return int(os.environ.get("SMARTSIM_DB_REGISTER_TIMEOUT", 15))
+
+    @property
+    def launch_workers(self) -> int:
+        return max(1, int(os.environ.get("SMARTSIM_LAUNCH_WORKERS", 8)))
+
+    @property
+    def lazy_window(self) -> int:
+        return max(1, int(os.environ.get("SMARTSIM_LAZY_WINDOW", 128)))
+
     @property
     def test_launcher(self) -> str:
         return os.environ.get("SMARTSIM_TEST_LAUNCHER", "local")
@@ -24,20 +24,30 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import itertools
 import os.path as osp
 import pickle
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from ...database import Orchestrator
 from ...entity import DBNode, EntityList, SmartSimEntity
 from ...error import LauncherError, SmartSimError, SSInternalError, SSUnsupportedError
 from ...log import get_logger
-from ...status import STATUS_RUNNING, TERMINAL_STATUSES
+from ...status import STATUS_NEW, STATUS_RUNNING, TERMINAL_STATUSES
 from ..config import CONFIG
 from ..launcher import *
-from ..utils import check_cluster_status, create_cluster
+from ..utils import (
+    add_cluster_shards,
+    check_cluster_status,
+    create_cluster,
+    remove_cluster_shards,
+    wait_for_shards,
+)
 from .jobmanager import JobManager
+from .registry import NODE_NAME_ENV, REGISTRY_ENV, HostRegistry
+from .window import LaunchWindow
 
 logger = get_logger(__name__)
 
@@ -58,6 +68,7 @@ class Controller:
         :type launcher: str
         """
         self._jobs = JobManager(JM_LOCK)
+        self._windows = {}
         self.init_launcher(launcher)
 
     def start(self, manifest, block=True):
@@ -107,7 +118,7 @@ class Controller:
         """
         try:
             to_monitor = self._jobs.jobs
-            while len(to_monitor) > 0:
+            while len(to_monitor) > 0 or self._windows_active():
                 time.sleep(interval)
 
                 # acquire lock to avoid "dictionary changed during iteration" error
@@ -125,6 +136,10 @@ class Controller:
             raise
 
 
+    def _windows_active(self):
+        """Check if members of lazy ensembles remain to be launched"""
+        return any(window.active for window in list(self._windows.values()))
+
     def finished(self, entity):
         """Return a boolean indicating wether a job has finished or not
 
@@ -136,6 +151,8 @@ class Controller:
         try:
             if isinstance(entity, Orchestrator):
                 raise TypeError("Finished() does not support Orchestrator instances")
+            if _is_windowed(entity):
+                return self._lazy_finished(entity)
             if isinstance(entity, EntityList):
                 return all([self.finished(ent) for ent in entity.entities])
             if not isinstance(entity, SmartSimEntity):
@@ -150,6 +167,43 @@ class Controller:
                 f"Entity {entity.name} has not been launched in this experiment"
             ) from None
 
+    def _launched_count(self, ensemble):
+        """Number of members of a lazy ensemble launched so far
+
+        :param ensemble: lazy ensemble
+        :type ensemble: Ensemble
+        :rtype: int
+        """
+        window = self._windows.get(ensemble.name)
+        return window.launched if window else len(ensemble)
+
+    def _launched_members(self, ensemble):
+        """Iterate over the names of the launched members of a lazy ensemble
+
+        :param ensemble: lazy ensemble
+        :type ensemble: Ensemble
+        :rtype: Iterator[str]
+        """
+        return itertools.islice(
+            ensemble.entities.names(), self._launched_count(ensemble)
+        )
+
+    def _lazy_finished(self, ensemble):
+        """Check if every member of a lazy ensemble has finished
+
+        :param ensemble: lazy ensemble launched in windows
+        :type ensemble: Ensemble
+        :raises KeyError: if a member was never launched
+        :rtype: bool
+        """
+        window = self._windows.get(ensemble.name)
+        if window and window.active:
+            return False
+        for name in self._launched_members(ensemble):
+            if self._jobs[name].status not in TERMINAL_STATUSES:
+                return False
+        return True
+
     def stop_entity(self, entity):
         """Stop an instance of an entity
 
@@ -159,14 +213,20 @@ class Controller:
         :param entity: entity to be stopped
         :type entity: SmartSimEntity
         """
+        self._stop_job(entity.name)
+
+    def _stop_job(self, name):
+        """Stop the job of an entity by the name of the entity
+
+        :param name: name of the entity to be stopped
+        :type name: str
+        """
         JM_LOCK.acquire()
         try:
-            job = self._jobs[entity.name]
+            job = self._jobs[name]
             if job.status not in TERMINAL_STATUSES:
                 logger.info(
-                    " ".join(
-                        ("Stopping model", entity.name, "with job name", str(job.name))
-                    )
+                    " ".join(("Stopping model", name, "with job name", str(job.name)))
                 )
                 status = self._launcher.stop(job.name)
 
@@ -189,6 +249,13 @@ class Controller:
         """
         if entity_list.batch:
             self.stop_entity(entity_list)
+        elif _is_windowed(entity_list):
+            window = self._windows.get(entity_list.name)
+            if window:
+                # no members are launched after this
+                window.stop()
+            for name in self._launched_members(entity_list):
+                self._stop_job(name)
         else:
             for entity in entity_list.entities:
                 self.stop_entity(entity)
@@ -233,6 +300,21 @@ class Controller:
             raise TypeError(f"Argument was of type {type(entity_list)} not EntityList")
         if entity_list.batch:
             return [self.get_entity_status(entity_list)]
+        if _is_windowed(entity_list):
+            launched = self._launched_count(entity_list)
+            statuses = []
+            for index, name in enumerate(entity_list.entities.names()):
+                if index >= launched:
+                    # still waiting for a place in the launch window
+                    statuses.append(STATUS_NEW)
+                    continue
+                try:
+                    statuses.append(self._jobs[name].status)
+                except KeyError:
+                    raise SmartSimError(
+                        f"Entity {name} has not been launched in this Experiment"
+                    ) from None
+            return statuses
         statuses = []
         for entity in entity_list.entities:
             statuses.append(self.get_entity_status(entity))
@@ -295,25 +377,104 @@ class Controller:
             rc._update_workers()
 
         # create all steps prior to launch
-        steps = []
+        creators = []
+        windowed = []
         all_entity_lists = manifest.ensembles + manifest.ray_clusters
         for elist in all_entity_lists:
             if elist.batch:
-                batch_step = self._create_batch_job_step(elist)
-                steps.append((batch_step, elist))
+                creators.append((self._create_batch_job_step, elist))
+            elif _is_windowed(elist):
+                # members of lazy ensembles are created a window at a time
+                windowed.append(elist)
             else:
                 # if ensemble is to be run as seperate job steps, aka not in a batch
-                job_steps = [(self._create_job_step(e), e) for e in elist.entities]
-                steps.extend(job_steps)
+                creators.extend((self._create_job_step, e) for e in elist.entities)
 
         # models themselves cannot be batch steps
         for model in manifest.models:
-            job_step = self._create_job_step(model)
-            steps.append((job_step, model))
+            creators.append((self._create_job_step, model))
+
+        # steps are written and submitted by a bounded pool of threads
+        # so that slow launcher calls overlap instead of adding up
+        entities = [entity for _, entity in creators]
+        steps = self._run_concurrently(creators, "create")
 
         # launch steps
-        for job_step in steps:
-            self._launch_step(*job_step)
+        launches = [(self._launch_step, step, e) for step, e in zip(steps, entities)]
+        self._run_concurrently(launches, "launch")
+
+        for ensemble in windowed:
+            self._launch_window(ensemble)
+
+    def _launch_window(self, ensemble):
+        """Launch the members of a lazy ensemble a window at a time
+
+        The first ``CONFIG.lazy_window`` members are launched before
+        returning, the others as earlier members finish.
+
+        :param ensemble: lazy ensemble to launch
+        :type ensemble: Ensemble
+        """
+        previous = self._windows.get(ensemble.name)
+        if previous:
+            previous.stop()
+        window = LaunchWindow(
+            ensemble, self._launch_members, self._jobs, CONFIG.lazy_window
+        )
+        self._windows[ensemble.name] = window
+        window.start()
+
+    def _launch_members(self, entities):
+        """Create and launch the steps of a list of entities
+
+        :param entities: entities to launch
+        :type entities: list[SmartSimEntity]
+        """
+        creators = [(self._create_job_step, entity) for entity in entities]
+        steps = self._run_concurrently(creators, "create")
+        launches = [(self._launch_step, step, e) for step, e in zip(steps, entities)]
+        self._run_concurrently(launches, "launch")
+        # members launched after the job manager went idle restart it
+        self._jobs.start()
+
+    @staticmethod
+    def _run_concurrently(calls, action):
+        """Make each call with at most CONFIG.launch_workers threads
+
+        Every call is made even if others fail. Failures are logged
+        per entity and the first one, in call order, is raised once
+        all calls are done.
+
+        :param calls: tuples of (function, *args) with the entity last
+        :type calls: list[tuple]
+        :param action: description of the calls used in logs
+        :type action: str
+        :return: result of each call in order
+        :rtype: list
+        """
+        if not calls:
+            return []
+        workers = min(CONFIG.launch_workers, len(calls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(func, *args) for func, *args in calls]
+            try:
+                wait(futures)
+            except BaseException:
+                # i.e. KeyboardInterrupt, don't start what is still queued
+                for future in futures:
+                    future.cancel()
+                raise
+
+        results, errors = [], []
+        for (_, *args), future in zip(calls, futures):
+            error = future.exception()
+            if error:
+                logger.error(f"Failed to {action} {args[-1].name}: {error}")
+                errors.append(error)
+            results.append(None if error else future.result())
+        if errors:
+            raise errors[0]
+        return results
 
     def _launch_orchestrator(self, orchestrator):
         """Launch an Orchestrator instance
@@ -326,32 +487,58 @@ class Controller:
         :type orchestrator: Orchestrator
         """
         orchestrator.remove_stale_files()
+        # shards push their address to the registry once started
+        with HostRegistry(orchestrator._interface) as registry:
+            self._set_registry_env(registry, orchestrator.entities)
 
-        # if the orchestrator was launched as a batch workload
-        if orchestrator.batch:
-            orc_batch_step = self._create_batch_job_step(orchestrator)
-            self._launch_step(orc_batch_step, orchestrator)
+            # if the orchestrator was launched as a batch workload
+            if orchestrator.batch:
+                orc_batch_step = self._create_batch_job_step(orchestrator)
+                self._launch_step(orc_batch_step, orchestrator)
 
-        # if orchestrator was run on existing allocation, locally, or in allocation
-        else:
-            db_steps = [(self._create_job_step(db), db) for db in orchestrator]
-            for db_step in db_steps:
-                self._launch_step(*db_step)
+            # if orchestrator was run on existing allocation, locally, or in allocation
+            else:
+                db_steps = [(self._create_job_step(db), db) for db in orchestrator]
+                for db_step in db_steps:
+                    self._launch_step(*db_step)
 
-        # wait for orchestrator to spin up
-        self._orchestrator_launch_wait(orchestrator)
+            # wait for orchestrator to spin up
+            self._orchestrator_launch_wait(orchestrator)
+            self._collect_db_hosts(registry, orchestrator.entities)
 
         # set the jobs in the job manager to provide SSDB variable to entities
         # if _host isnt set within each
         self._jobs.set_db_hosts(orchestrator)
 
+        # wait for every shard to accept connections
+        def _failed():
+            statuses = self.get_entity_list_status(orchestrator)
+            return any([stat in TERMINAL_STATUSES for stat in statuses])
+
+        try:
+            wait_for_shards(
+                orchestrator.hosts,
+                orchestrator.ports,
+                timeout=CONFIG.db_ready_timeout,
+                failed=_failed,
+            )
+        except SSInternalError as e:
+            self.stop_entity_list(orchestrator)
+            msg = "Orchestrator failed during startup"
+            msg += f" See {orchestrator.path} for details"
+            raise SmartSimError(msg) from e
+
         # create the database cluster
         if orchestrator.num_shards > 2:
             num_trials = 5
             cluster_created = False
             while not cluster_created:
                 try:
-                    create_cluster(orchestrator.hosts, orchestrator.ports)
+                    create_cluster(
+                        orchestrator.hosts,
+                        orchestrator.ports,
+                        replicas=orchestrator.replicas_per_shard,
+                    )
                     check_cluster_status(orchestrator.hosts, orchestrator.ports)
                     logger.info(
                         f"Database cluster created with {orchestrator.num_shards} shards"
@@ -367,9 +554,125 @@ class Controller:
                     else:
                         # surface SSInternalError as we have no way to recover
                         raise
+        orchestrator._controller = self
+        orchestrator._preload_ml()
         self._save_orchestrator(orchestrator)
         logger.debug(f"Orchestrator launched on nodes: {orchestrator.hosts}")
 
+    def add_db_shards(self, orchestrator, dbnodes):
+        """Launch new shards and add them to a running orchestrator
+
+        :param orchestrator: orchestrator to add shards to
+        :type orchestrator: Orchestrator
+        :param dbnodes: shards to launch
+        :type dbnodes: list[DBNode]
+        :raises SmartSimError: if the shards fail during startup
+        """
+        hosts = orchestrator.hosts
+        with HostRegistry(orchestrator._interface) as registry:
+            self._set_registry_env(registry, dbnodes)
+            for dbnode in dbnodes:
+                dbnode.remove_stale_dbnode_files()
+                self._launch_step(self._create_job_step(dbnode), dbnode)
+
+            # the new shards are only used by entities once they own slots
+            try:
+                self._dbnodes_launch_wait(dbnodes)
+                self._collect_db_hosts(registry, dbnodes)
+                for dbnode in dbnodes:
+                    self._jobs.db_jobs[dbnode.name].hosts = [dbnode.host]
+                new_hosts = [dbnode.host for dbnode in dbnodes]
+                wait_for_shards(
+                    new_hosts, orchestrator.ports, timeout=CONFIG.db_ready_timeout
+                )
+            except (SmartSimError, SSInternalError) as e:
+                for dbnode in dbnodes:
+                    self.stop_entity(dbnode)
+                raise SmartSimError("New database shards failed during startup") from e
+
+        add_cluster_shards(hosts, orchestrator.ports, new_hosts)
+        orchestrator.entities.extend(dbnodes)
+        orchestrator.db_nodes += len(dbnodes)
+        orchestrator._hosts = []
+        # copies of models are placed per shard by the clients
+        orchestrator._preload_ml()
+        self._save_orchestrator(orchestrator)
+        logger.info(f"Database cluster resharded to {orchestrator.num_shards} shards")
+
+    def remove_db_shards(self, orchestrator, num_shards):
+        """Remove the last shards of a running orchestrator
+
+        :param orchestrator: orchestrator to remove shards from
+        :type orchestrator: Orchestrator
+        :param num_shards: number of shards to remove
+        :type num_shards: int
+        """
+        dbnodes = orchestrator.entities[-num_shards:]
+        remaining = orchestrator.entities[:-num_shards]
+        hosts = orchestrator._get_db_hosts()
+        remove_cluster_shards(
+            hosts[: len(hosts) - num_shards],
+            orchestrator.ports,
+            [dbnode.host for dbnode in dbnodes],
+        )
+        for dbnode in dbnodes:
+            self.stop_entity(dbnode)
+        orchestrator.entities = remaining
+        orchestrator.db_nodes -= num_shards
+        orchestrator._hosts = []
+        # copies of models are placed per shard by the clients
+        orchestrator._preload_ml()
+        self._save_orchestrator(orchestrator)
+        logger.info(f"Database cluster resharded to {orchestrator.num_shards} shards")
+
+    def _set_registry_env(self, registry, dbnodes):
+        """Have the shards of dbnodes push their address to registry
+
+        :param registry: running registry
+        :type registry: HostRegistry
+        :param dbnodes: database nodes about to be launched
+        :type dbnodes: list[DBNode]
+        """
+        for dbnode in dbnodes:
+            env = registry.get_env(dbnode.name)
+            run_settings = dbnode.run_settings
+            for settings in [run_settings] + list(getattr(run_settings, "mpmd", [])):
+                # drop the registry of an earlier launch
+                settings.env_vars.pop(REGISTRY_ENV, None)
+                settings.env_vars.pop(NODE_NAME_ENV, None)
+                settings.env_vars.update(env)
+
+    def _collect_db_hosts(self, registry, dbnodes):
+        """Set the hosts the shards registered with or wrote to their output files
+
+        Database nodes whose shards were not found in time keep
+        reading their address from their output files.
+
+        :param registry: registry the shards registered with
+        :type registry: HostRegistry
+        :param dbnodes: launched database nodes
+        :type dbnodes: list[DBNode]
+        """
+        counts = {
+            dbnode.name: len(dbnode._shard_ids) if dbnode._mpmd else 1
+            for dbnode in dbnodes
+        }
+        by_name = {dbnode.name: dbnode for dbnode in dbnodes}
+        hosts = registry.wait(
+            counts,
+            CONFIG.db_register_timeout,
+            read_files=lambda name: by_name[name]._read_db_hosts(),
+        )
+        for dbnode in dbnodes:
+            if dbnode.name not in hosts:
+                logger.debug(f"{dbnode.name} was not found yet, reading output files")
+                dbnode._host = None
+                dbnode._hosts = None
+            elif dbnode._mpmd:
+                dbnode.set_hosts(hosts[dbnode.name])
+            else:
+                dbnode.set_host(hosts[dbnode.name][0])
+
     def _launch_step(self, job_step, entity):
         """Use the launcher to launch a job stop
 
@@ -460,8 +763,20 @@ class Controller:
         # Set address to local if it's a colocated model
         if hasattr(entity, "colocated"):
             if entity.colocated:
-                port = entity.run_settings.colocated_db_settings["port"]
-                client_env["SSDB"] = f"127.0.0.1:{str(port)}"
+                db_settings = entity.run_settings.colocated_db_settings
+                drain = db_settings.get("drain", None)
+                if drain and drain["to"] == "orchestrator":
+                    if not addresses:
+                        raise SmartSimError(
+                            f"Model {entity.name} drains its co-located database "
+                            "to an Orchestrator, but no Orchestrator is running"
+                        )
+                    client_env["SSDB_DRAIN"] = ",".join(addresses)
+                if db_settings.get("unix_socket", None):
+                    client_env["SSDB"] = f"unix://{db_settings['unix_socket']}"
+                else:
+                    port = db_settings["port"]
+                    client_env["SSDB"] = f"127.0.0.1:{str(port)}"
         entity.run_settings.update_env(client_env)
 
 
@@ -515,8 +830,6 @@ class Controller:
                 statuses = self.get_entity_list_status(orchestrator)
                 if all([stat == STATUS_RUNNING for stat in statuses]):
                     ready = True
-                    # TODO remove in favor of by node status check
-                    time.sleep(CONFIG.jm_interval)
                 elif any([stat in TERMINAL_STATUSES for stat in statuses]):
                     self.stop_entity_list(orchestrator)
                     msg = "Orchestrator failed during startup"
@@ -535,6 +848,24 @@ class Controller:
                 # launch explicitly
                 raise
 
+    def _dbnodes_launch_wait(self, dbnodes):
+        """Wait for shards launched into a running orchestrator to run
+
+        :param dbnodes: launched shards
+        :type dbnodes: list[DBNode]
+        :raises SmartSimError: if a shard fails during startup
+        """
+        while True:
+            time.sleep(CONFIG.jm_interval)
+            if not self._jobs.actively_monitoring:
+                self._jobs.check_jobs()
+            statuses = [self.get_entity_status(dbnode) for dbnode in dbnodes]
+            if all([stat == STATUS_RUNNING for stat in statuses]):
+                return
+            if any([stat in TERMINAL_STATUSES for stat in statuses]):
+                raise SmartSimError("Database shard failed during startup")
+            logger.debug("Waiting for new database shards to spin up...")
+
     def reload_saved_db(self, checkpoint_file):
         JM_LOCK.acquire()
         try:
@@ -588,6 +919,12 @@ class Controller:
             if not self._jobs.actively_monitoring:
                 self._jobs.start()
 
+            orc._controller = self
             return orc
         finally:
             JM_LOCK.release()
+
+
+def _is_windowed(entity_list):
+    """Check if the members of an entity list are launched in windows"""
+    return getattr(entity_list, "lazy", False) and not entity_list.batch
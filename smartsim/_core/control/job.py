@@ -25,9 +25,13 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import time
+from collections import namedtuple
 
 from ...status import STATUS_NEW
 
+# what is kept of the entity of a finished job once it is released
+EntityRecord = namedtuple("EntityRecord", ["name", "type", "path"])
+
 
 class Job:
     """Keep track of various information for the controller.
@@ -83,6 +87,17 @@ class Job:
         self.error = error
         self.output = output
 
+    def release_entity(self):
+        """Keep only the name, type and path of the entity of this job
+
+        Used for members of lazy ensembles so that finished jobs do
+        not keep every member of a sweep alive.
+        """
+        if not isinstance(self.entity, EntityRecord):
+            self.entity = EntityRecord(
+                self.entity.name, self.entity.type, self.entity.path
+            )
+
     def record_history(self):
         """Record the launching history of a job."""
         job_time = time.time() - self.start_time
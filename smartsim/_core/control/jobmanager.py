@@ -72,7 +72,18 @@ class JobManager:
         self._lock = lock  # thread lock
 
     def start(self):
-        """Start a thread for the job manager"""
+        """Start a thread for the job manager
+
+        Members of lazy ensembles are launched from other threads,
+        so only the first call starts it.
+        """
+        self._lock.acquire()
+        try:
+            if self.actively_monitoring:
+                return
+            self.actively_monitoring = True
+        finally:
+            self._lock.release()
         self.monitor = Thread(name="JobManager", daemon=True, target=self.run)
         self.monitor.start()
 
@@ -110,9 +121,15 @@ class JobManager:
                         self.move_to_completed(job)
 
             # if no more jobs left to actively monitor
-            if not self():
-                self.actively_monitoring = False
-                logger.debug("Sleeping, no jobs to monitor")
+            self._lock.acquire()
+            try:
+                if not self():
+                    self.actively_monitoring = False
+                    logger.debug("Sleeping, no jobs to monitor")
+                    # a later start launches a new thread
+                    break
+            finally:
+                self._lock.release()
 
     def move_to_completed(self, job):
         """Move job to completed queue so that its no longer
@@ -218,6 +235,8 @@ class JobManager:
             statuses = self._launcher.get_step_update(job_name_map.keys())
             for job_name, status in statuses:
                 job = self[job_name_map[job_name]]
+                if not job.is_task:
+                    self._update_job_id(job)
                 # uses abstract step interface
                 job.set_status(
                     status.status,
@@ -229,6 +248,21 @@ class JobManager:
         finally:
             self._lock.release()
 
+    def _update_job_id(self, job):
+        """Use the step id a launcher learned after launch, e.g. a
+        jsrun step id that replaces its placeholder
+
+        :param job: job of a managed step
+        :type job: Job
+        """
+        try:
+            step_id = self._launcher.step_mapping[job.name].step_id
+        except (AttributeError, KeyError):
+            return
+        if step_id and step_id != job.jid:
+            logger.debug(f"Job id of {job.ename} resolved to {step_id}")
+            job.jid = step_id
+
     def get_status(self, entity):
         """Return the status of a job.
 
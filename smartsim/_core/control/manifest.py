@@ -186,6 +186,8 @@ class Manifest:
         if self.db:
             s += db_header
             s += f"Shards: {self.db.num_shards}\n"
+            if self.db.replicas_per_shard:
+                s += f"Replicas per shard: {self.db.replicas_per_shard}\n"
             s += f"Port: {str(self.db.ports[0])}\n"
             s += f"Network: {self.db._interface}\n"
             s += f"Batch Launch: {self.db.batch}\n"
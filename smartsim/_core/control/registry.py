@@ -0,0 +1,172 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021-2022, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hmac
+import secrets
+import socketserver
+import threading
+import time
+
+from ...log import get_logger
+from ..utils.network import current_ip
+
+logger = get_logger(__name__)
+
+# environment variables read by the database entrypoint
+REGISTRY_ENV = "SSDB_REGISTRY"
+NODE_NAME_ENV = "SSDB_NODE_NAME"
+
+
+class _RegistryHandler(socketserver.StreamRequestHandler):
+    """Record the ``<token> <name> <address>`` line sent by a shard"""
+
+    def handle(self):
+        line = self.rfile.readline(1024).decode("utf-8", "replace").split()
+        registry = self.server.registry
+        if len(line) == 3 and hmac.compare_digest(line[0], registry.token):
+            registry._register(line[1], line[2])
+        else:
+            logger.debug(f"Ignored registration from {self.client_address[0]}")
+
+
+class HostRegistry:
+    """Listener the database shards push their address to
+
+    Shards launched with the environment from ``get_env`` connect
+    back to the driver as soon as they know their address. The
+    output files of the shards are read alongside, so sites where
+    the driver can not be reached are not slowed down.
+    """
+
+    def __init__(self, interface="lo"):
+        """Initialize a HostRegistry
+
+        :param interface: network interface of the orchestrator, the
+                          registry listens on the address the driver
+                          has on it, defaults to "lo"
+        :type interface: str, optional
+        """
+        self.token = secrets.token_hex(16)
+        self._interface = interface
+        self._hosts = {}
+        self._cond = threading.Condition()
+        self._server = None
+
+    def start(self):
+        """Start listening on a free port of the orchestrator interface
+
+        Nothing listens if the driver does not have the interface,
+        shards are then only found through their output files.
+        """
+        try:
+            ip = current_ip(self._interface)
+        except ValueError as e:
+            logger.debug(f"Not listening for database shards: {e}")
+            return
+        self._server = socketserver.ThreadingTCPServer((ip, 0), _RegistryHandler)
+        self._server.daemon_threads = True
+        self._server.registry = self
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+
+    def stop(self):
+        """Stop listening"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def address(self):
+        """Address the shards connect to, None if not listening
+
+        :rtype: str | None
+        """
+        if not self._server:
+            return None
+        ip, port = self._server.server_address[:2]
+        return f"{ip}:{port}"
+
+    def get_env(self, name):
+        """Environment a shard needs to register
+
+        :param name: name of the database node of the shard
+        :type name: str
+        :return: empty if the registry is not listening
+        :rtype: dict[str, str]
+        """
+        if not self._server:
+            return {}
+        return {REGISTRY_ENV: f"{self.token}@{self.address}", NODE_NAME_ENV: name}
+
+    def _register(self, name, address):
+        with self._cond:
+            self._hosts.setdefault(name, []).append(address)
+            self._cond.notify_all()
+        logger.debug(f"Database node {name} registered at {address}")
+
+    def wait(self, counts, timeout, read_files=None, interval=1):
+        """Wait for shards to register or to write their output files
+
+        :param counts: number of shards of each database node
+        :type counts: dict[str, int]
+        :param timeout: seconds to wait at most
+        :type timeout: float
+        :param read_files: called with the name of a database node that
+                           has not registered, returns the addresses in
+                           its output files or None if not all are there
+        :type read_files: callable, optional
+        :param interval: seconds between reads of the output files
+        :type interval: float, optional
+        :return: addresses of the database nodes whose shards were all
+                 found, the others are left out
+        :rtype: dict[str, list[str]]
+        """
+        deadline = time.monotonic() + timeout
+        found = {}
+        while True:
+            with self._cond:
+                for name, count in counts.items():
+                    if name not in found and len(self._hosts.get(name, [])) >= count:
+                        found[name] = list(self._hosts[name][:count])
+            if read_files:
+                for name in counts:
+                    if name not in found:
+                        addresses = read_files(name)
+                        if addresses:
+                            found[name] = addresses
+            remaining = deadline - time.monotonic()
+            if len(found) == len(counts) or remaining <= 0:
+                return found
+            with self._cond:
+                self._cond.wait(min(remaining, interval))
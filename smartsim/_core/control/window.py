@@ -0,0 +1,131 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021-2022, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import threading
+
+from ...log import get_logger
+
+logger = get_logger(__name__)
+
+
+class LaunchWindow:
+    """Launch the members of a lazy ensemble a window at a time
+
+    At most ``size`` members of the ensemble are created, launched
+    and monitored at once. The first window is launched by ``start``
+    and later members are launched from a thread as earlier ones
+    finish, so members and their job steps are only held while
+    they are in flight.
+    """
+
+    def __init__(self, ensemble, launch, jobs, size, interval=1):
+        """Initialize a LaunchWindow
+
+        :param ensemble: lazy ensemble to launch
+        :type ensemble: Ensemble
+        :param launch: function that creates and launches a list of members
+        :type launch: callable
+        :param jobs: job manager the members are launched into
+        :type jobs: JobManager
+        :param size: maximum number of members in flight
+        :type size: int
+        :param interval: seconds between checks for finished members
+        :type interval: float, optional
+        """
+        self.ensemble = ensemble
+        self.launched = 0  # members are launched in index order
+        self.error = None
+        self._launch = launch
+        self._jobs = jobs
+        self._size = max(1, size)
+        self._interval = interval
+        self._in_flight = []
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def active(self):
+        """True while members remain to be launched"""
+        return (
+            self.launched < len(self.ensemble)
+            and not self._stopped.is_set()
+            and self.error is None
+        )
+
+    def start(self):
+        """Launch the first window and feed the rest from a thread
+
+        :raises SmartSimError: if the first window fails to launch
+        """
+        self._fill()
+        if self.active:
+            self._thread = threading.Thread(
+                name=f"{self.ensemble.name}-window", daemon=True, target=self._run
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop launching members, members in flight keep running"""
+        self._stopped.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        while self.active:
+            self._stopped.wait(self._interval)
+            if self._stopped.is_set():
+                break
+            try:
+                self._fill()
+            except Exception as e:
+                logger.error(f"Stopped launching members of {self.ensemble.name}: {e}")
+                self.error = e
+
+    def _fill(self):
+        """Launch members until the window is full"""
+        self._in_flight = [name for name in self._in_flight if self._running(name)]
+        stop = min(
+            len(self.ensemble), self.launched + self._size - len(self._in_flight)
+        )
+        if stop <= self.launched:
+            return
+        members = [self.ensemble.entities.member(i) for i in range(self.launched, stop)]
+        self._in_flight.extend(member.name for member in members)
+        self.launched = stop
+        self._launch(members)
+
+    def _running(self, name):
+        """Check if a member is in flight, releasing it once finished"""
+        try:
+            job = self._jobs[name]
+        except KeyError:
+            # failed to launch
+            return False
+        if name in self._jobs.completed:
+            # finished members are rebuilt if they are needed again
+            job.release_entity()
+            return False
+        return True
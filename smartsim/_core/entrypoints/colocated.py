@@ -25,10 +25,16 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import os
+import shutil
 import signal
 import sys
+import threading
+import time
 import psutil
+import redis
+from smartredis import Client
 import argparse
+import json
 import tempfile
 import filelock
 import socket
@@ -37,12 +43,16 @@ from typing import List
 from pathlib import Path
 from subprocess import PIPE, STDOUT
 
+from smartsim._core.config import CONFIG
 from smartsim._core.utils.network import current_ip
+from smartsim._core.utils.redis import connect_to_addresses, drain_keys, preload_ml
 from smartsim.error import SSInternalError
 from smartsim.log import get_logger
 logger = get_logger(__name__)
 
 DBPID = None
+READY_FILE = None
+DRAIN = None
 
 # kill is not catchable
 SIGNALS = [
@@ -52,12 +62,275 @@ SIGNALS = [
     signal.SIGABRT
     ]
 
+NUMA_ROOT = "/sys/devices/system/node"
+NET_ROOT = "/sys/class/net"
+
+
 def handle_signal(signo, frame):
     cleanup()
 
 
-def main(network_interface: str, db_cpus: int, command: List[str]):
+def parse_cpulist(cpulist: str) -> List[int]:
+    """Parse a kernel cpulist such as ``0-3,8,10-11``"""
+    cpus = []
+    for part in cpulist.strip().split(","):
+        if not part:
+            continue
+        start, _, stop = part.partition("-")
+        cpus.extend(range(int(start), int(stop or start) + 1))
+    return cpus
+
+
+def format_cpulist(cpus: List[int]) -> str:
+    """Format CPUs as a kernel cpulist accepted by taskset"""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(
+        str(start) if start == stop else f"{start}-{stop}" for start, stop in ranges
+    )
+
+
+def get_numa_nodes(root: str = NUMA_ROOT):
+    """Map each NUMA node of this host to its CPUs
+
+    :return: CPUs of each node, empty if the topology is not exposed
+    :rtype: dict[int, list[int]]
+    """
+    nodes = {}
+    if not os.path.isdir(root):
+        return nodes
+    for entry in os.listdir(root):
+        cpulist = os.path.join(root, entry, "cpulist")
+        if entry.startswith("node") and entry[4:].isdigit() and os.path.isfile(cpulist):
+            with open(cpulist) as f:
+                cpus = parse_cpulist(f.read())
+            if cpus:
+                nodes[int(entry[4:])] = cpus
+    return nodes
+
+
+def get_nic_numa_node(network_interface: str, root: str = NET_ROOT):
+    """Get the NUMA node a network interface is attached to, if known"""
+    try:
+        with open(os.path.join(root, network_interface, "device", "numa_node")) as f:
+            node = int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+    return node if node >= 0 else None
+
+
+def plan_cpu_layout(allowed: List[int], db_cpus: int, numa_nodes, preferred=None):
+    """Choose the CPUs of the database and of the application
+
+    The database gets ``db_cpus`` CPUs of a single NUMA node, the
+    preferred one (e.g. the node of the NIC) if it has enough allowed
+    CPUs, else the last node that does. The application gets the rest.
+    Without a usable NUMA node the last allowed CPUs are used.
+
+    :param allowed: CPUs this process may run on
+    :type allowed: list[int]
+    :param db_cpus: number of CPUs for the database
+    :type db_cpus: int
+    :param numa_nodes: CPUs of each NUMA node
+    :type numa_nodes: dict[int, list[int]]
+    :param preferred: NUMA node to try first, defaults to None
+    :type preferred: int, optional
+    :return: NUMA node (or None), database CPUs and application CPUs
+    :rtype: tuple[int, list[int], list[int]]
+    """
+    allowed = sorted(set(allowed))
+    candidates = sorted(numa_nodes, reverse=True)
+    if preferred in numa_nodes:
+        candidates.remove(preferred)
+        candidates.insert(0, preferred)
+
+    node, db_set = None, allowed[-db_cpus:]
+    for candidate in candidates:
+        cpus = sorted(set(numa_nodes[candidate]).intersection(allowed))
+        if len(cpus) >= db_cpus:
+            node, db_set = candidate, cpus[-db_cpus:]
+            break
+    app_set = [cpu for cpu in allowed if cpu not in db_set] or allowed
+    return node, db_set, app_set
+
+
+def get_cpu_layout(network_interface: str, db_cpus: int):
+    """Plan the CPU layout of this host for a colocated database"""
+    allowed = sorted(os.sched_getaffinity(0))
+    preferred = None
+    if network_interface != "lo":
+        preferred = get_nic_numa_node(network_interface)
+    return plan_cpu_layout(allowed, db_cpus, get_numa_nodes(), preferred)
+
+
+def get_ready_file(lockfile: str) -> Path:
+    """Path of the file announcing that the database of this host is ready"""
+    return Path(tempfile.gettempdir()) / (Path(lockfile).stem + ".ready")
+
+
+def get_endpoint(command: List[str], lo_address: str) -> str:
+    """Get the address clients on this host use to reach the database"""
+    if "--unixsocket" in command:
+        return f"unix://{command[command.index('--unixsocket') + 1]}"
+    return f"{lo_address}:{command[command.index('--port') + 1]}"
+
+
+def has_exited(db_proc) -> bool:
+    """Check if the database process exited
+
+    psutil reports processes that exited but were not reaped yet
+    as running, so zombies are treated as exited too.
+    """
+    try:
+        if db_proc.poll() is not None:
+            return True
+        return db_proc.status() == psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return True
+
+
+def publish_ready(
+    ready_file: Path, endpoint: str, db_proc, before_ready=None, timeout=None
+) -> bool:
+    """Write the endpoint to ``ready_file`` once the database answers
+
+    The file is written atomically so readers never see it partially.
+    ``before_ready`` is called first, once the database answers.
+
+    :return: True if published, False if the database exited or did
+             not answer within ``timeout`` seconds (``CONFIG.db_ready_timeout``
+             by default)
+    :rtype: bool
+    """
+    if timeout is None:
+        timeout = CONFIG.db_ready_timeout
+    if endpoint.startswith("unix://"):
+        client = redis.Redis(unix_socket_path=endpoint[len("unix://"):], socket_timeout=5)
+    else:
+        host, port = endpoint.rsplit(":", 1)
+        client = redis.Redis(host=host, port=int(port), socket_timeout=5)
+    deadline = time.time() + timeout
+    while not has_exited(db_proc):
+        if time.time() > deadline:
+            logger.error(f"Co-located database at {endpoint} did not answer in {timeout}s")
+            return False
+        try:
+            # redis-server only answers once its modules are loaded
+            if client.ping():
+                if before_ready:
+                    before_ready()
+                tmp_file = ready_file.with_suffix(".tmp")
+                tmp_file.write_text(endpoint + "\n")
+                os.replace(tmp_file, ready_file)
+                logger.debug(f"Co-located database ready at {endpoint}")
+                return True
+        except redis.RedisError:
+            time.sleep(0.1)
+    return False
+
+
+def wait_ready(ready_file: Path, timeout: float) -> bool:
+    """Block until the database of this host is ready
+
+    :return: True if the database is ready, False on timeout
+    :rtype: bool
+    """
+    deadline = time.time() + timeout
+    while not ready_file.exists():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.1)
+    return True
+
+
+class Drain:
+    """Copy selected keys of the co-located database elsewhere
+
+    Keys are copied to a central database, whose addresses are given
+    by the ``SSDB_DRAIN`` environment variable, or to a dump file per
+    host in a directory.
+
+    :param endpoint: address of the co-located database
+    :type endpoint: str
+    :param patterns: glob-style patterns of the keys to copy
+    :type patterns: list[str]
+    :param target: "orchestrator" or a directory for dump files
+    :type target: str
+    """
+
+    def __init__(self, endpoint: str, patterns: List[str], target: str):
+        self.patterns = patterns
+        self.target = target
+        self._lock = threading.Lock()
+        if endpoint.startswith("unix://"):
+            self.source = redis.Redis(unix_socket_path=endpoint[len("unix://"):])
+        else:
+            host, port = endpoint.rsplit(":", 1)
+            self.source = redis.Redis(host=host, port=int(port))
+
+    def run(self):
+        # scheduled and final drains must not interleave
+        with self._lock:
+            start = time.time()
+            if self.target == "orchestrator":
+                addresses = os.environ["SSDB_DRAIN"].split(",")
+                copied = drain_keys(
+                    self.source, self.patterns, connect_to_addresses(addresses)
+                )
+            else:
+                os.makedirs(self.target, exist_ok=True)
+                dump_file = Path(self.target) / f"{socket.gethostname()}.dump"
+                tmp_file = dump_file.with_suffix(".tmp")
+                # every drain holds the full set of matching keys
+                with open(tmp_file, "wb") as f:
+                    copied = drain_keys(self.source, self.patterns, f)
+                os.replace(tmp_file, dump_file)
+            logger.info(
+                f"Drained {copied} keys to {self.target} in {time.time() - start:.2f}s"
+            )
+
+    def run_every(self, interval: float):
+        while True:
+            time.sleep(interval)
+            try:
+                self.run()
+            except Exception as e:
+                logger.warning(f"Scheduled drain of co-located database failed: {e}")
+
+
+def load_preload_file(preload_file: str, endpoint: str):
+    """Load the models and scripts listed in a JSON file into the database"""
+    with open(preload_file) as f:
+        ml = json.load(f)
+    start = time.time()
+    try:
+        client = Client(address=endpoint, cluster=False)
+        preload_ml(client, ml["models"], ml["scripts"])
+    except Exception as e:
+        # the database is never announced and the ranks fail waiting on it
+        logger.error(f"Failed to load models into co-located database: {str(e)}")
+        raise
+    logger.info(
+        f"Loaded {len(ml['models'])} models and {len(ml['scripts'])} scripts "
+        f"in {time.time() - start:.2f}s"
+    )
+
+
+def main(
+    network_interface: str,
+    db_cpus: int,
+    command: List[str],
+    drain_patterns: List[str] = None,
+    drain_to: str = None,
+    drain_interval: float = None,
+    preload_file: str = None,
+):
     global DBPID
+    global DRAIN
 
     try:
         ip_address = current_ip(network_interface)
@@ -74,10 +347,22 @@ def main(network_interface: str, db_cpus: int, command: List[str]):
         # address that exists and is not the loopback address
         cmd = command + [f"--bind {lo_address} {ip_address}"]
 
+    numa_node, cpus_to_use, app_cpus = None, None, None
+    if sys.platform != "darwin":
+        numa_node, cpus_to_use, app_cpus = get_cpu_layout(network_interface, db_cpus)
+        # bind database memory to the node its CPUs are on
+        if numa_node is not None and shutil.which("numactl"):
+            cmd = ["numactl", f"--membind={numa_node}"] + cmd
+
+    def _pin():
+        # threads started by the database inherit the affinity
+        if cpus_to_use:
+            os.sched_setaffinity(0, cpus_to_use)
+
     # we generally want to catch all exceptions here as
     # if this process dies, the application will most likely fail
     try:
-        p = psutil.Popen(cmd, stdout=PIPE, stderr=STDOUT)
+        p = psutil.Popen(cmd, stdout=PIPE, stderr=STDOUT, preexec_fn=_pin)
         DBPID = p.pid
 
     except Exception as e:
@@ -86,22 +371,40 @@ def main(network_interface: str, db_cpus: int, command: List[str]):
         raise SSInternalError("Co-located process failed to start") from e
 
     try:
-        if sys.platform != "darwin":
-            # Set CPU affinity to the last $db_cpus CPUs
-            affinity = p.cpu_affinity()
-            cpus_to_use = affinity[-db_cpus:]
-            p.cpu_affinity(cpus_to_use)
-        else:
+        if cpus_to_use is None:
             # psutil doesn't support pinning on MacOS
             cpus_to_use = "CPU pinning disabled on MacOS"
+        else:
+            cpus_to_use = format_cpulist(cpus_to_use)
+            app_cpus = format_cpulist(app_cpus)
 
-        logger.debug("\n\nCo-located database information\n" +  "\n".join((
+        logger.info("\n\nCo-located database information\n" +  "\n".join((
             f"\tIP Address: {ip_address}",
             f"\t# of Database CPUs: {db_cpus}",
+            f"\tNUMA node: {numa_node}",
             f"\tAffinity: {cpus_to_use}",
+            f"\tApplication affinity: {app_cpus}",
             f"\tCommand: {' '.join(cmd)}\n\n"
         )))
 
+        endpoint = get_endpoint(command, lo_address)
+        before_ready = None
+        if preload_file:
+            before_ready = lambda: load_preload_file(preload_file, endpoint)
+        if READY_FILE:
+            threading.Thread(
+                target=publish_ready,
+                args=(READY_FILE, endpoint, p, before_ready),
+                daemon=True,
+            ).start()
+
+        if drain_patterns:
+            DRAIN = Drain(endpoint, drain_patterns, drain_to)
+            if drain_interval:
+                threading.Thread(
+                    target=DRAIN.run_every, args=(drain_interval,), daemon=True
+                ).start()
+
         for line in iter(p.stdout.readline, b""):
             print(line.decode("utf-8").rstrip(), flush=True)
 
@@ -114,6 +417,15 @@ def main(network_interface: str, db_cpus: int, command: List[str]):
 def cleanup():
     global DBPID
     global LOCK
+    global DRAIN
+    if DRAIN:
+        # keep the selected keys before the database goes away
+        try:
+            DRAIN.run()
+        except Exception as e:
+            logger.warning(f"Failed to drain co-located database: {str(e)}")
+        DRAIN = None
+
     try:
         logger.debug("Cleaning up co-located database")
         # attempt to stop the database process
@@ -128,6 +440,9 @@ def cleanup():
             f"Failed to clean up co-located database gracefully: {str(e)}"
         )
     finally:
+        if READY_FILE and READY_FILE.exists():
+            READY_FILE.unlink()
+
         if LOCK.is_locked:
             LOCK.release()
 
@@ -144,12 +459,38 @@ if __name__ == "__main__":
         parser.add_argument("+lockfile", type=str, help="Filename to create for single proc per host")
         parser.add_argument("+db_cpus", type=int, default=2, help="Number of CPUs to use for DB")
         parser.add_argument("+command", nargs="+", help="Command to run")
+        parser.add_argument("+app_cpus", action="store_true", help="Print the CPUs left for the application")
+        parser.add_argument("+wait_ready", type=float, help="Seconds to wait for the database of this host")
+        parser.add_argument("+drain_keys", nargs="+", help="Key patterns to drain at shutdown")
+        parser.add_argument("+drain_to", type=str, default="orchestrator", help="Drain target")
+        parser.add_argument("+drain_interval", type=float, help="Seconds between drains")
+        parser.add_argument("+preload", type=str, help="JSON file of models and scripts to load")
         args = parser.parse_args()
 
+        if args.wait_ready is not None:
+            # every rank blocks until the database of its host answers
+            # and is then given the path of the readiness file
+            ready_file = get_ready_file(args.lockfile)
+            if not wait_ready(ready_file, args.wait_ready):
+                logger.error(
+                    f"Co-located database not ready after {args.wait_ready} seconds"
+                )
+                exit(1)
+            print(ready_file)
+            exit(0)
+
+        if args.app_cpus:
+            # the layout is deterministic so the application can be pinned
+            # to the CPUs the database does not use
+            _, _, app_cpus = get_cpu_layout(args.ifname, args.db_cpus)
+            print(format_cpulist(app_cpus))
+            exit(0)
+
         tmp_lockfile = Path(tempfile.gettempdir()) / args.lockfile
 
         LOCK = filelock.FileLock(tmp_lockfile)
         LOCK.acquire(timeout=.1)
+        READY_FILE = get_ready_file(args.lockfile)
         logger.debug(f"Starting co-located database on host: {socket.gethostname()}")
 
         os.environ["PYTHONUNBUFFERED"] = "1"
@@ -160,7 +501,15 @@ if __name__ == "__main__":
         for sig in SIGNALS:
             signal.signal(sig, handle_signal)
 
-        main(args.ifname, args.db_cpus, args.command)
+        main(
+            args.ifname,
+            args.db_cpus,
+            args.command,
+            args.drain_keys,
+            args.drain_to,
+            args.drain_interval,
+            args.preload,
+        )
 
     # gracefully exit the processes in the distributed application that
     # we do not want to have start a colocated process. Only one process
@@ -0,0 +1,218 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import argparse
+import threading
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+from smartredis import Client
+
+from smartsim.log import get_logger
+
+logger = get_logger(__name__)
+
+"""
+Inference throughput benchmark
+
+Sweeps the RedisAI batch size of a model and reports the throughput
+and latency percentiles of concurrent single-sample requests, e.g.
+
+    python -m smartsim._core.entrypoints.inference_benchmark \
+        +address 127.0.0.1:6780 +model cnn.pt +backend TORCH \
+        +shape 1 3 32 32 +batch_sizes 0 4 16
+"""
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of the samples"""
+    ordered = sorted(samples)
+    rank = int(np.ceil(q / 100 * len(ordered))) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Throughput in requests/s and latencies in ms of one run"""
+    if not latencies:
+        nan = float("nan")
+        return {
+            "requests": 0,
+            "throughput": 0.0,
+            "mean": nan,
+            "p50": nan,
+            "p90": nan,
+            "p99": nan,
+        }
+    return {
+        "requests": len(latencies),
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "mean": 1000 * sum(latencies) / len(latencies),
+        "p50": 1000 * percentile(latencies, 50),
+        "p90": 1000 * percentile(latencies, 90),
+        "p99": 1000 * percentile(latencies, 99),
+    }
+
+
+def run_sweep(
+    make_client: Callable,
+    model_file: str,
+    backend: str,
+    shape: List[int],
+    batch_sizes: List[int],
+    device: str = "CPU",
+    min_batch_timeout: int = 0,
+    requests: int = 400,
+    concurrency: int = 8,
+):
+    """Measure a model for each batch size
+
+    The model is stored once per batch size and ``concurrency``
+    clients send single-sample requests to it, so RedisAI has
+    requests to group into batches.
+
+    :param make_client: creates a SmartRedis client
+    :type make_client: callable
+    :param model_file: path of the serialized model
+    :type model_file: str
+    :param backend: backend of the model
+    :type backend: str
+    :param shape: shape of one input sample
+    :type shape: list[int]
+    :param batch_sizes: batch sizes to measure, 0 disables batching
+    :type batch_sizes: list[int]
+    :param device: device to run the model on, defaults to "CPU"
+    :type device: str, optional
+    :param min_batch_timeout: ms to wait for a full batch, defaults to 0
+    :type min_batch_timeout: int, optional
+    :param requests: requests per batch size, defaults to 400
+    :type requests: int, optional
+    :param concurrency: number of concurrent clients, defaults to 8
+    :type concurrency: int, optional
+    :return: summary of each batch size
+    :rtype: dict[int, dict[str, float]]
+    """
+    results = {}
+    admin = make_client()
+    for batch_size in batch_sizes:
+        name = f"benchmark_model_{batch_size}"
+        kwargs = {}
+        if min_batch_timeout:
+            kwargs["min_batch_timeout"] = min_batch_timeout
+        admin.set_model_from_file(
+            name, model_file, backend, device=device, batch_size=batch_size, **kwargs
+        )
+
+        latencies = [[] for _ in range(concurrency)]
+        errors = []
+        per_client = max(requests // concurrency, 1)
+        barrier = threading.Barrier(concurrency + 1)
+
+        def _send(index):
+            try:
+                client = make_client()
+                data = np.random.rand(*shape).astype(np.float32)
+                in_key, out_key = f"{name}_in_{index}", f"{name}_out_{index}"
+                barrier.wait()
+                for _ in range(per_client):
+                    start = time.perf_counter()
+                    client.put_tensor(in_key, data)
+                    client.run_model(name, [in_key], [out_key])
+                    client.get_tensor(out_key)
+                    latencies[index].append(time.perf_counter() - start)
+            except threading.BrokenBarrierError:
+                pass
+            except Exception as e:
+                # release the main thread and the other clients
+                errors.append(e)
+                barrier.abort()
+
+        threads = [
+            threading.Thread(target=_send, args=(i,)) for i in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        if errors:
+            raise errors[0]
+
+        results[batch_size] = summarize(sum(latencies, []), elapsed)
+        logger.debug(f"Measured batch size {batch_size}: {results[batch_size]}")
+    return results
+
+
+def format_results(results) -> str:
+    """Format the results of a sweep as a table"""
+    lines = [
+        f"{'batch':>6} {'req/s':>10} {'mean ms':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}"
+    ]
+    for batch_size, summary in results.items():
+        lines.append(
+            f"{batch_size:>6} {summary['throughput']:>10.1f} {summary['mean']:>9.3f} "
+            f"{summary['p50']:>9.3f} {summary['p90']:>9.3f} {summary['p99']:>9.3f}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prefix_chars="+", description="SmartSim inference benchmark"
+    )
+    parser.add_argument("+address", type=str, required=True, help="Database address")
+    parser.add_argument("+cluster", action="store_true", help="Database is a cluster")
+    parser.add_argument("+model", type=str, required=True, help="Model file")
+    parser.add_argument(
+        "+backend", type=str, required=True, help="TF, TFLITE, TORCH or ONNX"
+    )
+    parser.add_argument(
+        "+shape", type=int, nargs="+", required=True, help="Shape of one input"
+    )
+    parser.add_argument("+batch_sizes", type=int, nargs="+", default=[0, 4, 16, 64])
+    parser.add_argument("+device", type=str, default="CPU")
+    parser.add_argument("+min_batch_timeout", type=int, default=0)
+    parser.add_argument("+requests", type=int, default=400)
+    parser.add_argument("+concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    results = run_sweep(
+        lambda: Client(address=args.address, cluster=args.cluster),
+        args.model,
+        args.backend,
+        args.shape,
+        args.batch_sizes,
+        device=args.device,
+        min_batch_timeout=args.min_batch_timeout,
+        requests=args.requests,
+        concurrency=args.concurrency,
+    )
+    print(format_results(results))
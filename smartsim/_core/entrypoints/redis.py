@@ -26,6 +26,7 @@
 
 import os
 import signal
+import socket
 import psutil
 import argparse
 from typing import List
@@ -33,6 +34,7 @@ from subprocess import PIPE, STDOUT
 
 from smartsim.log import get_logger
 from smartsim.error import SSInternalError
+from smartsim._core.control.registry import NODE_NAME_ENV, REGISTRY_ENV
 from smartsim._core.utils.network import current_ip
 
 logger = get_logger(__name__)
@@ -55,6 +57,26 @@ def handle_signal(signo, frame):
     cleanup()
 
 
+def register(ip_address: str):
+    """Push the address of this shard to the driver, if it listens
+
+    The output file is still written, so the driver can fall back
+    to reading it when the registry can not be reached.
+    """
+    registry = os.environ.get(REGISTRY_ENV)
+    name = os.environ.get(NODE_NAME_ENV)
+    if not registry or not name:
+        return
+    # the token of the launch is sent back so the driver trusts the address
+    token, _, address = registry.partition("@")
+    host, _, port = address.rpartition(":")
+    try:
+        with socket.create_connection((host, int(port)), timeout=5) as sock:
+            sock.sendall(f"{token} {name} {ip_address}\n".encode("utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not register with {address}: {e}")
+
+
 def main(network_interface: str, command: List[str]):
     global DBPID
 
@@ -68,6 +90,7 @@ def main(network_interface: str, command: List[str]):
         print(f"IPADDRESS: {ip_address}\n", flush=True)
         print(f"NETWORK: {network_interface}\n", flush=True)
         print("-" * 30, "\n\n", flush=True)
+        register(ip_address)
 
         print("-" * 10, "  Output  ", "-" * 10, "\n\n", flush=True)
 
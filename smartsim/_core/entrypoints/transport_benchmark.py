@@ -0,0 +1,113 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import argparse
+import time
+from typing import Dict, List
+
+import redis
+
+from smartsim._core.entrypoints.inference_benchmark import percentile
+
+"""
+Transport latency benchmark
+
+Compares the request latency of loopback TCP and the Unix Domain
+socket of a database started with ``Model.colocate_db(socket=...)``, e.g.
+
+    python -m smartsim._core.entrypoints.transport_benchmark \
+        +port 6780 +socket /tmp/colo.sock +size 4096
+"""
+
+
+def measure(client, size: int = 4096, requests: int = 2000) -> List[float]:
+    """Latencies in seconds of GET requests for a value of ``size`` bytes
+
+    :param client: redis client of one transport
+    :type client: redis.Redis
+    :param size: size of the value in bytes, defaults to 4096
+    :type size: int, optional
+    :param requests: number of requests, defaults to 2000
+    :type requests: int, optional
+    :return: latency of each request
+    :rtype: list[float]
+    """
+    client.set("transport_benchmark", b"0" * size)
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get("transport_benchmark")
+        latencies.append(time.perf_counter() - start)
+    client.delete("transport_benchmark")
+    return latencies
+
+
+def compare(clients: Dict[str, "redis.Redis"], size: int = 4096, requests: int = 2000):
+    """Median and 99th percentile latency in microseconds of each transport
+
+    :param clients: redis client of each transport
+    :type clients: dict[str, redis.Redis]
+    :param size: size of the value in bytes, defaults to 4096
+    :type size: int, optional
+    :param requests: requests per transport, defaults to 2000
+    :type requests: int, optional
+    :return: latency summary of each transport
+    :rtype: dict[str, dict[str, float]]
+    """
+    results = {}
+    for transport, client in clients.items():
+        latencies = measure(client, size, requests)
+        results[transport] = {
+            "p50": 1e6 * percentile(latencies, 50),
+            "p99": 1e6 * percentile(latencies, 99),
+        }
+    return results
+
+
+def format_results(results) -> str:
+    """Format the results of a comparison as a table"""
+    lines = [f"{'transport':>9} {'p50 us':>9} {'p99 us':>9}"]
+    for transport, summary in results.items():
+        lines.append(f"{transport:>9} {summary['p50']:>9.1f} {summary['p99']:>9.1f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prefix_chars="+", description="SmartSim transport latency benchmark"
+    )
+    parser.add_argument("+host", type=str, default="127.0.0.1", help="TCP host")
+    parser.add_argument("+port", type=int, required=True, help="TCP port")
+    parser.add_argument("+socket", type=str, required=True, help="Socket path")
+    parser.add_argument("+size", type=int, default=4096, help="Value size in bytes")
+    parser.add_argument("+requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    clients = {
+        "tcp": redis.Redis(host=args.host, port=args.port),
+        "uds": redis.Redis(unix_socket_path=args.socket),
+    }
+    print(format_results(compare(clients, args.size, args.requests)))
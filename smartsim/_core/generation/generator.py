@@ -24,12 +24,20 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import hashlib
+import json
+import os
 import pathlib
 import shutil
 from distutils import dir_util
 from os import mkdir, path, symlink
 
-from ...entity import Model
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from ...entity import Ensemble, Model
 from ...log import get_logger
 from ..control import Manifest
 from .modelwriter import ModelWriter
@@ -37,6 +45,12 @@ from .modelwriter import ModelWriter
 logger = get_logger(__name__)
 logger.propagate = False
 
+# name of the file recording the inputs an entity directory was generated from
+_GEN_MANIFEST = ".smartsim_gen.json"
+
+# ioctl request number for cloning a file on Linux (see ioctl_ficlone(2))
+_FICLONE = 0x40049409
+
 
 class Generator:
     """The primary job of the generator is to create the file structure
@@ -49,10 +63,11 @@ class Generator:
 
         if overwrite is true, replace any existing
         configured models within an ensemble if there
-        is a name collision. Also replace any and all directories
-        for the experiment with fresh copies. Otherwise, if overwrite
-        is false, raises EntityExistsError when there is a name
-        collision between entities.
+        is a name collision. Entity directories are only
+        regenerated if the inputs they were generated from
+        (parameters, attached files, and tag) have changed.
+        Otherwise, if overwrite is false, raises EntityExistsError
+        when there is a name collision between entities.
 
         :param overwrite: toggle entity replacement, defaults to False
         :type overwrite: bool, optional
@@ -61,6 +76,15 @@ class Generator:
         self.gen_path = gen_path
         self.overwrite = overwrite
 
+        # (copy_mode, src device, dst device) combinations that
+        # failed so they aren't retried for every file
+        self._unsupported_copy = set()
+
+        # descriptions of attached files, keyed by id of the
+        # EntityFiles, so files shared by ensemble members are
+        # only hashed once per generation
+        self._files_manifests = {}
+
     def generate_experiment(self, *args):
         """Run ensemble and experiment file structure generation
 
@@ -82,6 +106,7 @@ class Generator:
 
         """
         generator_manifest = Manifest(*args)
+        self._files_manifests = {}
         self._gen_exp_dir()
         self._gen_orc_dir(generator_manifest.db)
         self._gen_entity_list_dir(generator_manifest.ensembles)
@@ -157,11 +182,23 @@ class Generator:
             elist_dir = path.join(self.gen_path, elist.name)
             if path.isdir(elist_dir):
                 if self.overwrite:
-                    shutil.rmtree(elist_dir)
-                    mkdir(elist_dir)
+                    # keep member directories so unchanged members
+                    # don't need to be regenerated
+                    members = set(entity.name for entity in elist.entities)
+                    for entry in os.listdir(elist_dir):
+                        if entry in members:
+                            continue
+                        entry_path = path.join(elist_dir, entry)
+                        if path.isdir(entry_path) and not path.islink(entry_path):
+                            shutil.rmtree(entry_path)
+                        else:
+                            os.unlink(entry_path)
             else:
                 mkdir(elist_dir)
             elist.path = elist_dir
+            if isinstance(elist, Ensemble):
+                # members created after generation are placed in their directory
+                elist._member_dirs = True
 
             self._gen_entity_dirs(elist.entities, entity_list=elist)
 
@@ -184,8 +221,17 @@ class Generator:
             else:
                 dst = path.join(self.gen_path, entity.name)
 
+            gen_manifest = None
             if path.isdir(dst):
                 if self.overwrite:
+                    gen_manifest = self._build_gen_manifest(entity)
+                    if self._read_gen_manifest(dst) == gen_manifest:
+                        logger.debug(
+                            f"Inputs for {entity.name} unchanged, "
+                            + "skipping regeneration"
+                        )
+                        entity.path = dst
+                        continue
                     shutil.rmtree(dst)
                 else:
                     error = (
@@ -199,6 +245,86 @@ class Generator:
             self._link_entity_files(entity)
             self._write_tagged_entity_files(entity)
 
+            # written last so that partially generated
+            # directories are always regenerated
+            if gen_manifest is None:
+                gen_manifest = self._build_gen_manifest(entity)
+            with open(path.join(dst, _GEN_MANIFEST), "w") as f:
+                json.dump(gen_manifest, f)
+
+    def _build_gen_manifest(self, entity):
+        """Record the inputs an entity directory is generated from
+
+        Tagged files are identified by a hash of their contents.
+        Files to copy are identified by their size and modification
+        time so that large datasets are not read on every generation.
+        Attached files are described once per generation and shared
+        by every entity they are attached to.
+
+        :param entity: SmartSimEntity
+        :type entity: SmartSimEntity
+        :return: JSON serializable description of the entity inputs
+        :rtype: dict
+        """
+        params = getattr(entity, "params", None) or {}
+        gen_manifest = {
+            "params": {str(k): str(v) for k, v in params.items()},
+            "tag": self._writer.tag,
+            "regex": self._writer.regex,
+        }
+        files = getattr(entity, "files", None)
+        if files:
+            # the EntityFiles is kept with its description so that
+            # its id can't be reused during this generation
+            _, files_manifest = self._files_manifests.get(id(files), (None, None))
+            if files_manifest is None:
+                files_manifest = self._build_files_manifest(files)
+                self._files_manifests[id(files)] = (files, files_manifest)
+            gen_manifest.update(files_manifest)
+        return gen_manifest
+
+    @staticmethod
+    def _build_files_manifest(files):
+        """Describe the files attached to entities
+
+        :param files: attached files
+        :type files: EntityFiles
+        :return: JSON serializable description of the files
+        :rtype: dict
+        """
+        tagged = {}
+        for tagged_file in files.tagged:
+            for file in _walk_files(tagged_file):
+                with open(file, "rb") as f:
+                    tagged[file] = hashlib.sha256(f.read()).hexdigest()
+        copied = {}
+        for to_copy in files.copy:
+            for file in _walk_files(to_copy):
+                stat = os.stat(file)
+                copied[file] = [stat.st_size, stat.st_mtime_ns]
+        return {
+            "tagged": tagged,
+            "copy": copied,
+            "copy_mode": files.copy_mode,
+            "link": list(files.link),
+        }
+
+    @staticmethod
+    def _read_gen_manifest(entity_path):
+        """Read the inputs a previously generated entity directory
+        was generated from
+
+        :param entity_path: path to generated entity directory
+        :type entity_path: str
+        :return: the recorded inputs, or None if not present
+        :rtype: dict | None
+        """
+        try:
+            with open(path.join(entity_path, _GEN_MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
     def _write_tagged_entity_files(self, entity):
         """Read, configure and write the tagged input files for
            a Model instance within an ensemble. This function
@@ -244,12 +370,68 @@ class Generator:
         :type entity: SmartSimEntity
         """
         if entity.files:
+            mode = entity.files.copy_mode
             for to_copy in entity.files.copy:
                 dst_path = path.join(entity.path, path.basename(to_copy))
                 if path.isdir(to_copy):
-                    dir_util.copy_tree(to_copy, entity.path)
+                    if mode == "copy":
+                        dir_util.copy_tree(to_copy, entity.path)
+                    else:
+                        self._materialize_tree(to_copy, entity.path, mode)
                 else:
-                    shutil.copyfile(to_copy, dst_path)
+                    self._materialize_file(to_copy, dst_path, mode)
+
+    def _materialize_tree(self, src_dir, dst_dir, mode):
+        """Materialize the contents of a directory into another
+        directory with the given copy mode.
+
+        Mirrors ``distutils.dir_util.copy_tree`` in that the contents
+        of ``src_dir``, not the directory itself, are placed in ``dst_dir``.
+
+        :param src_dir: directory to materialize
+        :type src_dir: str
+        :param dst_dir: destination directory
+        :type dst_dir: str
+        :param mode: copy mode, "hardlink" or "reflink"
+        :type mode: str
+        """
+        for root, _, files in os.walk(src_dir, followlinks=True):
+            dst_root = path.join(dst_dir, path.relpath(root, src_dir))
+            pathlib.Path(dst_root).mkdir(parents=True, exist_ok=True)
+            for file in files:
+                self._materialize_file(
+                    path.join(root, file), path.join(dst_root, file), mode
+                )
+
+    def _materialize_file(self, src, dst, mode):
+        """Materialize a single file with the given copy mode, falling
+        back to a regular copy if the filesystem does not support it.
+
+        :param src: path to source file
+        :type src: str
+        :param dst: path to destination file
+        :type dst: str
+        :param mode: copy mode, one of "copy", "hardlink", or "reflink"
+        :type mode: str
+        """
+        if mode != "copy":
+            key = (mode, os.stat(src).st_dev, os.stat(path.dirname(dst)).st_dev)
+            if key not in self._unsupported_copy:
+                try:
+                    if path.lexists(dst):
+                        os.unlink(dst)
+                    if mode == "hardlink":
+                        os.link(src, dst)
+                    else:
+                        _reflink(src, dst)
+                    return
+                except OSError as e:
+                    self._unsupported_copy.add(key)
+                    logger.warning(
+                        f"Copy mode {mode} not supported for {src}, "
+                        + f"falling back to copy: {e}"
+                    )
+        shutil.copyfile(src, dst)
 
     def _link_entity_files(self, entity):
         """Symlink the entity files attached to this entity.
@@ -261,3 +443,37 @@ class Generator:
             for to_link in entity.files.link:
                 dst_path = path.join(entity.path, path.basename(to_link))
                 symlink(to_link, dst_path)
+
+
+def _walk_files(file_path):
+    """Yield the file, or all files in the directory, at a path
+
+    :param file_path: path to a file or directory
+    :type file_path: str
+    """
+    if path.isdir(file_path):
+        for root, _, files in os.walk(file_path, followlinks=True):
+            for file in sorted(files):
+                yield path.join(root, file)
+    else:
+        yield file_path
+
+
+def _reflink(src, dst):
+    """Clone ``src`` into ``dst`` with the Linux FICLONE ioctl
+
+    :param src: path to source file
+    :type src: str
+    :param dst: path to destination file
+    :type dst: str
+    :raises OSError: if the platform or filesystem cannot clone files
+    """
+    if fcntl is None:
+        raise OSError("reflinks are not supported on this platform")
+    try:
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+    except OSError:
+        if path.exists(dst):
+            os.unlink(dst)
+        raise
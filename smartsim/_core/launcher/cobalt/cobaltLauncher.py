@@ -73,8 +73,6 @@ class CobaltLauncher(WLMLauncher):
         :return: job step id if job is managed
         :rtype: str
         """
-        if not self.task_manager.actively_monitoring:
-            self.task_manager.start()
 
         cmd_list = step.get_launch_cmd()
         step_id = None
@@ -24,6 +24,9 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import json
+import os.path as osp
+import shlex
 import sys
 from ..config import CONFIG
 from ..utils.helpers import create_lockfile_name
@@ -43,8 +46,27 @@ def write_colocated_launch_script(file_name, db_log, colocated_settings):
     :type colocated_settings: dict[str, Any]
     """
 
+    # create unique lockfile name to avoid symlink vulnerability
+    # this is the lockfile all the processes in the distributed
+    # application will try to acquire. since we use a local tmp
+    # directory on the compute node, only one process can acquire
+    # the lock on the file.
+    lockfile = create_lockfile_name()
+
+    # models and scripts are loaded by the entrypoint before the db
+    # is announced as ready
+    preload_file = None
+    ml = colocated_settings.get("ml", None)
+    if ml and (ml["models"] or ml["scripts"]):
+        preload_file = osp.join(osp.dirname(osp.abspath(file_name)),
+                                ".colocated_preload.json")
+        with open(preload_file, "w") as f:
+            json.dump(ml, f)
+
     colocated_cmd = _build_colocated_wrapper_cmd(**colocated_settings,
-                                                 db_log=db_log)
+                                                 db_log=db_log,
+                                                 lockfile=lockfile,
+                                                 preload_file=preload_file)
 
     with open(file_name, "w") as f:
         f.write("#!/bin/bash\n")
@@ -53,6 +75,9 @@ def write_colocated_launch_script(file_name, db_log, colocated_settings):
         f.write("Cleanup () {\n")
         f.write("if ps -p $DBPID > /dev/null; then\n")
         f.write("\tkill -15 $DBPID\n")
+        if colocated_settings.get("drain", None):
+            # let the entrypoint drain the db before the step ends
+            f.write("\twait $DBPID || true\n")
         f.write("fi\n}\n\n")
 
         # run cleanup after all exitcodes
@@ -65,11 +90,24 @@ def write_colocated_launch_script(file_name, db_log, colocated_settings):
 
         f.write(f"{colocated_cmd}\n")
         f.write(f"DBPID=$!\n\n")
+
+        # start the app only once the database of this host answers.
+        # the readiness file holds the endpoint the app connects to
+        f.write(
+            f"SSDB_READY_FILE=$({sys.executable} -m smartsim._core.entrypoints.colocated "
+            f"+lockfile {lockfile} +wait_ready {CONFIG.db_ready_timeout})\n"
+        )
+        f.write("export SSDB_READY_FILE\n\n")
+
         if colocated_settings["limit_app_cpus"]:
+            # pin the app to the CPUs, on any NUMA node, the db does not use
             cpus = colocated_settings["cpus"]
+            interface = colocated_settings["interface"]
             f.write(
-                f"taskset -c 0-$(nproc --ignore={str(cpus+1)}) $@\n\n"
+                f"APP_CPUS=$({sys.executable} -m smartsim._core.entrypoints.colocated "
+                f"+ifname {interface} +db_cpus {str(cpus)} +app_cpus)\n"
             )
+            f.write("taskset -c $APP_CPUS $@\n\n")
         else:
             f.write(f"$@\n\n")
 
@@ -80,6 +118,11 @@ def _build_colocated_wrapper_cmd(port=6780,
                                 rai_args=None,
                                 extra_db_args=None,
                                 db_log=None,
+                                unix_socket=None,
+                                socket_permissions=None,
+                                lockfile=None,
+                                drain=None,
+                                preload_file=None,
                                 **kwargs):
     """Build the command use to run a colocated db application
 
@@ -93,16 +136,23 @@ def _build_colocated_wrapper_cmd(port=6780,
     :type rai_args: dict[str, str], optional
     :param extra_db_args: extra redis args, defaults to None
     :type extra_db_args: dict[str, str], optional
+    :param unix_socket: path of a unix domain socket to listen on, defaults to None
+    :type unix_socket: str, optional
+    :param socket_permissions: permissions of the socket file, defaults to None
+    :type socket_permissions: int, optional
+    :param lockfile: name of the lockfile that elects one db per host,
+                     defaults to a new unique name
+    :type lockfile: str, optional
+    :param drain: key patterns, target and interval of the db drain,
+                  defaults to None
+    :type drain: dict[str, Any], optional
+    :param preload_file: JSON file of models and scripts to load, defaults to None
+    :type preload_file: str, optional
     :return: the command to run
     :rtype: str
     """
 
-    # create unique lockfile name to avoid symlink vulnerability
-    # this is the lockfile all the processes in the distributed
-    # application will try to acquire. since we use a local tmp
-    # directory on the compute node, only one process can acquire
-    # the lock on the file.
-    lockfile = create_lockfile_name()
+    lockfile = lockfile or create_lockfile_name()
 
     # create the command that will be used to launch the
     # database with the python entrypoint for starting
@@ -116,8 +166,16 @@ def _build_colocated_wrapper_cmd(port=6780,
            lockfile,
            "+db_cpus",
            str(cpus),
-           "+command"
         ]
+    if drain:
+        # quote the patterns so the shell does not expand them
+        cmd.extend(["+drain_keys"] + [shlex.quote(key) for key in drain["keys"]])
+        cmd.extend(["+drain_to", shlex.quote(drain["to"])])
+        if drain["interval"]:
+            cmd.extend(["+drain_interval", str(drain["interval"])])
+    if preload_file:
+        cmd.extend(["+preload", shlex.quote(preload_file)])
+    cmd.append("+command")
 
     # collect DB binaries and libraries from the config
     db_cmd = [
@@ -140,6 +198,17 @@ def _build_colocated_wrapper_cmd(port=6780,
         "--logfile",
         db_log # usually /dev/null
     ])
+    if unix_socket:
+        # listen on the unix domain socket as well as on TCP
+        db_cmd.extend([
+            "--unixsocket",
+            unix_socket
+        ])
+        if socket_permissions:
+            db_cmd.extend([
+                "--unixsocketperm",
+                str(socket_permissions)
+            ])
     for db_arg, value in extra_db_args.items():
         # replace "_" with "-" in the db_arg because we use kwargs
         # for the extra configurations and Python doesn't allow a hypon
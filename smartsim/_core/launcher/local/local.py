@@ -89,9 +89,6 @@ class LocalLauncher:
         :param step: LocalStep instance to run
         :type step: LocalStep
         """
-        if not self.task_manager.actively_monitoring:
-            self.task_manager.start()
-
         out, err = step.get_output_files()
         output = open(out, "w+")
         error = open(err, "w+")
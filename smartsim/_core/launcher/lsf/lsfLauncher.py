@@ -24,7 +24,8 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import time
+import itertools
+import threading
 
 from ....error import LauncherError
 from ....log import get_logger
@@ -32,14 +33,9 @@ from ....settings import *
 from ....status import STATUS_CANCELLED, STATUS_COMPLETED
 from ..launcher import WLMLauncher
 from ..step import BsubBatchStep, JsrunStep, LocalStep, MpirunStep
-from ..stepInfo import LSFBatchStepInfo, LSFJsrunStepInfo
+from ..stepInfo import LSFBatchStepInfo, LSFJsrunStepInfo, aggregate_step_info
 from .lsfCommands import bjobs, bkill, jskill, jslist
-from .lsfParser import (
-    parse_bjobs_jobid,
-    parse_bsub,
-    parse_jslist_stepid,
-    parse_max_step_id_from_jslist,
-)
+from .lsfParser import parse_bjobs, parse_bsub, parse_jslist
 
 logger = get_logger(__name__)
 
@@ -55,7 +51,16 @@ class LSFLauncher(WLMLauncher):
     i.e. a psutil.Popen object
     """
 
-    # init in WLMLauncher, launcher.py
+    def __init__(self):
+        super().__init__()
+        # jsrun launches waiting for JSM to report their step id,
+        # keyed by the tag used as their step id until then. Values
+        # are (allocation, task id, update once the jsrun exited)
+        self._pending_jsrun = {}
+        self._jsrun_ids = {}
+        self._known_jsrun_ids = {}
+        self._tags = itertools.count()
+        self._jsrun_lock = threading.RLock()
 
     # RunSettings types supported by this launcher
     supported_rs = {
@@ -74,8 +79,6 @@ class LSFLauncher(WLMLauncher):
         :return: job step id if job is managed
         :rtype: str
         """
-        if not self.task_manager.actively_monitoring:
-            self.task_manager.start()
 
         cmd_list = step.get_launch_cmd()
         step_id = None
@@ -89,10 +92,7 @@ class LSFLauncher(WLMLauncher):
                 step_id = parse_bsub(out)
                 logger.debug(f"Gleaned batch job id: {step_id} for {step.name}")
         elif isinstance(step, JsrunStep):
-            self.task_manager.start_task(cmd_list, step.cwd)
-            time.sleep(1)
-            step_id = self._get_lsf_step_id(step)
-            logger.debug(f"Gleaned jsrun step id: {step_id} for {step.name}")
+            step_id = self._launch_jsrun(step, cmd_list)
         else:  # isinstance(step, MpirunStep) or isinstance(step, LocalStep)
             out, err = step.get_output_files()
             # mpirun and local launch don't direct output for us
@@ -113,8 +113,14 @@ class LSFLauncher(WLMLauncher):
         :return: update for job due to cancel
         :rtype: StepInfo
         """
+        self._resolve_jsrun_ids()
         stepmap = self.step_mapping[step_name]
-        if stepmap.managed:
+        if stepmap.managed and stepmap.step_id in self._pending_jsrun:
+            # JSM never reported the step, stop the jsrun process itself.
+            # The tag keeps its place in case JSM lists the step later
+            _, task_id, _ = self._pending_jsrun[stepmap.step_id]
+            self.task_manager.remove_task(task_id)
+        elif stepmap.managed:
             if "." in stepmap.step_id:
                 rc, _, err = jskill([stepmap.step_id.rpartition(".")[-1]])
             else:
@@ -130,21 +136,84 @@ class LSFLauncher(WLMLauncher):
         step_info.status = STATUS_CANCELLED  # set status to cancelled instead of failed
         return step_info
 
-    def _get_lsf_step_id(self, step, interval=2, trials=5):
-        """Get the step_id of last launched step from jslist"""
-        time.sleep(interval)
-        step_id = "unassigned"
-        while trials > 0:
-            output, _ = jslist([])
-            step_id = parse_max_step_id_from_jslist(output)
-            if step_id:
-                break
-            else:
-                time.sleep(interval)
-                trials -= 1
-        if not step_id:
-            raise LauncherError("Could not find id of launched job step")
-        return f"{step.alloc}.{step_id}"
+    def _launch_jsrun(self, step, cmd_list):
+        """Start a jsrun step without waiting for its step id
+
+        The step is tracked under a unique tag until the id given
+        by JSM is resolved from ``jslist``. Tags of every launch are
+        resolved together, with a single ``jslist`` call, on the
+        next status poll.
+
+        :param step: a jsrun job step instance
+        :type step: JsrunStep
+        :param cmd_list: launch command of the step
+        :type cmd_list: list[str]
+        :return: tag of the step
+        :rtype: str
+        """
+        with self._jsrun_lock:
+            if step.alloc not in self._known_jsrun_ids:
+                # ids of steps started before this launcher are never claimed
+                output, _ = jslist([])
+                self._known_jsrun_ids[step.alloc] = set(parse_jslist(output))
+            tag = f"{step.alloc}.pending-{next(self._tags)}"
+            task_id = self.task_manager.start_task(cmd_list, step.cwd)
+            self._pending_jsrun[tag] = (step.alloc, task_id, None)
+        logger.debug(f"Launched jsrun step {step.name} as {tag}")
+        return tag
+
+    def _resolve_jsrun_ids(self, jslist_out=None):
+        """Match pending jsrun launches to the step ids in ``jslist``
+
+        JSM numbers the steps of an allocation in the order they are
+        started, so the ids that appeared since the last resolution
+        are given to the pending launches of that allocation in
+        launch order.
+
+        Launches whose jsrun exited keep their place, so their id is
+        never given to a later launch. JSM lists a step before its
+        jsrun exits, so once a ``jslist`` queried after the exit shows
+        no new id, the step was never started and its place is freed.
+
+        :param jslist_out: output of jslist, queried if not given
+        :type jslist_out: str, optional
+        :return: step id of each resolved tag
+        :rtype: dict[str, str]
+        """
+        with self._jsrun_lock:
+            if not self._pending_jsrun:
+                return self._jsrun_ids
+            if jslist_out is None:
+                jslist_out, _ = jslist([])
+            listed = parse_jslist(jslist_out)
+            new_ids = {}
+            for alloc, known in self._known_jsrun_ids.items():
+                new_ids[alloc] = sorted(
+                    (int(i) for i in listed if i.isdigit() and i not in known),
+                    reverse=True,
+                )
+            # tags are created in launch order
+            for tag in sorted(self._pending_jsrun, key=_tag_order):
+                alloc, _, exited = self._pending_jsrun[tag]
+                if not new_ids[alloc]:
+                    if exited:
+                        # exit was seen before jslist was queried
+                        del self._pending_jsrun[tag]
+                        logger.debug(f"jsrun step {tag} exited before it started")
+                    continue
+                jsrun_id = str(new_ids[alloc].pop())
+                self._known_jsrun_ids[alloc].add(jsrun_id)
+                self._jsrun_ids[tag] = f"{alloc}.{jsrun_id}"
+                del self._pending_jsrun[tag]
+                self._update_step_id(tag, self._jsrun_ids[tag])
+            return self._jsrun_ids
+
+    def _update_step_id(self, tag, step_id):
+        """Replace the tag of a step with its resolved step id"""
+        for name, stepmap in list(self.step_mapping.mapping.items()):
+            if stepmap.step_id == tag:
+                self.step_mapping[name] = stepmap._replace(step_id=step_id)
+                logger.debug(f"Gleaned jsrun step id: {step_id} for {name}")
 
     def _get_managed_step_update(self, step_ids):
         """Get step updates for WLM managed jobs
@@ -154,30 +223,69 @@ class LSFLauncher(WLMLauncher):
         :return: list of updates for managed jobs
         :rtype: list[StepInfo]
         """
-        updates = []
-
-        for step_id in step_ids:
+        # Batch jobs have integer step id,
+        # Jsrun processes have {alloc}.{task_id}
+        jsrun_ids = [step_id for step_id in step_ids if "." in str(step_id)]
+        batch_ids = [str(step_id) for step_id in step_ids if "." not in str(step_id)]
 
-            # Batch jobs have integer step id,
-            # Jsrun processes have {alloc}.{task_id}
+        # query each command once per poll, no matter the number of steps
+        jsrun_steps = {}
+        if jsrun_ids:
+            jslist_out, _ = jslist([])
+            jsrun_steps = parse_jslist(jslist_out)
+            resolved = self._resolve_jsrun_ids(jslist_out)
+        batch_jobs = {}
+        if batch_ids:
             # Include recently finished jobs
-            if "." in str(step_id):
-                jsrun_step_id = step_id.rpartition(".")[-1]
-                jslist_out, _ = jslist([])
-                stat, return_code = parse_jslist_stepid(jslist_out, jsrun_step_id)
+            bjobs_out, _ = bjobs(["-a"] + batch_ids)
+            batch_jobs = parse_bjobs(bjobs_out)
+
+        updates = []
+        for step_id in step_ids:
+            if step_id in self._pending_jsrun:
+                info = self._get_pending_jsrun_update(step_id)
+            elif "." in str(step_id):
+                jsrun_step_id = resolved.get(step_id, step_id).rpartition(".")[-1]
+                stat, return_code = jsrun_steps.get(jsrun_step_id, ("NOTFOUND", None))
                 info = LSFJsrunStepInfo(stat, return_code)
             else:
-                bjobs_args = ["-a"] + step_ids
-                bjobs_out, _ = bjobs(bjobs_args)
-                stat = parse_bjobs_jobid(bjobs_out, str(step_id))
                 # create LSFBatchStepInfo objects to return
-                info = LSFBatchStepInfo(stat, None)
-                # account for case where job history is not logged by LSF
-                if info.status == STATUS_COMPLETED:
-                    info.returncode = 0
+                infos = []
+                for stat in batch_jobs.get(str(step_id), ["NOTFOUND"]):
+                    info = LSFBatchStepInfo(stat, None)
+                    # account for case where job history is not logged by LSF
+                    if info.status == STATUS_COMPLETED:
+                        info.returncode = 0
+                    infos.append(info)
+                # array jobs are reported as the combination of their tasks
+                info = aggregate_step_info(infos)
 
             updates.append(info)
         return updates
 
+    def _get_pending_jsrun_update(self, tag):
+        """Status of a jsrun step that JSM has not reported yet
+
+        :param tag: tag of the step
+        :type tag: str
+        :return: update for the step
+        :rtype: LSFJsrunStepInfo
+        """
+        with self._jsrun_lock:
+            alloc, task_id, exited = self._pending_jsrun[tag]
+            if exited:
+                return exited
+            _, rc, out, err = self.task_manager.get_task_update(task_id)
+            if rc is None:
+                return LSFJsrunStepInfo("Queued")
+            # jsrun exited before JSM listed the step, e.g. a launch error
+            exited = LSFJsrunStepInfo("NOTFOUND", rc, output=out, error=err)
+            self._pending_jsrun[tag] = (alloc, task_id, exited)
+            return exited
+
     def __str__(self):
         return "LSF"
+
+
+def _tag_order(tag):
+    return int(tag.rpartition("-")[-1])
@@ -71,6 +71,23 @@ def parse_bsub_error(output):
     return base_err
 
 
+def parse_jslist(output):
+    """Parse the output of the jslist command into a table
+    of step statuses
+
+    :param output: output of the jslist command
+    :type output: str
+    :return: status and return code of each step id
+    :rtype: dict[str, (str, str)]
+    """
+    steps = {}
+    for line in output.split("\n"):
+        fields = line.split()
+        if len(fields) >= 7:
+            steps.setdefault(fields[0], (fields[6], fields[5]))
+    return steps
+
+
 def parse_jslist_stepid(output, step_id):
     """Parse and return output of the jslist command run with
     options to obtain step status
@@ -82,18 +99,27 @@ def parse_jslist_stepid(output, step_id):
     :return: status and return code
     :rtype: (str, str)
     """
-    result = ("NOTFOUND", None)
+    return parse_jslist(output).get(step_id, ("NOTFOUND", None))
+
+
+def parse_bjobs(output):
+    """Parse the output of the bjobs command into a table
+    of job statuses
 
+    Every task of an array job is listed under the id of
+    the array, so a job can have many statuses.
+
+    :param output: output of the bjobs command
+    :type output: str
+    :return: statuses of each job id
+    :rtype: dict[str, list[str]]
+    """
+    jobs = {}
     for line in output.split("\n"):
         fields = line.split()
-        if len(fields) >= 7:
-            if fields[0] == step_id:
-                stat = fields[6]
-                return_code = fields[5]
-                result = (stat, return_code)
-                break
-
-    return result
+        if len(fields) >= 3:
+            jobs.setdefault(fields[0], []).append(fields[2])
+    return jobs
 
 
 def parse_bjobs_jobid(output, job_id):
@@ -107,15 +133,7 @@ def parse_bjobs_jobid(output, job_id):
     :return: status
     :rtype: str
     """
-    result = "NOTFOUND"
-    for line in output.split("\n"):
-        fields = line.split()
-        if len(fields) >= 3:
-            if fields[0] == job_id:
-                stat = fields[2]
-                result = stat
-                break
-    return result
+    return parse_bjobs(output).get(job_id, ["NOTFOUND"])[0]
 
 
 def parse_bjobs_nodes(output):
@@ -69,8 +69,6 @@ class PBSLauncher(WLMLauncher):
         :return: job step id if job is managed
         :rtype: str
         """
-        if not self.task_manager.actively_monitoring:
-            self.task_manager.start()
 
         cmd_list = step.get_launch_cmd()
         step_id = None
@@ -0,0 +1,224 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021-2022, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import time
+from bisect import bisect_left
+
+from ....error import LauncherError
+from .slurmCommands import sinfo
+
+# one line per node and partition
+SINFO_FORMAT = "%P|%n|%c|%t|%f"
+
+
+def _node_state(state):
+    """Compact node state without the flags sinfo appends, e.g. idle~"""
+    return state.rstrip("*~#!%$@^-+")
+
+
+class NodeInventory:
+    """Nodes of a Slurm system, indexed by partition, feature,
+    CPU count and state
+
+    The inventory is built from a single ``sinfo`` call and kept
+    for ``ttl`` seconds, so repeated validation and placement
+    queries do not each shell out to Slurm. Hosts handed out by
+    ``select_hosts`` are not idle anymore for later selections,
+    even though sinfo may still report them idle.
+    """
+
+    def __init__(self, ttl=30, hold=300):
+        """Initialize an empty inventory
+
+        :param ttl: seconds before sinfo is queried again, defaults to 30
+        :type ttl: float, optional
+        :param hold: seconds a selected host is kept out of later
+                     selections while sinfo reports it idle, defaults to 300
+        :type hold: float, optional
+        """
+        self.ttl = ttl
+        self.hold = hold
+        self._default_partition = None
+        self._loaded_at = None
+        self._cpus = {}
+        self._partition_cpus = {}
+        self._partition_nodes = {}
+        self._feature_nodes = {}
+        self._state_nodes = {}
+        self._handed_out = {}
+
+    def refresh(self):
+        """Query sinfo and rebuild the inventory"""
+        output, _ = sinfo(["--noheader", "--Node", "--format", SINFO_FORMAT])
+        self.load(output)
+
+    def load(self, output):
+        """Rebuild the inventory from sinfo output
+
+        :param output: output of sinfo with the ``SINFO_FORMAT`` format
+        :type output: str
+        """
+        cpus, partition_nodes, feature_nodes, state_nodes = {}, {}, {}, {}
+        default = None
+        for line in output.split("\n"):
+            fields = line.strip().split("|")
+            if len(fields) < 5:
+                continue
+            partition, node, ppn, state, features = fields[:5]
+            if partition.endswith("*"):
+                partition = partition.rstrip("*")
+                default = partition
+            cpus[node] = int(ppn)
+            partition_nodes.setdefault(partition, set()).add(node)
+            state_nodes.setdefault(_node_state(state), set()).add(node)
+            for feature in features.split(","):
+                if feature and feature != "(null)":
+                    feature_nodes.setdefault(feature, set()).add(node)
+
+        self._cpus = cpus
+        self._partition_nodes = partition_nodes
+        # sorted CPU counts answer "how many nodes have n CPUs" by bisection
+        self._partition_cpus = {
+            name: sorted(cpus[node] for node in nodes)
+            for name, nodes in partition_nodes.items()
+        }
+        self._feature_nodes = feature_nodes
+        self._state_nodes = state_nodes
+        self._default_partition = default
+        self._loaded_at = time.monotonic()
+
+        # selected hosts are released once their job shows up in sinfo
+        idle = state_nodes.get("idle", set())
+        self._handed_out = {
+            node: selected_at
+            for node, selected_at in self._handed_out.items()
+            if node in idle and self._loaded_at - selected_at < self.hold
+        }
+
+    def _current(self):
+        """Refresh the inventory if it is older than its ttl"""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            self.refresh()
+        return self
+
+    @property
+    def default_partition(self):
+        """Name of the default partition, marked with a star by sinfo
+
+        :rtype: str
+        """
+        return self._current()._default_partition
+
+    @property
+    def partitions(self):
+        """Names of the partitions of the system
+
+        :rtype: list[str]
+        """
+        return list(self._current()._partition_nodes)
+
+    def get_cpus(self, node):
+        """Number of CPUs of a node
+
+        :param node: name of the node
+        :type node: str
+        :rtype: int
+        """
+        return self._current()._cpus[node]
+
+    def count_nodes(self, partition, min_cpus=1):
+        """Number of nodes of a partition with at least min_cpus CPUs
+
+        :param partition: name of the partition
+        :type partition: str
+        :param min_cpus: CPUs needed per node, defaults to 1
+        :type min_cpus: int, optional
+        :raises LauncherError: if the partition does not exist
+        :rtype: int
+        """
+        cpus = self._current()._partition_cpus.get(partition)
+        if cpus is None:
+            raise LauncherError(f"Partition {partition} is not found on this system")
+        return len(cpus) - bisect_left(cpus, min_cpus)
+
+    def get_nodes(self, partition=None, state=None, feature=None, min_cpus=1):
+        """Nodes matching every given constraint
+
+        :param partition: name of the partition, defaults to None
+        :type partition: str, optional
+        :param state: compact node state, e.g. idle, defaults to None
+        :type state: str, optional
+        :param feature: node feature, defaults to None
+        :type feature: str, optional
+        :param min_cpus: CPUs needed per node, defaults to 1
+        :type min_cpus: int, optional
+        :return: sorted node names
+        :rtype: list[str]
+        """
+        inventory = self._current()
+        nodes = set(inventory._cpus)
+        if partition is not None:
+            nodes &= inventory._partition_nodes.get(partition, set())
+        if state is not None:
+            nodes &= inventory._state_nodes.get(state, set())
+            if state == "idle":
+                nodes -= set(inventory._handed_out)
+        if feature is not None:
+            nodes &= inventory._feature_nodes.get(feature, set())
+        return sorted(node for node in nodes if inventory._cpus[node] >= min_cpus)
+
+    def select_hosts(self, num_hosts, partition=None, feature=None, min_cpus=1):
+        """Pick idle nodes, spread over the idle nodes that match
+
+        Node names are assumed to follow the physical layout of the
+        system (e.g. cabinets), so the hosts are taken at even steps
+        through the sorted idle nodes rather than next to each other.
+        The hosts are not selected again until sinfo reports them busy
+        and then idle again, or for ``hold`` seconds.
+
+        :param num_hosts: number of hosts needed
+        :type num_hosts: int
+        :param partition: name of the partition, defaults to None
+        :type partition: str, optional
+        :param feature: node feature, defaults to None
+        :type feature: str, optional
+        :param min_cpus: CPUs needed per node, defaults to 1
+        :type min_cpus: int, optional
+        :raises LauncherError: if there are not enough idle nodes
+        :return: host names
+        :rtype: list[str]
+        """
+        idle = self.get_nodes(partition, "idle", feature, min_cpus)
+        if len(idle) < num_hosts:
+            raise LauncherError(
+                f"Only {len(idle)} idle nodes are available, {num_hosts} are needed"
+            )
+        step = len(idle) / num_hosts
+        hosts = [idle[int(i * step)] for i in range(num_hosts)]
+        selected_at = time.monotonic()
+        for host in hosts:
+            self._handed_out[host] = selected_at
+        return hosts
@@ -33,9 +33,14 @@ from ....settings import *
 from ....status import STATUS_CANCELLED
 from ..launcher import WLMLauncher
 from ..step import LocalStep, MpirunStep, SbatchStep, SrunStep
-from ..stepInfo import SlurmStepInfo
+from ..stepInfo import SlurmStepInfo, aggregate_step_info
 from .slurmCommands import sacct, scancel, sstat
-from .slurmParser import parse_sacct, parse_sstat_nodes, parse_step_id_from_sacct
+from .slurmParser import (
+    parse_sacct,
+    parse_sacct_array,
+    parse_sstat_nodes,
+    parse_step_id_from_sacct,
+)
 
 logger = get_logger(__name__)
 
@@ -107,8 +112,6 @@ class SlurmLauncher(WLMLauncher):
         :rtype: str
         """
         self.check_for_slurm()
-        if not self.task_manager.actively_monitoring:
-            self.task_manager.start()
 
         cmd_list = step.get_launch_cmd()
         step_id = None
@@ -216,7 +219,14 @@ class SlurmLauncher(WLMLauncher):
         # create SlurmStepInfo objects to return
         updates = []
         for stat_tuple, step_id in zip(stat_tuples, step_ids):
-            info = SlurmStepInfo(stat_tuple[0], stat_tuple[1])
+            array_tasks = parse_sacct_array(sacct_out, str(step_id))
+            if array_tasks:
+                # array jobs are reported as the combination of their tasks
+                info = aggregate_step_info(
+                    [SlurmStepInfo(stat, code) for stat, code in array_tasks]
+                )
+            else:
+                info = SlurmStepInfo(stat_tuple[0], stat_tuple[1])
 
             task_id = self.step_mapping.get_task_id(step_id)
             if task_id:
@@ -104,6 +104,32 @@ def parse_sacct(output, job_id):
     return result
 
 
+def parse_sacct_array(output, job_id):
+    """Parse the status of every task of an array job from the
+    output of the sacct command
+
+    Tasks that have not started yet may be listed together,
+    e.g. ``1234_[2-5]``.
+
+    :param output: output of the sacct command
+    :type output: str
+    :param job_id: id of the array job
+    :type job_id: str
+    :return: status and returncode of each task, empty if
+             job_id is not an array job
+    :rtype: list[tuple]
+    """
+    tasks = []
+    for line in output.split("\n"):
+        line = line.split("|")
+        if len(line) >= 3:
+            task_id = line[0]
+            # steps of the tasks (e.g. 1234_0.batch) are not tasks
+            if task_id.startswith(f"{job_id}_") and "." not in task_id:
+                tasks.append((line[1], line[2].split(":")[0]))
+    return tasks
+
+
 def parse_sstat_nodes(output, job_id):
     """Parse and return the sstat command
 
@@ -145,3 +171,67 @@ def parse_step_id_from_sacct(output, step_name):
             if sacct_string[0] == step_name:
                 step_id = sacct_string[1]
     return step_id
+
+
+def expand_hostlist(hostlist):
+    """Expand a Slurm hostlist expression into host names
+
+    e.g. ``nid[00001-00003,00007],login1`` gives nid00001,
+    nid00002, nid00003, nid00007 and login1
+
+    :param hostlist: compressed hostlist
+    :type hostlist: str
+    :return: host names
+    :rtype: list[str]
+    """
+    hosts = []
+    # split on commas that are not inside brackets
+    depth, start = 0, 0
+    parts = []
+    for i, char in enumerate(hostlist):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(hostlist[start:i])
+            start = i + 1
+    parts.append(hostlist[start:])
+
+    for part in parts:
+        part = part.strip()
+        if not part or part == "(null)":
+            continue
+        if "[" not in part:
+            hosts.append(part)
+            continue
+        prefix, _, rest = part.partition("[")
+        ranges, _, suffix = rest.partition("]")
+        for item in ranges.split(","):
+            first, _, last = item.partition("-")
+            if not last:
+                hosts.append(f"{prefix}{first}{suffix}")
+                continue
+            for i in range(int(first), int(last) + 1):
+                # keep the zero padding of the range
+                hosts.append(f"{prefix}{str(i).zfill(len(first))}{suffix}")
+    return hosts
+
+
+def parse_topology(output):
+    """Parse the leaf switch of every node from the output
+    of ``scontrol show topology``
+
+    :param output: output of scontrol show topology
+    :type output: str
+    :return: leaf switch name of each node
+    :rtype: dict[str, str]
+    """
+    switches = {}
+    for line in output.split("\n"):
+        fields = dict(field.split("=", 1) for field in line.split() if "=" in field)
+        # only leaf switches have nodes attached
+        if "SwitchName" in fields and "Nodes" in fields:
+            for node in expand_hostlist(fields["Nodes"]):
+                switches[node] = fields["SwitchName"]
+    return switches
@@ -28,7 +28,7 @@ import os
 import stat
 
 from ....log import get_logger
-from .step import Step
+from .step import Step, get_batch_slots, write_batch_cmds
 
 logger = get_logger(__name__)
 
@@ -47,6 +47,7 @@ class CobaltBatchStep(Step):
         super().__init__(name, cwd)
         self.batch_settings = batch_settings
         self.step_cmds = []
+        self.step_slots = []
         self.managed = True
 
     def get_launch_cmd(self):
@@ -66,6 +67,7 @@ class CobaltBatchStep(Step):
         """
         launch_cmd = step.get_launch_cmd()
         self.step_cmds.append(launch_cmd)
+        self.step_slots.append(get_batch_slots(step))
         logger.debug(f"Added step command to batch for {step.name}")
 
     def _write_script(self):
@@ -92,11 +94,8 @@ class CobaltBatchStep(Step):
             for cmd in self.batch_settings._preamble:
                 f.write(f"{cmd}\n")
 
-            for i, cmd in enumerate(self.step_cmds):
-                f.write("\n")
-                f.write(f"{' '.join((cmd))} &\n")
-                if i == len(self.step_cmds) - 1:
-                    f.write("\n")
-                    f.write("wait\n")
+            write_batch_cmds(
+                f, self.step_cmds, self.step_slots, self.batch_settings.max_slots
+            )
         os.chmod(batch_script, stat.S_IXUSR | stat.S_IWUSR | stat.S_IRUSR)
         return batch_script
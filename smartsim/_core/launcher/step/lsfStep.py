@@ -29,7 +29,13 @@ import shutil
 
 from ....error import AllocationError
 from ....log import get_logger
-from .step import Step
+from .step import (
+    Step,
+    array_output_files,
+    get_batch_slots,
+    write_array_cmds,
+    write_batch_cmds,
+)
 
 logger = get_logger(__name__)
 
@@ -48,6 +54,7 @@ class BsubBatchStep(Step):
         super().__init__(name, cwd)
         self.batch_settings = batch_settings
         self.step_cmds = []
+        self.step_slots = []
         self.managed = True
 
     def get_launch_cmd(self):
@@ -67,8 +74,13 @@ class BsubBatchStep(Step):
         """
         launch_cmd = step.get_launch_cmd()
         self.step_cmds.append(launch_cmd)
+        self.step_slots.append(get_batch_slots(step))
         logger.debug(f"Added step command to batch for {step.name}")
 
+    def _is_array(self):
+        """Whether the members run as tasks of an array job"""
+        return self.batch_settings.array and len(self.step_cmds) > 1
+
     def _write_script(self):
         """Write the batch script
 
@@ -88,7 +100,12 @@ class BsubBatchStep(Step):
                 f.write(f"#BSUB -W {self.batch_settings.walltime}\n")
             if self.batch_settings.project:
                 f.write(f"#BSUB -P {self.batch_settings.project}\n")
-            f.write(f"#BSUB -J {self.name}\n")
+            if self._is_array():
+                # every task of the array writes its own output files
+                output, error = array_output_files(output, error, "%I")
+                f.write(f"#BSUB -J {self.name}[1-{len(self.step_cmds)}]\n")
+            else:
+                f.write(f"#BSUB -J {self.name}\n")
             f.write(f"#BSUB -o {output}\n")
             f.write(f"#BSUB -e {error}\n")
 
@@ -96,12 +113,12 @@ class BsubBatchStep(Step):
             for opt in opts:
                 f.write(f"#BSUB {opt}\n")
 
-            for i, cmd in enumerate(self.step_cmds):
-                f.write("\n")
-                f.write(f"{' '.join((cmd))} &\n")
-                if i == len(self.step_cmds) - 1:
-                    f.write("\n")
-                    f.write("wait\n")
+            if self._is_array():
+                write_array_cmds(f, self.step_cmds, "LSB_JOBINDEX", first_index=1)
+            else:
+                write_batch_cmds(
+                    f, self.step_cmds, self.step_slots, self.batch_settings.max_slots
+                )
         return batch_script
 
 
@@ -25,7 +25,13 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from ....log import get_logger
-from .step import Step
+from .step import (
+    Step,
+    array_output_files,
+    get_batch_slots,
+    write_array_cmds,
+    write_batch_cmds,
+)
 
 logger = get_logger(__name__)
 
@@ -44,6 +50,7 @@ class QsubBatchStep(Step):
         super().__init__(name, cwd)
         self.batch_settings = batch_settings
         self.step_cmds = []
+        self.step_slots = []
         self.managed = True
 
     def get_launch_cmd(self):
@@ -63,8 +70,13 @@ class QsubBatchStep(Step):
         """
         launch_cmd = step.get_launch_cmd()
         self.step_cmds.append(launch_cmd)
+        self.step_slots.append(get_batch_slots(step))
         logger.debug(f"Added step command to batch for {step.name}")
 
+    def _is_array(self):
+        """Whether the members run as tasks of an array job"""
+        return self.batch_settings.array and len(self.step_cmds) > 1
+
     def _write_script(self):
         """Write the batch script
 
@@ -75,6 +87,10 @@ class QsubBatchStep(Step):
         output, error = self.get_output_files()
         with open(batch_script, "w") as f:
             f.write("#!/bin/bash\n\n")
+            if self._is_array():
+                # every task of the array writes its own output files
+                output, error = array_output_files(output, error, "^array_index^")
+                f.write(f"#PBS -J 0-{len(self.step_cmds) - 1}\n")
             f.write(f"#PBS -o {output}\n")
             f.write(f"#PBS -e {error}\n")
             f.write(f"#PBS -N {self.name}\n")
@@ -87,10 +103,10 @@ class QsubBatchStep(Step):
             for cmd in self.batch_settings._preamble:
                 f.write(f"{cmd}\n")
 
-            for i, cmd in enumerate(self.step_cmds):
-                f.write("\n")
-                f.write(f"{' '.join((cmd))} &\n")
-                if i == len(self.step_cmds) - 1:
-                    f.write("\n")
-                    f.write("wait\n")
+            if self._is_array():
+                write_array_cmds(f, self.step_cmds, "PBS_ARRAY_INDEX")
+            else:
+                write_batch_cmds(
+                    f, self.step_cmds, self.step_slots, self.batch_settings.max_slots
+                )
         return batch_script
@@ -30,7 +30,13 @@ from shlex import split as sh_split
 
 from ....error import AllocationError
 from ....log import get_logger
-from .step import Step
+from .step import (
+    Step,
+    array_output_files,
+    get_batch_slots,
+    write_array_cmds,
+    write_batch_cmds,
+)
 
 logger = get_logger(__name__)
 
@@ -49,6 +55,7 @@ class SbatchStep(Step):
         super().__init__(name, cwd)
         self.batch_settings = batch_settings
         self.step_cmds = []
+        self.step_slots = []
         self.managed = True
 
     def get_launch_cmd(self):
@@ -69,8 +76,13 @@ class SbatchStep(Step):
         launch_cmd = ["cd", step.cwd, ";"]
         launch_cmd += step.get_launch_cmd()
         self.step_cmds.append(launch_cmd)
+        self.step_slots.append(get_batch_slots(step))
         logger.debug(f"Added step command to batch for {step.name}")
 
+    def _is_array(self):
+        """Whether the members run as tasks of an array job"""
+        return self.batch_settings.array and len(self.step_cmds) > 1
+
     def _write_script(self):
         """Write the batch script
 
@@ -81,6 +93,10 @@ class SbatchStep(Step):
         output, error = self.get_output_files()
         with open(batch_script, "w") as f:
             f.write("#!/bin/bash\n\n")
+            if self._is_array():
+                # every task of the array writes its own output files
+                output, error = array_output_files(output, error, "%a")
+                f.write(f"#SBATCH --array=0-{len(self.step_cmds) - 1}\n")
             f.write(f"#SBATCH --output={output}\n")
             f.write(f"#SBATCH --error={error}\n")
             f.write(f"#SBATCH --job-name={self.name}\n")
@@ -92,12 +108,12 @@ class SbatchStep(Step):
             for cmd in self.batch_settings._preamble:
                 f.write(f"{cmd}\n")
 
-            for i, cmd in enumerate(self.step_cmds):
-                f.write("\n")
-                f.write(f"{' '.join((cmd))} &\n")
-                if i == len(self.step_cmds) - 1:
-                    f.write("\n")
-                    f.write("wait\n")
+            if self._is_array():
+                write_array_cmds(f, self.step_cmds, "SLURM_ARRAY_TASK_ID")
+            else:
+                write_batch_cmds(
+                    f, self.step_cmds, self.step_slots, self.batch_settings.max_slots
+                )
         return batch_script
 
 
@@ -88,3 +88,111 @@ class Step:
                                       db_log_file,
                                       db_settings)
         return script_path
+
+
+def get_batch_slots(step):
+    """Number of slots a member of a batch uses, the number of
+    nodes it requests or one if it does not request any
+
+    :param step: a job step instance added to a batch
+    :type step: Step
+    :return: slots used by the step
+    :rtype: int
+    """
+    run_args = getattr(getattr(step, "run_settings", None), "run_args", {})
+    try:
+        return max(1, int(run_args.get("nodes", 1)))
+    except (TypeError, ValueError):
+        return 1
+
+
+# bash semaphore used by batch scripts with a limited number of slots.
+# `wait -n` returns once any member exits, the members that are not
+# alive anymore give their slots back before the next one starts
+_SLOTS_FUNCTION = """
+declare -A SMARTSIM_MEMBER_SLOTS
+SMARTSIM_FREE_SLOTS={max_slots}
+smartsim_acquire_slots() {{
+    while (( SMARTSIM_FREE_SLOTS < $1 )); do
+        wait -n
+        for pid in "${{!SMARTSIM_MEMBER_SLOTS[@]}}"; do
+            if ! kill -0 "$pid" 2>/dev/null; then
+                (( SMARTSIM_FREE_SLOTS += SMARTSIM_MEMBER_SLOTS[$pid] ))
+                unset "SMARTSIM_MEMBER_SLOTS[$pid]"
+            fi
+        done
+    done
+    (( SMARTSIM_FREE_SLOTS -= $1 ))
+}}
+"""
+
+
+def write_batch_cmds(f, step_cmds, step_slots, max_slots=None):
+    """Write the members of a batch to a batch script
+
+    Without a slot limit every member is started at once. Otherwise
+    members are started in order as soon as enough slots are free.
+
+    :param f: open batch script
+    :type f: file
+    :param step_cmds: launch command of each member
+    :type step_cmds: list[list[str]]
+    :param step_slots: slots used by each member
+    :type step_slots: list[int]
+    :param max_slots: slots members can use at once, defaults to None
+    :type max_slots: int, optional
+    """
+    if max_slots:
+        f.write(_SLOTS_FUNCTION.format(max_slots=max_slots))
+    for i, cmd in enumerate(step_cmds):
+        f.write("\n")
+        if max_slots:
+            # a member larger than the limit runs on its own
+            slots = min(step_slots[i], max_slots)
+            f.write(f"smartsim_acquire_slots {slots}\n")
+            f.write(f"{' '.join((cmd))} &\n")
+            f.write(f"SMARTSIM_MEMBER_SLOTS[$!]={slots}\n")
+        else:
+            f.write(f"{' '.join((cmd))} &\n")
+        if i == len(step_cmds) - 1:
+            f.write("\n")
+            f.write("wait\n")
+
+
+def array_output_files(output, error, index):
+    """Output and error files of each task of an array job
+
+    :param output: output file of the batch
+    :type output: str
+    :param error: error file of the batch
+    :type error: str
+    :param index: placeholder the scheduler replaces by the task index
+    :type index: str
+    :return: output and error file patterns
+    :rtype: tuple[str, str]
+    """
+    output_base, output_ext = osp.splitext(output)
+    error_base, error_ext = osp.splitext(error)
+    return f"{output_base}-{index}{output_ext}", f"{error_base}-{index}{error_ext}"
+
+
+def write_array_cmds(f, step_cmds, index_var, first_index=0):
+    """Write the members of a batch run as an array job
+
+    Each task of the array runs the member at its index.
+
+    :param f: open batch script
+    :type f: file
+    :param step_cmds: launch command of each member
+    :type step_cmds: list[list[str]]
+    :param index_var: environment variable holding the task index
+    :type index_var: str
+    :param first_index: index of the first task, defaults to 0
+    :type first_index: int, optional
+    """
+    f.write(f"\ncase ${index_var} in\n")
+    for i, cmd in enumerate(step_cmds, start=first_index):
+        f.write(f"    {i})\n")
+        f.write(f"        {' '.join((cmd))}\n")
+        f.write("        ;;\n")
+    f.write("esac\n")
@@ -33,6 +33,7 @@ from ...status import (
     STATUS_FAILED,
     STATUS_PAUSED,
     STATUS_RUNNING,
+    TERMINAL_STATUSES,
 )
 
 
@@ -53,6 +54,35 @@ class StepInfo:
         return info_str
 
 
+def aggregate_step_info(infos):
+    """Combine the updates of the tasks of an array job
+
+    The array is running while any task is running and paused while
+    tasks are only waiting. Once every task ended, the array failed
+    if any task failed, was cancelled if any task was cancelled, and
+    completed otherwise.
+
+    :param infos: update of each task of the array
+    :type infos: list[StepInfo]
+    :return: update of the task that represents the array
+    :rtype: StepInfo
+    """
+    order = [
+        STATUS_RUNNING,
+        STATUS_PAUSED,
+        STATUS_FAILED,
+        STATUS_CANCELLED,
+        STATUS_COMPLETED,
+    ]
+    live = [info for info in infos if info.status not in TERMINAL_STATUSES]
+    candidates = live or infos
+
+    def _rank(info):
+        return order.index(info.status) if info.status in order else len(order)
+
+    return min(candidates, key=_rank)
+
+
 class UnmanagedStepInfo(StepInfo):
 
     # see https://github.com/giampaolo/psutil/blob/master/psutil/_pslinux.py
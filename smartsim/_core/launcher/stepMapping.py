@@ -46,7 +46,7 @@ class StepMapping:
     def get_task_id(self, step_id):
         """Get the task id from the step id"""
         task_id = None
-        for stepmap in self.mapping.values():
+        for stepmap in list(self.mapping.values()):
             if stepmap.step_id == step_id:
                 task_id = stepmap.task_id
                 break
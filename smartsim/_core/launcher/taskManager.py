@@ -68,8 +68,17 @@ class TaskManager:
         """Start the task manager thread
 
         The TaskManager is run as a daemon thread meaning
-        that it will die when the main thread dies.
+        that it will die when the main thread dies. The thread
+        stops once no tasks are left and is started again by
+        ``start_task``, so only one monitor runs at a time.
         """
+        self._lock.acquire()
+        try:
+            if self.actively_monitoring:
+                return
+            self.actively_monitoring = True
+        finally:
+            self._lock.release()
         monitor = Thread(name="TaskManager", daemon=True, target=self.run)
         monitor.start()
 
@@ -81,11 +90,10 @@ class TaskManager:
         if verbose_tm:
             logger.debug("Starting Task Manager")
 
-        self.actively_monitoring = True
-        while self.actively_monitoring:
+        while True:
             time.sleep(TM_INTERVAL)
 
-            for task in self.tasks:
+            for task in list(self.tasks):
                 returncode = task.check_status()  # poll and set returncode
                 # has to be != None because returncode can be 0
                 if returncode is not None:
@@ -93,10 +101,17 @@ class TaskManager:
                     self.add_task_history(task.pid, returncode, output, error)
                     self.remove_task(task.pid)
 
-            if len(self) == 0:
-                self.actively_monitoring = False
-                if verbose_tm:
-                    logger.debug("Sleeping, no tasks to monitor")
+            # stop under the lock so that start_task either sees this
+            # monitor running or starts a new one
+            self._lock.acquire()
+            try:
+                if len(self) == 0:
+                    self.actively_monitoring = False
+                    break
+            finally:
+                self._lock.release()
+        if verbose_tm:
+            logger.debug("Sleeping, no tasks to monitor")
 
 
     def start_task(self, cmd_list, cwd, env=None, out=PIPE, err=PIPE):
@@ -126,6 +141,7 @@ class TaskManager:
                 logger.debug(f"Starting Task {task.pid}")
             self.tasks.append(task)
             self.task_history[task.pid] = (None, None, None)
+            self.start()
             return task.pid
 
         finally:
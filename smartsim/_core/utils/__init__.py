@@ -1,2 +1,8 @@
 from .helpers import colorize, delete_elements, init_default, installed_redisai_backends
-from .redis import check_cluster_status, create_cluster
+from .redis import (
+    add_cluster_shards,
+    check_cluster_status,
+    create_cluster,
+    remove_cluster_shards,
+    wait_for_shards,
+)
@@ -26,15 +26,20 @@
 
 import psutil
 import socket
+from functools import lru_cache
 
 
 """
 A handful of useful functions for dealing with networks
 """
 
+@lru_cache(maxsize=1024)
 def get_ip_from_host(host):
     """Return the IP address for the interconnect.
 
+    Lookups are cached as hosts are resolved repeatedly
+    during launch.
+
     :param host: hostname of the compute node e.g. nid00004
     :type host: str
     :returns: ip of host
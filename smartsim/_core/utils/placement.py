@@ -0,0 +1,88 @@
+# BSD 2-Clause License
+#
+# Copyright (c) 2021, Hewlett Packard Enterprise
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from ...error import SmartSimError
+
+
+def place_hosts(nodes, num_hosts, switches=None, avoid=None):
+    """Choose hosts spread over the switches of the nodes
+
+    Nodes are taken in turn from each switch, so consecutive
+    hosts are on different switches whenever possible. Nodes in
+    ``avoid``, e.g. nodes running compute-heavy ranks, are only
+    used when there are not enough other nodes.
+
+    :param nodes: nodes available, e.g. the nodes of an allocation
+    :type nodes: list[str]
+    :param num_hosts: number of hosts needed
+    :type num_hosts: int
+    :param switches: switch of each node, defaults to None
+    :type switches: dict[str, str], optional
+    :param avoid: nodes to use last, defaults to None
+    :type avoid: list[str], optional
+    :raises SmartSimError: if there are fewer nodes than hosts needed
+    :return: hosts in placement order
+    :rtype: list[str]
+    """
+    nodes = list(dict.fromkeys(nodes))
+    if len(nodes) < num_hosts:
+        raise SmartSimError(
+            f"{num_hosts} hosts are needed but only {len(nodes)} nodes were given"
+        )
+    switches = switches or {}
+    avoid = set(avoid or [])
+
+    hosts = []
+    for group in (
+        [n for n in nodes if n not in avoid],
+        [n for n in nodes if n in avoid],
+    ):
+        hosts.extend(_spread(group, switches))
+    return hosts[:num_hosts]
+
+
+def _spread(nodes, switches):
+    """Order nodes by taking one from each switch in turn
+
+    Nodes without a known switch are each treated as their own switch.
+
+    :param nodes: nodes to order
+    :type nodes: list[str]
+    :param switches: switch of each node
+    :type switches: dict[str, str]
+    :return: ordered nodes
+    :rtype: list[str]
+    """
+    groups = {}
+    for node in nodes:
+        groups.setdefault(switches.get(node, node), []).append(node)
+    # the largest switches are visited first so they are drained evenly
+    queues = sorted(groups.values(), key=len, reverse=True)
+    ordered = []
+    while queues:
+        ordered.extend(queue.pop(0) for queue in queues)
+        queues = [queue for queue in queues if queue]
+    return ordered
@@ -24,8 +24,12 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import fnmatch
 import logging
+import os.path as osp
+import struct
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import redis
 from rediscluster import RedisCluster
@@ -35,44 +39,585 @@ logging.getLogger("rediscluster").setLevel(logging.WARNING)
 
 from ...error import SSInternalError
 from ...log import get_logger
-from ..config import CONFIG
-from ..launcher.util.shell import execute_cmd
 from .network import get_ip_from_host
 
 logger = get_logger(__name__)
 
+# key length, absolute expiry in ms (0 for none) and payload length
+# of every entry in a file written by drain_keys
+_ENTRY_HEADER = struct.Struct(">IQQ")
 
-def create_cluster(hosts, ports):  # cov-wlm
+# number of hash slots in a Redis cluster
+_NUM_SLOTS = 16384
+
+
+def create_cluster(hosts, ports, replicas=0, timeout=60):  # cov-wlm
     """Connect launched cluster instances.
 
     Should only be used in the case where cluster initialization
     needs to occur manually which is not often.
 
+    The cluster is bootstrapped directly over connections to each
+    instance: hash slots are assigned to the primaries, all
+    instances are introduced to each other with ``CLUSTER MEET``,
+    replicas are attached to their primaries, and ``CLUSTER INFO``
+    and ``CLUSTER NODES`` are polled until every instance reports that
+    the cluster is ok and sees every primary and replica.
+
     :param hosts: List of hostnames to connect to
     :type hosts: List[str]
     :param ports: List of ports for each hostname
     :type ports: List[int]
-    :raises SmartSimError: if cluster creation fails
+    :param replicas: number of replicas per primary, defaults to 0
+    :type replicas: int, optional
+    :param timeout: seconds to wait for the cluster to converge, defaults to 60
+    :type timeout: float, optional
+    :raises SSInternalError: if cluster creation fails
     """
-    ip_list = []
-    for host in hosts:
-        ip = get_ip_from_host(host)
-        for port in ports:
-            address = ":".join((ip, str(port) + " "))
-            ip_list.append(address)
+    # interleave hosts so primaries are spread over as many hosts as possible
+    ips = resolve_hosts(hosts)
+    addresses = [(ip, port) for port in ports for ip in ips]
+    num_primaries = len(addresses) // (replicas + 1)
+    if num_primaries < 3:
+        raise SSInternalError(
+            f"Database cluster needs at least 3 primaries, {len(addresses)} "
+            + f"instances with {replicas} replicas gives {num_primaries}"
+        )
+    primaries = addresses[:num_primaries]
+    replica_of = _assign_replicas(primaries, addresses[num_primaries:], replicas)
+    clients = _connect(addresses)
+
+    def _run(func, targets):
+        return run_concurrently(func, targets, "Database cluster creation")
+
+    try:
+        node_ids = _run(
+            lambda addr: clients[addr].execute_command("CLUSTER MYID"), addresses
+        )
+
+        def _add_slots(addr):
+            i = primaries.index(addr)
+            start, stop = _slot_range(i, num_primaries)
+            # either command is refused if a previous attempt already
+            # ran it, so a retried creation carries on from here
+            try:
+                clients[addr].execute_command("CLUSTER SET-CONFIG-EPOCH", i + 1)
+            except redis.ResponseError as e:
+                logger.debug(f"Epoch of {addr[0]}:{addr[1]} not set: {e}")
+            try:
+                clients[addr].execute_command("CLUSTER ADDSLOTS", *range(start, stop))
+            except redis.ResponseError as e:
+                logger.debug(f"Slots of {addr[0]}:{addr[1]} not assigned: {e}")
+
+        _run(_add_slots, primaries)
+        logger.debug(f"Assigned hash slots to {num_primaries} primaries")
+
+        first_ip, first_port = addresses[0]
+        _run(
+            lambda addr: clients[addr].execute_command(
+                "CLUSTER MEET", first_ip, first_port
+            ),
+            addresses[1:],
+        )
+
+        def _cluster_view(addr):
+            flags = [node["flags"] for node in _cluster_nodes(clients[addr])]
+            return len(flags), sum("slave" in flag for flag in flags)
+
+        _wait_for(
+            lambda: all(
+                view[0] == len(addresses)
+                for view in _run(_cluster_view, addresses).values()
+            ),
+            timeout,
+            "Waiting for database instances to join the cluster...",
+        )
+
+        if replica_of:
+            _run(
+                lambda addr: clients[addr].execute_command(
+                    "CLUSTER REPLICATE", node_ids[replica_of[addr]]
+                ),
+                list(replica_of),
+            )
+            logger.debug(f"Attached {len(replica_of)} replicas to their primaries")
+
+        def _converged(addr):
+            return cluster_ok(clients[addr]) and _cluster_view(addr) == expected_view
+
+        expected_view = (len(addresses), len(replica_of))
+        _wait_for(
+            lambda: all(_run(_converged, addresses).values()),
+            timeout,
+            "Waiting for database cluster state to converge...",
+        )
+    finally:
+        _disconnect(clients)
+
+    logger.debug(
+        f"Database cluster created with {num_primaries} primaries "
+        + f"and {len(replica_of)} replicas"
+    )
+
+
+def add_cluster_shards(hosts, ports, new_hosts, timeout=60):  # cov-wlm
+    """Add launched instances to a running cluster as new shards
+
+    The new instances join the cluster with ``CLUSTER MEET`` and hash
+    slots, with the keys they hold, are migrated to them from the
+    existing primaries until every primary owns an equal share. The
+    cluster keeps serving requests while slots are moved.
+
+    :param hosts: List of hostnames of the cluster instances
+    :type hosts: List[str]
+    :param ports: List of ports for each hostname
+    :type ports: List[int]
+    :param new_hosts: List of hostnames of the instances to add
+    :type new_hosts: List[str]
+    :param timeout: seconds to wait for the cluster to converge, defaults to 60
+    :type timeout: float, optional
+    :raises SSInternalError: if the instances could not be added
+    """
+    addresses = [(ip, port) for port in ports for ip in resolve_hosts(hosts)]
+    new_addresses = [(ip, port) for port in ports for ip in resolve_hosts(new_hosts)]
+    all_addresses = addresses + new_addresses
+    clients = _connect(all_addresses)
+
+    def _run(func, targets):
+        return run_concurrently(func, targets, "Database cluster resharding")
+
+    try:
+        first_ip, first_port = addresses[0]
+        _run(
+            lambda addr: clients[addr].execute_command(
+                "CLUSTER MEET", first_ip, first_port
+            ),
+            new_addresses,
+        )
+
+        def _joined(addr):
+            nodes = _cluster_nodes(clients[addr])
+            return len(nodes) == len(all_addresses) and cluster_ok(clients[addr])
+
+        # keys can only be migrated once the new instances see a healthy cluster
+        _wait_for(
+            lambda: all(_run(_joined, all_addresses).values()),
+            timeout,
+            "Waiting for new database instances to join the cluster...",
+        )
+        primaries = [
+            addr
+            for addr, primary in _run(
+                lambda addr: _is_primary(clients[addr]), addresses
+            ).items()
+            if primary
+        ]
+        _rebalance(clients, primaries + new_addresses, primaries + new_addresses)
+        _wait_for(
+            lambda: all(
+                _run(lambda addr: cluster_ok(clients[addr]), all_addresses).values()
+            ),
+            timeout,
+            "Waiting for database cluster state to converge...",
+        )
+    finally:
+        _disconnect(clients)
+    logger.info(f"Added {len(new_addresses)} shards to the database cluster")
+
+
+def remove_cluster_shards(hosts, ports, old_hosts, timeout=60):  # cov-wlm
+    """Remove shards from a running cluster
+
+    Hash slots, with the keys they hold, are migrated from the shards
+    to remove to the remaining primaries. The removed instances are
+    then reset and forgotten by the cluster so they can be stopped.
+
+    :param hosts: List of hostnames of the instances that remain
+    :type hosts: List[str]
+    :param ports: List of ports for each hostname
+    :type ports: List[int]
+    :param old_hosts: List of hostnames of the instances to remove
+    :type old_hosts: List[str]
+    :param timeout: seconds to wait for the cluster to converge, defaults to 60
+    :type timeout: float, optional
+    :raises SSInternalError: if the shards could not be removed
+    """
+    addresses = [(ip, port) for port in ports for ip in resolve_hosts(hosts)]
+    old_addresses = [(ip, port) for port in ports for ip in resolve_hosts(old_hosts)]
+    clients = _connect(addresses + old_addresses)
+
+    def _run(func, targets):
+        return run_concurrently(func, targets, "Database cluster resharding")
+
+    try:
+        primaries = [
+            addr
+            for addr, primary in _run(
+                lambda addr: _is_primary(clients[addr]), addresses
+            ).items()
+            if primary
+        ]
+        if not primaries:
+            raise SSInternalError("No database shards would remain in the cluster")
+        _rebalance(clients, primaries + old_addresses, primaries)
+
+        old_ids = list(
+            _run(
+                lambda addr: clients[addr].execute_command("CLUSTER MYID"),
+                old_addresses,
+            ).values()
+        )
+        # reset the removed instances first so they stop gossiping
+        _run(
+            lambda addr: clients[addr].execute_command("CLUSTER RESET", "HARD"),
+            old_addresses,
+        )
+
+        def _forget(addr):
+            for node_id in old_ids:
+                try:
+                    clients[addr].execute_command("CLUSTER FORGET", node_id)
+                except redis.ResponseError as e:
+                    logger.debug(f"{addr[0]}:{addr[1]} did not forget {node_id}: {e}")
+
+        _run(_forget, addresses)
+
+        def _converged(addr):
+            nodes = _cluster_nodes(clients[addr])
+            return len(nodes) == len(addresses) and cluster_ok(clients[addr])
+
+        _wait_for(
+            lambda: all(_run(_converged, addresses).values()),
+            timeout,
+            "Waiting for database cluster state to converge...",
+        )
+    finally:
+        _disconnect(clients)
+    logger.info(f"Removed {len(old_addresses)} shards from the database cluster")
+
+
+def _rebalance(clients, owners, primaries):
+    """Migrate hash slots so that primaries own an equal share
+
+    :param clients: connections to the cluster instances
+    :type clients: dict
+    :param owners: addresses of instances that currently own slots
+    :type owners: list[tuple[str, int]]
+    :param primaries: addresses of the primaries that should own slots
+    :type primaries: list[tuple[str, int]]
+    """
+
+    def _run(func, targets):
+        return run_concurrently(func, targets, "Database cluster resharding")
+
+    owned = _run(lambda addr: _owned_slots(clients[addr]), owners)
+    node_ids = _run(lambda addr: clients[addr].execute_command("CLUSTER MYID"), owners)
+    moves = _plan_slot_moves(owned, primaries)
+    total = sum(len(slots) for slots in moves.values())
+    logger.info(f"Migrating {total} hash slots between {len(owners)} shards")
+
+    def _move(pair):
+        src, dst = pair
+        _migrate_slots(clients, src, dst, moves[pair], node_ids, primaries)
+
+    run_concurrently(_move, list(moves), "Database cluster resharding")
+
+
+def _plan_slot_moves(owned, primaries):
+    """Decide which hash slots to move so primaries own an equal share
+
+    :param owned: slots currently owned by each instance
+    :type owned: dict[tuple[str, int], list[int]]
+    :param primaries: instances that should own slots afterwards
+    :type primaries: list[tuple[str, int]]
+    :return: slots to move for each (source, destination) pair
+    :rtype: dict[tuple, list[int]]
+    """
+    targets = {}
+    for i, addr in enumerate(primaries):
+        start, stop = _slot_range(i, len(primaries))
+        targets[addr] = stop - start
+
+    surplus = []
+    for addr, slots in owned.items():
+        surplus.extend((addr, slot) for slot in sorted(slots)[targets.get(addr, 0) :])
+
+    moves = {}
+    for addr in primaries:
+        need = targets[addr] - len(owned.get(addr, []))
+        while need > 0 and surplus:
+            src, slot = surplus.pop()
+            moves.setdefault((src, addr), []).append(slot)
+            need -= 1
+    return moves
+
+
+def _migrate_slots(clients, src, dst, slots, node_ids, primaries, batch=256):
+    """Move hash slots and their keys from one primary to another
+
+    Slots are moved in batches with pipelined commands. Keys are only
+    migrated for slots that hold any, replacing keys a failed earlier
+    attempt already copied. Keys are moved over connections that do not
+    decode responses, as key names may be any bytes. If a batch fails,
+    its slots are set back to stable on both instances so the move can
+    be retried.
+
+    :param clients: connections to the cluster instances
+    :type clients: dict
+    :param src: address of the current owner
+    :type src: tuple[str, int]
+    :param dst: address of the new owner
+    :type dst: tuple[str, int]
+    :param slots: slots to move
+    :type slots: list[int]
+    :param node_ids: cluster node id of each owner
+    :type node_ids: dict
+    :param primaries: primaries to notify of the new owner
+    :type primaries: list[tuple[str, int]]
+    :param batch: number of slots moved at a time, defaults to 256
+    :type batch: int, optional
+    """
+
+    def _pipelined(client, *commands):
+        pipe = client.pipeline(transaction=False)
+        for command in commands:
+            pipe.execute_command(*command)
+        return pipe.execute()
+
+    def _move_keys(slot):
+        while True:
+            keys = key_client.execute_command("CLUSTER GETKEYSINSLOT", slot, 1000)
+            if not keys:
+                return
+            key_client.execute_command(
+                "MIGRATE", dst[0], dst[1], "", 0, 60000, "REPLACE", "KEYS", *keys
+            )
+
+    def _move_chunk(chunk, setslot):
+        importing = [("CLUSTER SETSLOT", s, "IMPORTING", node_ids[src]) for s in chunk]
+        migrating = [("CLUSTER SETSLOT", s, "MIGRATING", node_ids[dst]) for s in chunk]
+        _pipelined(dst_client, *importing)
+        _pipelined(src_client, *migrating)
+        counts = _pipelined(
+            src_client, *[("CLUSTER COUNTKEYSINSLOT", s) for s in chunk]
+        )
+        for slot, count in zip(chunk, counts):
+            if count:
+                _move_keys(slot)
+        # the new owner must learn of the slots first so no key is lost
+        _pipelined(dst_client, *setslot)
+
+    def _stable(chunk):
+        stable = [("CLUSTER SETSLOT", s, "STABLE") for s in chunk]
+        for client in (src_client, dst_client):
+            try:
+                _pipelined(client, *stable)
+            except redis.RedisError as e:
+                logger.warning(f"Could not reset the state of migrating slots: {e}")
+
+    src_client, dst_client = clients[src], clients[dst]
+    key_client = redis.Redis(host=src[0], port=src[1])
+    try:
+        for i in range(0, len(slots), batch):
+            chunk = slots[i : i + batch]
+            setslot = [("CLUSTER SETSLOT", s, "NODE", node_ids[dst]) for s in chunk]
+            try:
+                _move_chunk(chunk, setslot)
+            except redis.RedisError:
+                _stable(chunk)
+                raise
+            # the rest would also learn of it by gossip, this only speeds it up.
+            # A drained primary turns into a replica and refuses SETSLOT
+            for addr in [src] + [p for p in primaries if p not in (src, dst)]:
+                try:
+                    _pipelined(clients[addr], *setslot)
+                except redis.ResponseError as e:
+                    logger.debug(f"{addr[0]}:{addr[1]} did not take slot owner: {e}")
+    finally:
+        key_client.connection_pool.disconnect()
+    logger.debug(f"Moved {len(slots)} hash slots to {dst[0]}:{dst[1]}")
+
+
+def _connect(addresses):
+    """Create one connection pool per instance
+
+    :param addresses: (ip, port) of each instance
+    :type addresses: list[tuple[str, int]]
+    :return: client for each address
+    :rtype: dict
+    """
+    return {
+        address: redis.Redis(host=address[0], port=address[1], decode_responses=True)
+        for address in addresses
+    }
+
+
+def _disconnect(clients):
+    for client in clients.values():
+        client.connection_pool.disconnect()
+
+
+def run_concurrently(func, targets, action):
+    """Run func for each target concurrently, surfacing failures
+
+    :param func: function called with each target
+    :type func: callable
+    :param targets: (ip, port) addresses or other targets
+    :type targets: list
+    :param action: description of the operation used in errors
+    :type action: str
+    :return: result for each target
+    :rtype: dict
+    """
+    if not targets:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(32, len(targets))) as executor:
+        futures = [(target, executor.submit(func, target)) for target in targets]
+        results = {}
+        for target, future in futures:
+            try:
+                results[target] = future.result()
+            except redis.RedisError as e:
+                raise SSInternalError(f"{action} failed on {target}") from e
+        return results
+
+
+def _cluster_nodes(client):
+    """Get the nodes an instance knows of
+
+    :param client: connection to the instance
+    :type client: redis.Redis
+    :return: node_id, flags and slots of each node
+    :rtype: list[dict]
+    """
+    nodes = client.execute_command("CLUSTER NODES")
+    if isinstance(nodes, dict):
+        return list(nodes.values())
+    parsed = []
+    for line in nodes.strip().splitlines():
+        fields = line.split()
+        slots = [field.split("-") for field in fields[8:]]
+        parsed.append({"node_id": fields[0], "flags": fields[2], "slots": slots})
+    return parsed
+
+
+def _myself(client):
+    for node in _cluster_nodes(client):
+        if "myself" in node["flags"]:
+            return node
+    raise SSInternalError("Database instance is missing from its own node list")
+
+
+def _is_primary(client):
+    return "master" in _myself(client)["flags"]
 
-    # call cluster command
-    redis_cli = CONFIG.redis_cli
-    cmd = [redis_cli, "--cluster", "create"]
-    cmd += ip_list
-    cmd += ["--cluster-replicas", "0"]
-    returncode, out, err = execute_cmd(cmd, proc_input="yes", shell=False)
 
-    if returncode != 0:
-        logger.error(out)
-        logger.error(err)
-        raise SSInternalError("Database '--cluster create' command failed")
-    logger.debug(out)
+def _owned_slots(client):
+    """Get the hash slots an instance owns
+
+    :param client: connection to the instance
+    :type client: redis.Redis
+    :rtype: list[int]
+    """
+    slots = []
+    for slot_range in _myself(client)["slots"]:
+        # slots being imported or migrated are listed as [slot->-id]
+        if str(slot_range[0]).startswith("["):
+            continue
+        start, stop = int(slot_range[0]), int(slot_range[-1])
+        slots.extend(range(start, stop + 1))
+    return slots
+
+
+def cluster_ok(client):
+    """Check that an instance reports a healthy cluster
+
+    :param client: connection to the instance
+    :type client: redis.Redis
+    :rtype: bool
+    """
+    info = client.execute_command("CLUSTER INFO")
+    if isinstance(info, dict):
+        return info.get("cluster_state") == "ok"
+    return "cluster_state:ok" in info
+
+
+def _assign_replicas(primaries, replicas, replicas_per_primary):
+    """Pick the primary each replica follows
+
+    Every primary gets ``replicas_per_primary`` replicas. Replicas are
+    placed on hosts other than their primary's whenever possible so
+    losing one host does not lose every copy of a shard.
+
+    :param primaries: addresses of the primaries
+    :type primaries: list[tuple[str, int]]
+    :param replicas: addresses of the replicas
+    :type replicas: list[tuple[str, int]]
+    :param replicas_per_primary: number of replicas per primary
+    :type replicas_per_primary: int
+    :return: mapping of replica address to primary address
+    :rtype: dict
+    """
+    counts = [0] * len(primaries)
+    replica_of = {}
+    for replica in replicas:
+        candidates = [i for i, n in enumerate(counts) if n < replicas_per_primary]
+        # prefer other hosts, then the primary with the fewest replicas
+        best = min(
+            candidates,
+            key=lambda i: (primaries[i][0] == replica[0], counts[i], i),
+        )
+        counts[best] += 1
+        replica_of[replica] = primaries[best]
+
+    # greedy choices can leave a replica next to its primary,
+    # swap primaries with another replica where that resolves it
+    for replica in replicas:
+        primary = replica_of[replica]
+        if replica[0] != primary[0]:
+            continue
+        for other in replicas:
+            other_primary = replica_of[other]
+            if other[0] != primary[0] and replica[0] != other_primary[0]:
+                replica_of[replica], replica_of[other] = other_primary, primary
+                break
+    return replica_of
+
+
+def _slot_range(index, num_primaries):
+    """Get the contiguous range of hash slots owned by a primary
+
+    :param index: index of the primary
+    :type index: int
+    :param num_primaries: number of primaries in the cluster
+    :type num_primaries: int
+    :return: first slot and one past the last slot
+    :rtype: tuple[int, int]
+    """
+    start = index * _NUM_SLOTS // num_primaries
+    stop = (index + 1) * _NUM_SLOTS // num_primaries
+    return start, stop
+
+
+def _wait_for(condition, timeout, message):
+    """Poll a condition with a short backoff
+
+    :param condition: callable returning True once satisfied
+    :type condition: callable
+    :param timeout: seconds to wait
+    :type timeout: float
+    :param message: debug message logged while waiting
+    :type message: str
+    :raises SSInternalError: if the condition is not met in time
+    """
+    deadline = time.time() + timeout
+    backoff = 0.05
+    while not condition():
+        if time.time() > deadline:
+            raise SSInternalError(f"Timed out after {timeout}s: {message}")
+        logger.debug(message)
+        time.sleep(backoff)
+        backoff = min(backoff * 2, 0.5)
 
 
 def check_cluster_status(hosts, ports, trials=10):  # cov-wlm
@@ -82,23 +627,24 @@ def check_cluster_status(hosts, ports, trials=10):  # cov-wlm
     :type hosts: List[str]
     :param ports: List of ports for each hostname
     :type ports: List[int]
-    :param trials: number of attempts to verify cluster status
+    :param trials: number of five second intervals to wait for the
+                   cluster, attempts are made more often early on
     :type trials: int, optional
 
     :raises SmartSimError: If cluster status cannot be verified
     """
     host_list = []
-    for host in hosts:
+    for ip in resolve_hosts(hosts):
         for port in ports:
             host_dict = dict()
-            host_dict["host"] = get_ip_from_host(host)
+            host_dict["host"] = ip
             host_dict["port"] = port
             host_list.append(host_dict)
 
     logger.debug("Beginning database cluster status check...")
-    while trials > 0:
-        # wait for cluster to spin up
-        time.sleep(5)
+    deadline = time.time() + 5 * trials
+    backoff = 0.1
+    while True:
         try:
             redis_tester = RedisCluster(startup_nodes=host_list)
             redis_tester.set("__test__", "__test__")
@@ -107,6 +653,397 @@ def check_cluster_status(hosts, ports, trials=10):  # cov-wlm
             return
         except (ClusterDownError, RedisClusterException, redis.RedisError):
             logger.debug("Cluster still spinning up...")
-            trials -= 1
-    if trials == 0:
-        raise SSInternalError("Cluster setup could not be verified")
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise SSInternalError("Cluster setup could not be verified")
+        # wait for cluster to spin up
+        time.sleep(min(backoff, remaining))
+        backoff = min(backoff * 2, 5)
+
+
+def resolve_hosts(hosts):
+    """Resolve the IP addresses of hosts concurrently
+
+    :param hosts: List of hostnames to resolve
+    :type hosts: List[str]
+    :return: IP address of each host
+    :rtype: List[str]
+    """
+    hosts = list(hosts)
+    if len(hosts) < 2:
+        return [get_ip_from_host(host) for host in hosts]
+    with ThreadPoolExecutor(max_workers=min(32, len(hosts))) as executor:
+        return list(executor.map(get_ip_from_host, hosts))
+
+
+def ping_shard(host, port, timeout=1.0):
+    """Check if a database shard answers a PING
+
+    :param host: IP address or hostname of the shard
+    :type host: str
+    :param port: port of the shard
+    :type port: int
+    :param timeout: socket timeout in seconds, defaults to 1.0
+    :type timeout: float, optional
+    :return: True if the shard replied
+    :rtype: bool
+    """
+    client = redis.Redis(
+        host=host, port=port, socket_connect_timeout=timeout, socket_timeout=timeout
+    )
+    try:
+        return bool(client.ping())
+    except redis.RedisError:
+        return False
+    finally:
+        client.connection_pool.disconnect()
+
+
+def wait_for_shards(hosts, ports, timeout=120, failed=None):
+    """Wait for every database shard to accept connections
+
+    All shards are probed concurrently and probing of shards
+    that are not ready yet is retried with a short backoff.
+
+    :param hosts: List of hostnames of the shards
+    :type hosts: List[str]
+    :param ports: List of ports for each hostname
+    :type ports: List[int]
+    :param timeout: seconds to wait for all shards, defaults to 120
+    :type timeout: float, optional
+    :param failed: called between probes, returns True if the shards
+                   failed and will never become ready, defaults to None
+    :type failed: callable, optional
+    :raises SSInternalError: if not all shards are ready in time
+                             or the shards failed
+    """
+    pending = [(ip, port) for ip in resolve_hosts(hosts) for port in ports]
+    num_shards = len(pending)
+    deadline = time.time() + timeout
+    backoff = 0.05
+
+    with ThreadPoolExecutor(max_workers=min(32, num_shards) or 1) as executor:
+        while pending:
+            num_pending = len(pending)
+            ready = list(executor.map(lambda addr: ping_shard(*addr), pending))
+            pending = [addr for addr, up in zip(pending, ready) if not up]
+            if len(pending) < num_pending or not pending:
+                logger.info(
+                    f"Database shards ready: {num_shards - len(pending)}/{num_shards}"
+                )
+            if not pending:
+                break
+            if failed and failed():
+                raise SSInternalError("Database shards failed during startup")
+            if time.time() > deadline:
+                not_ready = ", ".join(f"{ip}:{port}" for ip, port in pending)
+                raise SSInternalError(
+                    f"Database shards did not become ready in time: {not_ready}"
+                )
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 0.5)
+
+
+def connect_to_addresses(addresses):
+    """Connect to a database given the addresses of its shards
+
+    :param addresses: "host:port" address of every shard
+    :type addresses: list[str]
+    :return: a cluster client for several shards, else a plain client
+    :rtype: redis.Redis | RedisCluster
+    """
+    nodes = []
+    for address in addresses:
+        host, port = address.rsplit(":", 1)
+        nodes.append({"host": host, "port": int(port)})
+    if len(nodes) > 1:
+        return RedisCluster(startup_nodes=nodes)
+    return redis.Redis(**nodes[0])
+
+
+def drain_keys(source, patterns, target, batch_size=1000):
+    """Copy the keys matching patterns from one database to another
+
+    Keys are found with ``SCAN`` and copied in batches with pipelined
+    ``DUMP`` and ``RESTORE``, keeping their time to live. Existing keys
+    of the target are replaced. Instead of a database, the target can
+    be a binary file; see ``restore_keys`` to load it. Every entry of
+    the file is the length-prefixed key and ``DUMP`` payload with the
+    absolute expiry of the key, so the time spent on disk counts
+    towards its time to live.
+
+    :param source: database to copy from
+    :type source: redis.Redis
+    :param patterns: glob-style patterns of the keys to copy
+    :type patterns: list[str]
+    :param target: database or binary file to copy to
+    :type target: redis.Redis | RedisCluster | io.BufferedWriter
+    :param batch_size: keys per pipelined batch, defaults to 1000
+    :type batch_size: int, optional
+    :return: number of keys copied
+    :rtype: int
+    """
+    copied = 0
+    for pattern in patterns:
+        keys = []
+        for key in source.scan_iter(match=pattern, count=batch_size):
+            keys.append(key)
+            if len(keys) == batch_size:
+                copied += _copy_keys(source, keys, target)
+                keys = []
+        if keys:
+            copied += _copy_keys(source, keys, target)
+    return copied
+
+
+def restore_keys(file_name, target, batch_size=1000):
+    """Load keys written to a file by ``drain_keys`` into a database
+
+    Keys that expired since they were written are skipped.
+
+    :param file_name: file written by ``drain_keys``
+    :type file_name: str
+    :param target: database to load the keys into
+    :type target: redis.Redis | RedisCluster
+    :param batch_size: keys per pipelined batch, defaults to 1000
+    :type batch_size: int, optional
+    :raises SSInternalError: if the file is truncated
+    :return: number of keys restored
+    :rtype: int
+    """
+    restored = 0
+    entries = []
+    with open(file_name, "rb") as f:
+        while True:
+            header = f.read(_ENTRY_HEADER.size)
+            if not header:
+                break
+            if len(header) < _ENTRY_HEADER.size:
+                raise SSInternalError(f"Truncated entry in {file_name}")
+            key_len, expiry, payload_len = _ENTRY_HEADER.unpack(header)
+            key, payload = f.read(key_len), f.read(payload_len)
+            if len(key) < key_len or len(payload) < payload_len:
+                raise SSInternalError(f"Truncated entry in {file_name}")
+
+            ttl = 0
+            if expiry:
+                ttl = expiry - int(time.time() * 1000)
+                if ttl <= 0:
+                    continue
+            entries.append((key, ttl, payload))
+            if len(entries) == batch_size:
+                restored += _restore(entries, target)
+                entries = []
+    return restored + _restore(entries, target)
+
+
+def _copy_keys(source, keys, target):
+    pipe = source.pipeline(transaction=False)
+    for key in keys:
+        pipe.dump(key)
+        pipe.pttl(key)
+    results = pipe.execute()
+    entries = [
+        (key, max(ttl, 0), payload)
+        for key, payload, ttl in zip(keys, results[::2], results[1::2])
+        # keys can expire or be deleted between SCAN and DUMP
+        if payload is not None
+    ]
+    if hasattr(target, "pipeline"):
+        return _restore(entries, target)
+    now = int(time.time() * 1000)
+    for key, ttl, payload in entries:
+        expiry = now + ttl if ttl else 0
+        target.write(_ENTRY_HEADER.pack(len(key), expiry, len(payload)))
+        target.write(key)
+        target.write(payload)
+    return len(entries)
+
+
+def _restore(entries, target):
+    if not entries:
+        return 0
+    pipe = target.pipeline(transaction=False)
+    for key, ttl, payload in entries:
+        pipe.restore(key, ttl, payload, replace=True)
+    pipe.execute()
+    return len(entries)
+
+
+_ML_BACKENDS = ("TF", "TFLITE", "TORCH", "ONNX")
+
+
+def ml_model_spec(
+    name,
+    backend,
+    model_path,
+    device="CPU",
+    batch_size=0,
+    min_batch_size=0,
+    min_batch_timeout=0,
+    tag="",
+    inputs=None,
+    outputs=None,
+):
+    """Describe a RedisAI model to load into a database at startup
+
+    :param name: key the model is stored under
+    :type name: str
+    :param backend: one of TF, TFLITE, TORCH or ONNX
+    :type backend: str
+    :param model_path: path of the serialized model
+    :type model_path: str
+    :param device: device to run the model on, defaults to "CPU"
+    :type device: str, optional
+    :param batch_size: batch requests up to this size, defaults to 0 (off)
+    :type batch_size: int, optional
+    :param min_batch_size: smallest batch to execute, defaults to 0
+    :type min_batch_size: int, optional
+    :param min_batch_timeout: ms to wait for min_batch_size, defaults to 0
+    :type min_batch_timeout: int, optional
+    :param tag: tag of the model, defaults to ""
+    :type tag: str, optional
+    :param inputs: input nodes of TF models, defaults to None
+    :type inputs: list[str], optional
+    :param outputs: output nodes of TF models, defaults to None
+    :type outputs: list[str], optional
+    :raises ValueError: if the backend is not supported
+    :raises FileNotFoundError: if the model file does not exist
+    :return: description of the model
+    :rtype: dict
+    """
+    backend = str(backend).upper()
+    if backend not in _ML_BACKENDS:
+        raise ValueError(f"Backend {backend} is not one of {', '.join(_ML_BACKENDS)}")
+    model_path = osp.abspath(model_path)
+    if not osp.isfile(model_path):
+        raise FileNotFoundError(f"Model file {model_path} could not be found")
+    for arg, value in [
+        ("batch_size", batch_size),
+        ("min_batch_size", min_batch_size),
+        ("min_batch_timeout", min_batch_timeout),
+    ]:
+        if not isinstance(value, int) or value < 0:
+            raise ValueError(f"{arg} must be a non-negative integer")
+    return {
+        "name": name,
+        "backend": backend,
+        "model_path": model_path,
+        "device": device.upper(),
+        "batch_size": batch_size,
+        "min_batch_size": min_batch_size,
+        "min_batch_timeout": min_batch_timeout,
+        "tag": tag,
+        "inputs": inputs,
+        "outputs": outputs,
+    }
+
+
+def ml_script_spec(name, script_path, device="CPU"):
+    """Describe a TorchScript script to load into a database at startup
+
+    :param name: key the script is stored under
+    :type name: str
+    :param script_path: path of the script
+    :type script_path: str
+    :param device: device to run the script on, defaults to "CPU"
+    :type device: str, optional
+    :raises FileNotFoundError: if the script file does not exist
+    :return: description of the script
+    :rtype: dict
+    """
+    script_path = osp.abspath(script_path)
+    if not osp.isfile(script_path):
+        raise FileNotFoundError(f"Script file {script_path} could not be found")
+    return {"name": name, "script_path": script_path, "device": device.upper()}
+
+
+_PROFILE_KEYS = ("device", "batch_size", "min_batch_size", "min_batch_timeout")
+
+
+def inference_profile(
+    device=None, batch_size=None, min_batch_size=None, min_batch_timeout=None
+):
+    """Describe batching and device settings for models
+
+    Settings left as None keep the value the model was added with.
+
+    :param device: device to run the models on, defaults to None
+    :type device: str, optional
+    :param batch_size: batch requests up to this size, defaults to None
+    :type batch_size: int, optional
+    :param min_batch_size: smallest batch to execute, defaults to None
+    :type min_batch_size: int, optional
+    :param min_batch_timeout: ms to wait for min_batch_size, defaults to None
+    :type min_batch_timeout: int, optional
+    :raises ValueError: if a batching setting is negative
+    :return: the settings that are set
+    :rtype: dict
+    """
+    profile = {}
+    for key, value in zip(
+        _PROFILE_KEYS, (device, batch_size, min_batch_size, min_batch_timeout)
+    ):
+        if value is None:
+            continue
+        if key == "device":
+            value = str(value).upper()
+        elif isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ValueError(f"{key} must be a non-negative integer")
+        profile[key] = value
+    return profile
+
+
+def apply_inference_profiles(models, profiles):
+    """Apply inference profiles to the models they match
+
+    :param models: descriptions from ``ml_model_spec``
+    :type models: list[dict]
+    :param profiles: profiles keyed by model name or glob pattern, applied
+                     in order so later matches take precedence
+    :type profiles: dict[str, dict]
+    :return: the models with their profiles applied
+    :rtype: list[dict]
+    """
+    profiled = []
+    for model in models:
+        model = dict(model)
+        for pattern, profile in profiles.items():
+            if fnmatch.fnmatchcase(model["name"], pattern):
+                model.update(profile)
+        profiled.append(model)
+    return profiled
+
+
+def preload_ml(client, models, scripts):
+    """Load models and scripts into a database
+
+    :param client: SmartRedis client of the database
+    :type client: smartredis.Client
+    :param models: descriptions from ``ml_model_spec``
+    :type models: list[dict]
+    :param scripts: descriptions from ``ml_script_spec``
+    :type scripts: list[dict]
+    """
+    for model in models:
+        kwargs = {}
+        if model["min_batch_timeout"]:
+            # only understood by SmartRedis clients newer than 0.3
+            kwargs["min_batch_timeout"] = model["min_batch_timeout"]
+        client.set_model_from_file(
+            model["name"],
+            model["model_path"],
+            model["backend"],
+            device=model["device"],
+            batch_size=model["batch_size"],
+            min_batch_size=model["min_batch_size"],
+            tag=model["tag"],
+            inputs=model["inputs"],
+            outputs=model["outputs"],
+            **kwargs,
+        )
+    for script in scripts:
+        client.set_script_from_file(
+            script["name"], script["script_path"], device=script["device"]
+        )
+    logger.debug(f"Loaded {len(models)} models and {len(scripts)} scripts")
@@ -25,6 +25,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 import sys
 import itertools
+from fnmatch import fnmatchcase
 from os import getcwd
 from shlex import split as sh_split
 from warnings import simplefilter, warn
@@ -34,10 +35,19 @@ import redis
 from smartredis import Client
 from smartredis.error import RedisReplyError
 
-from .._core.utils import check_cluster_status
+from .._core.utils.redis import (
+    apply_inference_profiles,
+    cluster_ok,
+    inference_profile,
+    ml_model_spec,
+    ml_script_spec,
+    preload_ml,
+    run_concurrently,
+)
 from .._core.config import CONFIG
 from .._core.utils.helpers import is_valid_cmd
 from .._core.utils.network import get_ip_from_host
+from .._core.utils.placement import place_hosts
 from ..entity import DBNode, EntityList
 from ..error import SmartSimError, SSConfigError, SSInternalError, SSUnsupportedError
 from ..log import get_logger
@@ -77,6 +87,7 @@ class Orchestrator(EntityList):
         time=None,
         alloc=None,
         single_cmd=False,
+        replicas_per_shard=0,
         **kwargs,
     ):
         """Initialize an Orchestrator reference for local launch
@@ -85,6 +96,17 @@ class Orchestrator(EntityList):
         :type port: int, optional
         :param interface: network interface, defaults to "lo"
         :type interface: str, optional
+        :param db_nodes: number of database shards, defaults to 1
+        :type db_nodes: int, optional
+        :param replicas_per_shard: number of replicas launched for each
+                                   of the ``db_nodes`` shards of a
+                                   cluster, defaults to 0. In total
+                                   ``db_nodes * (1 + replicas_per_shard)``
+                                   database instances are launched, each
+                                   needing its own host. Replicas add
+                                   redundancy only, clients read from
+                                   and write to the primaries.
+        :type replicas_per_shard: int, optional
 
         Extra configurations for RedisAI
 
@@ -137,12 +159,31 @@ class Orchestrator(EntityList):
             logger.info(msg)
             single_cmd = False
 
+        if isinstance(replicas_per_shard, bool) or not isinstance(
+            replicas_per_shard, int
+        ):
+            raise TypeError("replicas_per_shard must be an integer")
+        if replicas_per_shard < 0:
+            raise ValueError("replicas_per_shard must be non-negative")
+        if replicas_per_shard and db_nodes < 3:
+            raise SSUnsupportedError(
+                "Replicas are only supported for clustered orchestrators (db_nodes >= 3)"
+            )
+        # every shard is launched as one primary and its replicas
+        self.replicas_per_shard = replicas_per_shard
+        db_nodes *= 1 + replicas_per_shard
+
         self.launcher = launcher
         self.run_command = run_command
 
         self.ports = []
         self.path = getcwd()
         self._hosts = []
+        self._controller = None
+        self._admin = None
+        self._ml_models = []
+        self._ml_scripts = []
+        self._inference_profiles = {}
         self._interface = interface
         self._check_network_interface()
         self.queue_threads = kwargs.get("threads_per_queue", None)
@@ -179,11 +220,10 @@ class Orchestrator(EntityList):
             # will raise SSConfigError if not found
             self._redis_exe
             self._redis_conf
-            CONFIG.redis_cli
         except SSConfigError as e:
             msg = "SmartSim not installed with pre-built extensions (Redis)\n"
             msg += "Use the `smart` cli tool to install needed extensions\n"
-            msg += "or set REDIS_PATH and REDIS_CLI_PATH in your environment\n"
+            msg += "or set REDIS_PATH in your environment\n"
             msg += "See documentation for more information"
             raise SSConfigError(msg) from e
 
@@ -205,12 +245,13 @@ class Orchestrator(EntityList):
     def num_shards(self):
         """Return the number of DB shards contained in the orchestrator.
         This might differ from the number of ``DBNode`` objects, as each
-        ``DBNode`` may start more than one shard (e.g. with MPMD).
+        ``DBNode`` may start more than one shard (e.g. with MPMD), and
+        replicas are not counted as shards.
 
         :returns: num_shards
         :rtype: int
         """
-        return self.db_nodes
+        return self.db_nodes // (1 + self.replicas_per_shard)
 
     @property
     def hosts(self):
@@ -261,25 +302,141 @@ class Orchestrator(EntityList):
         if not self._hosts:
             return False
 
+        clients = self._admin_clients()
         # if single shard
         if self.num_shards < 2:
-            host = self._hosts[0]
-            port = self.ports[0]
             try:
-                client = redis.Redis(host=host, port=port, db=0)
-                if client.ping():
-                    return True
-                return False
+                return bool(next(iter(clients.values())).ping())
             except redis.RedisError:
                 return False
-        # if a cluster
-        else:
-            try:
-                check_cluster_status(self._hosts, self.ports, trials=1)
-                return True
-            # we expect this to fail if the cluster is not active
-            except SSInternalError:
-                return False
+        # if a cluster, every shard must report a healthy cluster
+        try:
+            states = run_concurrently(
+                lambda address: cluster_ok(clients[address]),
+                list(clients),
+                "Database health check",
+            )
+            return all(states.values())
+        # we expect this to fail if the cluster is not active
+        except SSInternalError:
+            return False
+
+    def _admin_clients(self):
+        """Pooled connections to every shard, created on first use
+
+        The connections are shared by the admin methods, such as
+        ``is_active`` and ``set_db_conf``, and recreated when the
+        shards of the database change.
+
+        :return: client for each (ip, port) of the shards
+        :rtype: dict[tuple[str, int], redis.Redis]
+        """
+        key = (tuple(self._hosts), tuple(self.ports))
+        admin = getattr(self, "_admin", None)
+        if admin is None or admin[0] != key:
+            if admin is not None:
+                for client in admin[1].values():
+                    client.connection_pool.disconnect()
+            clients = {}
+            for host in self._hosts:
+                ip = get_ip_from_host(host)
+                for port in self.ports:
+                    clients[(ip, port)] = redis.Redis(
+                        host=ip, port=port, socket_connect_timeout=5
+                    )
+            self._admin = (key, clients)
+        return self._admin[1]
+
+    def add_shards(self, num_shards, hosts=None):
+        """Launch new shards and add them to the running database
+
+        The new ``DBNode`` instances are launched with the launcher of
+        the orchestrator and hash slots, together with their keys, are
+        migrated to them while the database stays online. Entities
+        launched afterwards connect to every shard through ``SSDB``.
+
+        Only clustered orchestrators without replicas that were
+        launched by this experiment, on an allocation or locally, can
+        be resharded.
+
+        :param num_shards: number of shards to add
+        :type num_shards: int
+        :param hosts: hosts to launch the new shards on, defaults to None
+        :type hosts: list[str], optional
+        :raises SmartSimError: if the orchestrator is not active
+        :raises SSUnsupportedError: if the orchestrator can not be resharded
+        """
+        controller = self._get_reshard_controller(num_shards)
+        if hosts is not None and len(hosts) != num_shards:
+            raise ValueError(
+                f"{num_shards} hosts are needed to add {num_shards} shards"
+            )
+
+        port = self.ports[0]
+        kwargs = dict(self._shard_kwargs, db_nodes=1, single_cmd=False)
+        kwargs["run_args"] = dict(kwargs.get("run_args", None) or {})
+        dbnodes = []
+        for i, db_id in enumerate(range(self.db_nodes, self.db_nodes + num_shards)):
+            db_shard_name = "_".join((self.name, str(db_id)))
+            exe_args = " ".join(self._get_start_script_args(db_shard_name, port, True))
+            run_settings = self._build_run_settings(sys.executable, exe_args, **kwargs)
+            if hosts:
+                run_settings.set_hostlist([hosts[i]])
+            dbnodes.append(DBNode(db_shard_name, self.path, run_settings, [port]))
+        controller.add_db_shards(self, dbnodes)
+
+    def remove_shards(self, num_shards):
+        """Remove shards from the running database
+
+        Hash slots, together with their keys, are migrated away from
+        the last ``num_shards`` shards, which are then stopped. At
+        least three shards must remain. Entities launched afterwards
+        only connect to the remaining shards.
+
+        :param num_shards: number of shards to remove
+        :type num_shards: int
+        :raises SmartSimError: if the orchestrator is not active
+        :raises SSUnsupportedError: if the orchestrator can not be resharded
+        """
+        controller = self._get_reshard_controller(num_shards)
+        if self.num_shards - num_shards < 3:
+            raise SSUnsupportedError("A database cluster needs at least three shards")
+        if any(dbnode._mpmd for dbnode in self.entities[-num_shards:]):
+            raise SSUnsupportedError(
+                "Shards launched in a single command can not be removed"
+            )
+        controller.remove_db_shards(self, num_shards)
+
+    def _get_reshard_controller(self, num_shards):
+        if isinstance(num_shards, bool) or not isinstance(num_shards, int):
+            raise TypeError("num_shards must be an integer")
+        if num_shards < 1:
+            raise ValueError("num_shards must be positive")
+        if self.batch or self.launcher == "lsf":
+            raise SSUnsupportedError(
+                "Resharding is not supported for batch or LSF orchestrators"
+            )
+        if self.replicas_per_shard:
+            raise SSUnsupportedError(
+                "Resharding is not supported for orchestrators with replicas"
+            )
+        if self.num_shards < 3:
+            raise SSUnsupportedError(
+                "Resharding is only supported for clustered orchestrators"
+            )
+        if getattr(self, "_controller", None) is None or not self.is_active():
+            raise SmartSimError(
+                "Orchestrator must be launched and active in this experiment"
+            )
+        return self._controller
+
+    def __getstate__(self):
+        # the controller is bound to the experiment that launched it
+        state = self.__dict__.copy()
+        state["_controller"] = None
+        # connections are opened again on first use
+        state["_admin"] = None
+        return state
 
     @property
     def _rai_module(self):
@@ -341,6 +498,10 @@ class Orchestrator(EntityList):
     def set_hosts(self, host_list):
         """Specify the hosts for the ``Orchestrator`` to launch on
 
+        One host is needed for every database instance, that is
+        ``db_nodes * (1 + replicas_per_shard)`` hosts for a cluster
+        with replicas.
+
         :param host_list: list of host (compute node names)
         :type host_list: str, list[str]
         :raises TypeError: if wrong type
@@ -369,6 +530,51 @@ class Orchestrator(EntityList):
                     for i, mpmd_runsettings in enumerate(db.run_settings.mpmd):
                         mpmd_runsettings.set_hostlist(host_list[i + 1])
 
+    def place(self, nodes, switches=None, avoid=None, app_settings=None):
+        """Choose and set the hosts of the database instances
+
+        Instances are spread over the switches of the nodes so that
+        clients on every switch have a shard close by, and nodes in
+        ``avoid`` are only used when there are not enough others.
+        Replicas are later paired with primaries on other hosts.
+
+        The chosen hosts are set with ``set_hosts``, and excluded
+        from each run settings in ``app_settings`` that supports
+        ``set_excluded_hosts`` so models are not placed on them.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            from smartsim.slurm import get_allocation_nodes, get_topology
+
+            nodes = get_allocation_nodes(alloc)
+            db.place(nodes, switches=get_topology(), app_settings=[model_rs])
+
+        :param nodes: nodes available, e.g. the nodes of an allocation
+        :type nodes: list[str]
+        :param switches: switch of each node, defaults to None
+        :type switches: dict[str, str], optional
+        :param avoid: nodes used last, e.g. nodes of compute-heavy
+                      ranks, defaults to None
+        :type avoid: list[str], optional
+        :param app_settings: run settings to exclude the hosts from,
+                             defaults to None
+        :type app_settings: list[RunSettings], optional
+        :raises SmartSimError: if there are fewer nodes than instances
+        :return: host of each database instance
+        :rtype: list[str]
+        """
+        hosts = place_hosts(nodes, self.db_nodes, switches, avoid)
+        self.set_hosts(hosts)
+        for settings in app_settings or []:
+            if hasattr(settings, "set_excluded_hosts"):
+                settings.set_excluded_hosts(hosts)
+            else:
+                logger.warning(
+                    f"{type(settings).__name__} can not exclude the database hosts"
+                )
+        return hosts
+
     def set_batch_arg(self, arg, value):
         """Set a batch argument the orchestrator should launch with
 
@@ -494,31 +700,164 @@ class Orchestrator(EntityList):
         :param value: the database configuration parameter's new value
         :type value: str
         """
-        if self.is_active():
-            addresses = []
-            for host in self.hosts:
-                for port in self.ports:
-                    address = ":".join([get_ip_from_host(host), str(port)])
-                    addresses.append(address)
-
-            is_cluster = self.num_shards > 2
-            client = Client(address=addresses[0], cluster=is_cluster)
-            try:
-                for address in addresses:
-                    client.config_set(key, value, address)
-
-            except RedisReplyError:
-                raise SmartSimError(
-                    f"Invalid CONFIG key-value pair ({key}: {value})"
-                ) from None
-            except TypeError:
-                raise TypeError(
-                    "Incompatible function arguments. The key and value used for setting the database configurations must be strings."
-                ) from None
-        else:
+        if not self.is_active():
             raise SmartSimError(
                 "The SmartSim Orchestrator must be active in order to set the database's configurations."
             )
+        if not isinstance(key, str) or not isinstance(value, str):
+            raise TypeError(
+                "Incompatible function arguments. The key and value used for setting the database configurations must be strings."
+            )
+
+        clients = self._admin_clients()
+
+        def _config_set(address):
+            try:
+                clients[address].config_set(key, value)
+            except redis.ResponseError as e:
+                return str(e)
+            return None
+
+        # every shard is configured at once
+        errors = run_concurrently(_config_set, list(clients), "Database configuration")
+        if any(errors.values()):
+            raise SmartSimError(f"Invalid CONFIG key-value pair ({key}: {value})")
+
+    def add_ml_model(
+        self,
+        name,
+        backend,
+        model_path,
+        device="CPU",
+        batch_size=0,
+        min_batch_size=0,
+        min_batch_timeout=0,
+        tag="",
+        inputs=None,
+        outputs=None,
+    ):
+        """Load a RedisAI model from a file into the database
+
+        The model is loaded once, when the database is launched, or
+        right away if it is already active, so entities do not need
+        to upload it themselves. Clients run it by ``name``.
+
+        :param name: key the model is stored under
+        :type name: str
+        :param backend: one of TF, TFLITE, TORCH or ONNX
+        :type backend: str
+        :param model_path: path of the serialized model
+        :type model_path: str
+        :param device: device to run the model on, defaults to "CPU"
+        :type device: str, optional
+        :param batch_size: batch requests up to this size, defaults to 0 (off)
+        :type batch_size: int, optional
+        :param min_batch_size: smallest batch to execute, defaults to 0
+        :type min_batch_size: int, optional
+        :param min_batch_timeout: ms to wait for min_batch_size, defaults to 0
+        :type min_batch_timeout: int, optional
+        :param tag: tag of the model, defaults to ""
+        :type tag: str, optional
+        :param inputs: input nodes of TF models, defaults to None
+        :type inputs: list[str], optional
+        :param outputs: output nodes of TF models, defaults to None
+        :type outputs: list[str], optional
+        """
+        model = ml_model_spec(
+            name,
+            backend,
+            model_path,
+            device=device,
+            batch_size=batch_size,
+            min_batch_size=min_batch_size,
+            min_batch_timeout=min_batch_timeout,
+            tag=tag,
+            inputs=inputs,
+            outputs=outputs,
+        )
+        self._ml_models.append(model)
+        if self.is_active():
+            self._preload_ml([model], [])
+
+    def add_script(self, name, script_path, device="CPU"):
+        """Load a TorchScript script from a file into the database
+
+        The script is loaded once, when the database is launched, or
+        right away if it is already active.
+
+        :param name: key the script is stored under
+        :type name: str
+        :param script_path: path of the script
+        :type script_path: str
+        :param device: device to run the script on, defaults to "CPU"
+        :type device: str, optional
+        """
+        script = ml_script_spec(name, script_path, device=device)
+        self._ml_scripts.append(script)
+        if self.is_active():
+            self._preload_ml([], [script])
+
+    def set_inference_profile(
+        self,
+        model,
+        device=None,
+        batch_size=None,
+        min_batch_size=None,
+        min_batch_timeout=None,
+    ):
+        """Set the batching and device of models added with ``add_ml_model``
+
+        A profile applies to every model whose name matches ``model``,
+        which may be a glob pattern such as ``"cnn_*"``. Profiles are
+        applied in the order they are set, so later ones take
+        precedence, and override the settings the models were added
+        with. Models that are already loaded are reloaded.
+
+        RedisAI groups requests for a model into batches of up to
+        ``batch_size``, and runs a batch once it reaches
+        ``min_batch_size`` or ``min_batch_timeout`` milliseconds have
+        passed. The number of threads serving each device queue is set
+        with ``threads_per_queue`` when the Orchestrator is created.
+
+        :param model: name or glob pattern of the models
+        :type model: str
+        :param device: device to run the models on, defaults to None
+        :type device: str, optional
+        :param batch_size: batch requests up to this size, defaults to None
+        :type batch_size: int, optional
+        :param min_batch_size: smallest batch to execute, defaults to None
+        :type min_batch_size: int, optional
+        :param min_batch_timeout: ms to wait for min_batch_size, defaults to None
+        :type min_batch_timeout: int, optional
+        """
+        profile = inference_profile(
+            device=device,
+            batch_size=batch_size,
+            min_batch_size=min_batch_size,
+            min_batch_timeout=min_batch_timeout,
+        )
+        self._inference_profiles.pop(model, None)
+        self._inference_profiles[model] = profile
+        if self.is_active():
+            matching = [m for m in self._ml_models if fnmatchcase(m["name"], model)]
+            self._preload_ml(matching, [])
+
+    def _preload_ml(self, models=None, scripts=None):
+        """Load models and scripts into the launched database
+
+        :raises SmartSimError: if a model or script could not be loaded
+        """
+        models = self._ml_models if models is None else models
+        scripts = self._ml_scripts if scripts is None else scripts
+        models = apply_inference_profiles(models, self._inference_profiles)
+        if not models and not scripts:
+            return
+        address = ":".join([get_ip_from_host(self.hosts[0]), str(self.ports[0])])
+        client = Client(address=address, cluster=self.num_shards > 2)
+        try:
+            preload_ml(client, models, scripts)
+        except RedisReplyError as e:
+            raise SmartSimError(f"Failed to load models into the database: {e}") from e
 
     def _build_batch_settings(self, db_nodes, alloc, batch, account, time, **kwargs):
         batch_settings = None
@@ -646,20 +985,9 @@ class Orchestrator(EntityList):
 
             # create the exe_args list for launching multiple databases
             # per node. also collect port range for dbnode
-            start_script_args = [
-                "-m",
-                "smartsim._core.entrypoints.redis", # entrypoint
-                f"+ifname={self._interface}",  # pass interface to start script
-                "+command",  # command flag for argparser
-                self._redis_exe,  # redis-server
-                self._redis_conf,  # redis6.conf file
-                self._rai_module,  # redisai.so
-                "--port",  # redis port
-                str(port),  # port number
-            ]
-            if cluster:
-                start_script_args += self._get_cluster_args(db_shard_name, port)
-
+            start_script_args = self._get_start_script_args(
+                db_shard_name, port, cluster
+            )
             exe_args = " ".join(start_script_args)
 
             if not mpmd_nodes:
@@ -686,8 +1014,24 @@ class Orchestrator(EntityList):
             self.entities.append(node)
 
         self.ports = [port]
-
-
+        # kept to launch shards of the same shape when resharding
+        self._shard_kwargs = kwargs
+
+    def _get_start_script_args(self, name, port, cluster):
+        start_script_args = [
+            "-m",
+            "smartsim._core.entrypoints.redis",  # entrypoint
+            f"+ifname={self._interface}",  # pass interface to start script
+            "+command",  # command flag for argparser
+            self._redis_exe,  # redis-server
+            self._redis_conf,  # redis6.conf file
+            self._rai_module,  # redisai.so
+            "--port",  # redis port
+            str(port),  # port number
+        ]
+        if cluster:
+            start_script_args += self._get_cluster_args(name, port)
+        return start_script_args
 
     @staticmethod
     def _get_cluster_args(name, port):
@@ -129,6 +129,45 @@ class DBNode(SmartSimEntity):
             for shard_id in self._shard_ids
         ]
 
+    def _read_db_hosts(self):
+        """Read the addresses in the output files without waiting
+
+        :return: an address per shard, or None if the output files
+                 do not have all of them yet
+        :rtype: list[str] | None
+        """
+        if not self._mpmd:
+            ips = self._read_ips(self.name + ".out")
+            return ips[-1:] or None
+        ips = []
+        for shard_id in self._shard_ids:
+            ips.extend(self._read_ips(self.name + f"_{shard_id}.out")[-1:])
+        if len(ips) < len(self._shard_ids):
+            # output streams of all shards may go to the same file
+            ips = list(dict.fromkeys(self._read_ips(self.name + ".out")))
+        if len(ips) < len(self._shard_ids):
+            return None
+        return ips
+
+    def _read_ips(self, filename):
+        """Read the IPADDRESS lines of an output file
+
+        :param filename: name of the output file in the path of this node
+        :type filename: str
+        :return: addresses found, empty if the file does not exist
+        :rtype: list[str]
+        """
+        ips = []
+        try:
+            with open(osp.join(self.path, filename), "r") as f:
+                for line in f:
+                    content = line.split()
+                    if "IPADDRESS:" in content:
+                        ips.append(content[-1])
+        except FileNotFoundError:
+            pass
+        return ips
+
     def _parse_db_host(self):
         """Parse the database host/IP from the output file
 
@@ -24,8 +24,9 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import weakref
 from copy import deepcopy
-from os import getcwd
+from os import getcwd, path
 
 from .._core.utils.helpers import init_default
 from ..error import (
@@ -37,8 +38,17 @@ from ..error import (
 from ..log import get_logger
 from ..settings.base import BatchSettings, RunSettings
 from .entityList import EntityList
+from .files import EntityFiles
 from .model import Model
-from .strategies import create_all_permutations, random_permutations, step_values
+from .strategies import (
+    AllPermutations,
+    StepValues,
+    create_all_permutations,
+    halton,
+    latin_hypercube,
+    random_permutations,
+    step_values,
+)
 
 logger = get_logger(__name__)
 
@@ -56,6 +66,7 @@ class Ensemble(EntityList):
         batch_settings=None,
         run_settings=None,
         perm_strat="all_perm",
+        lazy=False,
         **kwargs,
     ):
         """Initialize an Ensemble of Model instances.
@@ -79,9 +90,21 @@ class Ensemble(EntityList):
         :type replicas: int, optional
         :param perm_strategy: strategy for expanding ``params`` into
                              ``Model`` instances from params argument
-                             options are "all_perm", "stepped", "random"
-                             or a callable function. Defaults to "all_perm".
+                             options are "all_perm", "step", "random",
+                             "lhs" (latin hypercube), "halton", or a
+                             callable function. Defaults to "all_perm".
+                             "lhs" and "halton" can repeat parameter sets
+                             when a parameter has fewer values than
+                             ``n_models``.
         :type perm_strategy: str
+        :param lazy: create ``Model`` members on demand instead of
+                     at initialization. Members accessed by index or
+                     name are kept; members created while iterating
+                     are rebuilt on the next pass, so changes made to
+                     them are lost. Unless run as a batch, members
+                     are launched and monitored ``SMARTSIM_LAZY_WINDOW``
+                     at a time. Defaults to False
+        :type lazy: bool, optional
         :return: ``Ensemble`` instance
         :rtype: ``Ensemble``
         """
@@ -90,12 +113,28 @@ class Ensemble(EntityList):
         self._key_prefixing_enabled = True
         self.batch_settings = init_default({}, batch_settings, BatchSettings)
         self.run_settings = init_default({}, run_settings, RunSettings)
+        self._lazy = lazy
+        self._files = None
+        self._incoming_entities = []
+        self._member_dirs = False
+        self._strategy = None
+        self._strategy_kwargs = {}
         super().__init__(name, getcwd(), perm_strat=perm_strat, **kwargs)
 
     @property
     def models(self):
         return self.entities
 
+    def __getitem__(self, name):
+        if self._lazy:
+            return self.entities.find(name)
+        return super().__getitem__(name)
+
+    @property
+    def lazy(self):
+        """Return True if members of this ensemble are created on demand"""
+        return self._lazy
+
     def _initialize_entities(self, **kwargs):
         """Initialize all the models within the ensemble based
         on the parameters passed to the ensemble and the permutation
@@ -106,35 +145,29 @@ class Ensemble(EntityList):
         strategy = self._set_strategy(kwargs.pop("perm_strat"))
         replicas = kwargs.pop("replicas", None)
 
+        # members share a private copy of the run settings so that
+        # changes to the ensemble run settings don't affect them
+        self._member_settings = None
+        if self.run_settings:
+            self._member_settings = deepcopy(self.run_settings)
+
         # if a ensemble has parameters and run settings, create
         # the ensemble and assign run_settings to each member
         if self.params:
             if self.run_settings:
                 param_names, params = self._read_model_parameters()
+                self._strategy = strategy
+                self._strategy_kwargs = kwargs
 
                 # Compute all combinations of model parameters and arguments
-                all_model_params = strategy(param_names, params, **kwargs)
-                if not isinstance(all_model_params, list):
-                    raise UserStrategyError(strategy)
-
-                for i, param_set in enumerate(all_model_params):
-                    if not isinstance(param_set, dict):
-                        raise UserStrategyError(strategy)
-                    run_settings = deepcopy(self.run_settings)
-                    model_name = "_".join((self.name, str(i)))
-                    model = Model(
-                        model_name,
-                        param_set,
-                        self.path,
-                        run_settings=run_settings,
-                        params_as_args=self.params_as_args,
-                    )
-                    model.enable_key_prefixing()
-                    model.params_to_args()
-                    logger.debug(
-                        f"Created ensemble member: {model_name} in {self.name}"
-                    )
-                    self.add_model(model)
+                if self._lazy and strategy is create_all_permutations:
+                    all_model_params = AllPermutations(param_names, params)
+                elif self._lazy and strategy is step_values:
+                    all_model_params = StepValues(param_names, params)
+                else:
+                    all_model_params = self._run_strategy(param_names, params)
+
+                self._add_members(all_model_params, params_as_args=True)
             # cannot generate models without run settings
             else:
                 raise SmartSimError(
@@ -143,19 +176,7 @@ class Ensemble(EntityList):
         else:
             if self.run_settings:
                 if replicas:
-                    for i in range(replicas):
-                        model_name = "_".join((self.name, str(i)))
-                        model = Model(
-                            model_name,
-                            {},
-                            self.path,
-                            run_settings=deepcopy(self.run_settings),
-                        )
-                        model.enable_key_prefixing()
-                        logger.debug(
-                            f"Created ensemble member: {model_name} in {self.name}"
-                        )
-                        self.add_model(model)
+                    self._add_members([{}] * replicas, params_as_args=False)
                 else:
                     raise SmartSimError(
                         "Ensembles without 'params' or 'replicas' argument to expand into members cannot be given run settings"
@@ -169,6 +190,103 @@ class Ensemble(EntityList):
             else:
                 logger.info("Empty ensemble created for batch launch")
 
+    def _run_strategy(self, param_names, params, **kwargs):
+        """Run the permutation strategy of this ensemble
+
+        :raises UserStrategyError: if the strategy does not return
+                                   a list of parameter dictionaries
+        :return: parameters of each member
+        :rtype: list[dict]
+        """
+        kwargs = {**self._strategy_kwargs, **kwargs}
+        all_model_params = self._strategy(param_names, params, **kwargs)
+        if not isinstance(all_model_params, list):
+            raise UserStrategyError(self._strategy)
+        for param_set in all_model_params:
+            if not isinstance(param_set, dict):
+                raise UserStrategyError(self._strategy)
+        return all_model_params
+
+    def expand(self, **kwargs):
+        """Add members to this ensemble from another run of its
+        permutation strategy
+
+        This is meant for strategies that propose new members on each
+        call, such as ``strategies.AdaptiveSampler``, so that an ensemble
+        can grow as results arrive. Keyword arguments override those
+        given to the strategy at initialization, e.g. ``n_models``.
+
+        :raises SmartSimError: if the ensemble was not created from ``params``
+        :return: the members that were added
+        :rtype: list[Model]
+        """
+        if not self._strategy:
+            raise SmartSimError(
+                f"Ensemble {self.name} was not created from params and cannot be expanded"
+            )
+        param_names, params = self._read_model_parameters()
+        param_sets = self._run_strategy(param_names, params, **kwargs)
+        start = len(self)
+        models = []
+        for i, param_set in enumerate(param_sets):
+            model = self._create_member(start + i, param_set, params_as_args=True)
+            self.add_model(model)
+            models.append(model)
+        logger.debug(f"Added {len(models)} members to ensemble {self.name}")
+        return models
+
+    def _add_members(self, param_sets, params_as_args):
+        """Add a member for each set of parameters, or defer member
+        creation to when members are accessed if this ensemble is lazy
+
+        :param param_sets: sequence of parameters, one per member
+        :type param_sets: Sequence[dict]
+        :param params_as_args: whether to convert ``params_as_args``
+                               into executable arguments of the members
+        :type params_as_args: bool
+        """
+        if self._lazy:
+            self.entities = _LazyMembers(self, param_sets, params_as_args)
+            logger.debug(f"Created lazy ensemble {self.name} of {len(self)} members")
+        else:
+            for i, param_set in enumerate(param_sets):
+                model = self._create_member(i, param_set, params_as_args)
+                logger.debug(f"Created ensemble member: {model.name} in {self.name}")
+                # names are unique by construction, skip the add_model check
+                self.entities.append(model)
+
+    def _create_member(self, index, param_set, params_as_args):
+        """Create the ``Model`` member at an index of this ensemble
+
+        :param index: index of the member
+        :type index: int
+        :param param_set: parameters of the member
+        :type param_set: dict
+        :param params_as_args: whether to convert ``params_as_args``
+                               into executable arguments of the member
+        :type params_as_args: bool
+        :return: ensemble member
+        :rtype: Model
+        """
+        model_name = "_".join((self.name, str(index)))
+        model_path = self.path
+        if self._member_dirs:
+            model_path = path.join(self.path, model_name)
+        model = Model(
+            model_name,
+            dict(param_set),
+            model_path,
+            run_settings=self._member_settings._copy_on_write(),
+            params_as_args=self.params_as_args if params_as_args else None,
+        )
+        model.enable_key_prefixing()
+        if params_as_args:
+            model.params_to_args()
+        model.files = self._files
+        for incoming_entity in self._incoming_entities:
+            model.register_incoming_entity(incoming_entity)
+        return model
+
     def add_model(self, model):
         """Add a model to this ensemble
 
@@ -182,7 +300,11 @@ class Ensemble(EntityList):
                 f"Argument to add_model was of type {type(model)}, not Model"
             )
         # "in" operator uses model name for __eq__
-        if model in self.entities:
+        if self._lazy:
+            exists = self.entities.has_member(model.name)
+        else:
+            exists = model in self.entities
+        if exists:
             raise EntityExistsError(
                 f"Model {model.name} already exists in ensemble {self.name}"
             )
@@ -200,14 +322,27 @@ class Ensemble(EntityList):
         :param incoming_entity: The entity that data will be received from
         :type incoming_entity: SmartSimEntity
         """
-        for model in self.entities:
+        if self._lazy:
+            if incoming_entity.name in [e.name for e in self._incoming_entities]:
+                raise EntityExistsError(
+                    f"'{incoming_entity.name}' has already "
+                    + "been registered as an incoming entity"
+                )
+            models = self.entities.materialized()
+        else:
+            models = self.entities
+        for model in models:
             model.register_incoming_entity(incoming_entity)
+        # applied to members created later on
+        self._incoming_entities.append(incoming_entity)
 
     def enable_key_prefixing(self):
         """If called, all models within this ensemble will prefix their keys with its
         own model name.
         """
-        for model in self.entities:
+        # lazily created members always have key prefixing enabled
+        models = self.entities.materialized() if self._lazy else self.entities
+        for model in models:
             model.enable_key_prefixing()
 
     def query_key_prefixing(self):
@@ -216,9 +351,12 @@ class Ensemble(EntityList):
         :returns: True if all models have key prefixing enabled, False otherwise
         :rtype: bool
         """
-        return all([model.query_key_prefixing() for model in self.entities])
+        models = self.entities.materialized() if self._lazy else self.entities
+        return all([model.query_key_prefixing() for model in models])
 
-    def attach_generator_files(self, to_copy=None, to_symlink=None, to_configure=None):
+    def attach_generator_files(
+        self, to_copy=None, to_symlink=None, to_configure=None, copy_mode="copy"
+    ):
         """Attach files to each model within the ensemble for generation
 
         Attach files needed for the entity that, upon generation,
@@ -241,11 +379,22 @@ class Ensemble(EntityList):
         :type to_symlink: list, optional
         :param to_configure: input files with tagged parameters, defaults to []
         :type to_configure: list, optional
+        :param copy_mode: how files "to_copy" are materialized. "copy"
+                          performs a full copy, "hardlink" hardlinks the
+                          files (writes are shared with the source), and
+                          "reflink" creates copy-on-write clones where the
+                          filesystem supports it. Unsupported modes fall
+                          back to a full copy. Defaults to "copy"
+        :type copy_mode: str, optional
         """
-        for model in self.entities:
-            model.attach_generator_files(
-                to_copy=to_copy, to_symlink=to_symlink, to_configure=to_configure
-            )
+        to_copy = init_default([], to_copy, (list, str))
+        to_symlink = init_default([], to_symlink, (list, str))
+        to_configure = init_default([], to_configure, (list, str))
+        # files are only read during generation so members can share them
+        self._files = EntityFiles(to_configure, to_copy, to_symlink, copy_mode)
+        models = self.entities.materialized() if self._lazy else self.entities
+        for model in models:
+            model.files = self._files
 
     def _set_strategy(self, strategy):
         """Set the permutation strategy for generating models within
@@ -263,6 +412,10 @@ class Ensemble(EntityList):
             return step_values
         if strategy == "random":
             return random_permutations
+        if strategy == "lhs":
+            return latin_hypercube
+        if strategy == "halton":
+            return halton
         if callable(strategy):
             return strategy
         raise SSUnsupportedError(
@@ -298,3 +451,127 @@ class Ensemble(EntityList):
                     + "Must be list, int, or string."
                 )
         return param_names, parameters
+
+
+class _LazyMembers:
+    """Sequence of ``Ensemble`` members that are created on demand
+
+    Members are created from their parameters when accessed. Members
+    accessed by index or name are kept, so changes made to them
+    persist. Members created while iterating are only kept while
+    referenced elsewhere, so a pass over the ensemble does not hold
+    every member in memory. Models added with ``Ensemble.add_model``
+    are always kept.
+    """
+
+    def __init__(self, ensemble, param_sets, params_as_args):
+        self._ensemble = ensemble
+        self._param_sets = param_sets
+        self._params_as_args = params_as_args
+        self._cache = weakref.WeakValueDictionary()
+        self._kept = {}
+        self._added = []
+
+    def __len__(self):
+        return len(self._param_sets) + len(self._added)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ensemble member index out of range")
+        if index >= len(self._param_sets):
+            return self._added[index - len(self._param_sets)]
+        if index not in self._kept:
+            self._kept[index] = self._member(index)
+        return self._kept[index]
+
+    def __iter__(self):
+        for i in range(len(self._param_sets)):
+            yield self._member(i)
+        yield from self._added
+
+    def _member(self, index):
+        """Get a member, creating it if it does not exist"""
+        model = self._kept.get(index) or self._cache.get(index)
+        if model is None:
+            model = self._ensemble._create_member(
+                index, self._param_sets[index], self._params_as_args
+            )
+            self._cache[index] = model
+        return model
+
+    def append(self, model):
+        self._added.append(model)
+
+    def member(self, index):
+        """Get the member at an index without keeping it
+
+        :param index: index of the member
+        :type index: int
+        :rtype: Model
+        """
+        if index >= len(self._param_sets):
+            return self._added[index - len(self._param_sets)]
+        return self._member(index)
+
+    def names(self):
+        """Iterate over the names of the members without creating them
+
+        :rtype: Iterator[str]
+        """
+        for i in range(len(self._param_sets)):
+            yield "_".join((self._ensemble.name, str(i)))
+        for model in self._added:
+            yield model.name
+
+    def materialized(self):
+        """Return the members that currently exist
+
+        :rtype: list[Model]
+        """
+        models = dict(self._cache)
+        models.update(self._kept)
+        return list(models.values()) + self._added
+
+    def find(self, name):
+        """Get a member by name without creating other members
+
+        :param name: name of the member
+        :type name: str
+        :return: the member or None if there is no such member
+        :rtype: Model | None
+        """
+        for model in self._added:
+            if model.name == name:
+                return model
+        index = self._index(name)
+        if index is None:
+            return None
+        return self[index]
+
+    def _index(self, name):
+        """Get the index of a created member from its name"""
+        prefix = self._ensemble.name + "_"
+        index = name[len(prefix) :]
+        if (
+            name.startswith(prefix)
+            and index.isdigit()
+            and str(int(index)) == index
+            and int(index) < len(self._param_sets)
+        ):
+            return int(index)
+        return None
+
+    def has_member(self, name):
+        """Check if a member exists by name without creating members
+
+        :param name: name of the member
+        :type name: str
+        :rtype: bool
+        """
+        if any(model.name == name for model in self._added):
+            return True
+        return self._index(name) is not None
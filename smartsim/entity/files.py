@@ -45,9 +45,18 @@ class EntityFiles:
     Lastly, symlink can be used for big datasets or input
     files that a user just wants to have present in the directory
     without necessary having to copy the entire file.
+
+    The ``copy_mode`` controls how copy files are materialized
+    in the generated directories. Besides a regular copy, files
+    can be hardlinked or reflinked (copy-on-write clones) to avoid
+    duplicating large inputs for every member of an ensemble. If
+    the filesystem does not support the requested mode, the
+    generator falls back to a regular copy.
     """
 
-    def __init__(self, tagged, copy, symlink):
+    copy_modes = ("copy", "hardlink", "reflink")
+
+    def __init__(self, tagged, copy, symlink, copy_mode="copy"):
         """Initialize an EntityFiles instance
 
         :param tagged: tagged files for model configuration
@@ -58,10 +67,20 @@ class EntityFiles:
         :param symlink: files to symlink into model or node
                         directories
         :type symlink: list of str
+        :param copy_mode: how to materialize copy files, one of
+                          "copy", "hardlink", or "reflink"
+        :type copy_mode: str, optional
+        :raises ValueError: if ``copy_mode`` is not supported
         """
+        if copy_mode not in self.copy_modes:
+            raise ValueError(
+                f"Copy mode {copy_mode} is not supported. "
+                + f"Options are {', '.join(self.copy_modes)}"
+            )
         self.tagged = tagged
         self.copy = copy
         self.link = symlink
+        self.copy_mode = copy_mode
         self.tagged_hierarchy = None
         self._check_files()
 
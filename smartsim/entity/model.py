@@ -24,8 +24,15 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import os.path as osp
 
 from .._core.utils.helpers import cat_arg_and_value, init_default
+from .._core.utils.redis import (
+    apply_inference_profiles,
+    inference_profile,
+    ml_model_spec,
+    ml_script_spec,
+)
 from ..error import EntityExistsError, SSUnsupportedError
 from .entity import SmartSimEntity
 from .files import EntityFiles
@@ -96,7 +103,9 @@ class Model(SmartSimEntity):
         """Inquire as to whether this entity will prefix its keys with its name"""
         return self._key_prefixing_enabled
 
-    def attach_generator_files(self, to_copy=None, to_symlink=None, to_configure=None):
+    def attach_generator_files(
+        self, to_copy=None, to_symlink=None, to_configure=None, copy_mode="copy"
+    ):
         """Attach files to an entity for generation
 
         Attach files needed for the entity that, upon generation,
@@ -119,11 +128,18 @@ class Model(SmartSimEntity):
         :type to_symlink: list, optional
         :param to_configure: input files with tagged parameters, defaults to []
         :type to_configure: list, optional
+        :param copy_mode: how files "to_copy" are materialized. "copy"
+                          performs a full copy, "hardlink" hardlinks the
+                          files (writes are shared with the source), and
+                          "reflink" creates copy-on-write clones where the
+                          filesystem supports it. Unsupported modes fall
+                          back to a full copy. Defaults to "copy"
+        :type copy_mode: str, optional
         """
         to_copy = init_default([], to_copy, (list, str))
         to_symlink = init_default([], to_symlink, (list, str))
         to_configure = init_default([], to_configure, (list, str))
-        self.files = EntityFiles(to_configure, to_copy, to_symlink)
+        self.files = EntityFiles(to_configure, to_copy, to_symlink, copy_mode)
 
     def colocate_db(self,
                     port=6379,
@@ -131,13 +147,26 @@ class Model(SmartSimEntity):
                     limit_app_cpus=True,
                     ifname="lo",
                     debug=False,
+                    socket=None,
+                    socket_permissions=755,
+                    drain_keys=None,
+                    drain_to="orchestrator",
+                    drain_interval=None,
+                    models=None,
+                    scripts=None,
+                    inference_profiles=None,
                     **kwargs):
         """Colocate an Orchestrator instance with this Model at runtime.
 
         This method will initialize settings which add an unsharded (not connected)
         database to this Model instance. Only this Model will be able to communicate
-        with this colocated database by using the loopback TCP interface or Unix
-        Domain sockets (UDS coming soon).
+        with this colocated database by using the loopback TCP interface or a Unix
+        Domain socket (UDS).
+
+        Passing ``socket`` makes the database listen on a Unix Domain socket at
+        that path, in addition to TCP, and points ``SSDB`` of this Model to it.
+        This avoids the TCP stack for every request. The path must be on a
+        node-local filesystem (e.g. ``/tmp``) and unique to this Model.
 
         Extra parameters for the db can be passed through kwargs. This includes
         many performance, caching and inference settings.
@@ -155,6 +184,33 @@ class Model(SmartSimEntity):
 
         Generally these don't need to be changed.
 
+        On Linux the database is pinned to ``db_cpus`` CPUs of one NUMA node, the
+        node of ``ifname`` when known, and its memory is bound to that node if
+        ``numactl`` is available. With ``limit_app_cpus`` the Model is pinned to
+        the remaining CPUs. The chosen layout is written to the Model output.
+
+        Only one database is started per host. Every rank of the Model waits, for
+        up to ``SMARTSIM_DB_READY_TIMEOUT`` seconds, until the database of its host
+        answers before it starts, so no rank reaches the database early. The
+        ``SSDB_READY_FILE`` variable of each rank names a file holding the local
+        endpoint, which is the same ``SSDB`` address on every host.
+
+        The co-located database stops with the Model. To keep data, pass glob-style
+        ``drain_keys`` patterns: matching keys are copied, with pipelined transfers,
+        when the Model exits and, with ``drain_interval``, every that many seconds.
+        With ``drain_to="orchestrator"`` keys are copied to the Orchestrator
+        launched in the Experiment; any other value is a directory where each host
+        writes a ``<hostname>.dump`` file.
+
+        ``models`` and ``scripts`` are loaded into each co-located database from
+        files before any rank starts, instead of every rank uploading them. Each
+        entry is a dict with the arguments of ``Orchestrator.add_ml_model`` or
+        ``Orchestrator.add_script``, e.g.
+        ``{"name": "cnn", "backend": "TORCH", "model_path": "cnn.pt"}``.
+        ``inference_profiles`` maps model names or glob patterns to the arguments
+        of ``Orchestrator.set_inference_profile`` and overrides the batching and
+        device of the matching ``models``.
+
         :param port: port to use for orchestrator database, defaults to 6379
         :type port: int, optional
         :param db_cpus: number of cpus to use for orchestrator, defaults to 1
@@ -165,6 +221,22 @@ class Model(SmartSimEntity):
         :type ifname: str, optional
         :param debug: launch Model with extra debug information about the co-located db
         :type debug: bool, optional
+        :param socket: path of a Unix Domain socket for the database, defaults to None
+        :type socket: str, optional
+        :param socket_permissions: octal permissions of the socket file, defaults to 755
+        :type socket_permissions: int, optional
+        :param drain_keys: patterns of keys to keep when the Model exits, defaults to None
+        :type drain_keys: list[str], optional
+        :param drain_to: "orchestrator" or a directory for dump files, defaults to "orchestrator"
+        :type drain_to: str, optional
+        :param drain_interval: seconds between drains while the Model runs, defaults to None
+        :type drain_interval: float, optional
+        :param models: models to load into the database at startup, defaults to None
+        :type models: list[dict], optional
+        :param scripts: scripts to load into the database at startup, defaults to None
+        :type scripts: list[dict], optional
+        :param inference_profiles: batching and device per model name, defaults to None
+        :type inference_profiles: dict[str, dict], optional
         :param kwargs: additional keyword arguments to pass to the orchestrator database
         :type kwargs: dict, optional
 
@@ -174,6 +246,30 @@ class Model(SmartSimEntity):
                 "Models co-located with databases cannot be run as a mpmd workload"
             )
 
+        if socket and len(socket) > 107:
+            raise ValueError(
+                "Unix Domain socket paths can be at most 107 characters long"
+            )
+
+        drain = None
+        if drain_keys:
+            if isinstance(drain_keys, str):
+                drain_keys = [drain_keys]
+            if not all(isinstance(key, str) for key in drain_keys):
+                raise TypeError("drain_keys must be a list of key patterns")
+            if drain_interval is not None and drain_interval <= 0:
+                raise ValueError("drain_interval must be a positive number of seconds")
+            if drain_to != "orchestrator":
+                drain_to = osp.abspath(drain_to)
+            drain = {"keys": list(drain_keys), "to": drain_to, "interval": drain_interval}
+
+        models = [ml_model_spec(**model) for model in init_default([], models, list)]
+        scripts = [ml_script_spec(**script) for script in init_default([], scripts, list)]
+        profiles = init_default({}, inference_profiles, dict)
+        models = apply_inference_profiles(models, dict(
+            (pattern, inference_profile(**profile)) for pattern, profile in profiles.items()
+        ))
+
         if hasattr(self.run_settings, "_prep_colocated_db"):
             self.run_settings._prep_colocated_db(db_cpus)
 
@@ -184,6 +280,10 @@ class Model(SmartSimEntity):
             "interface": ifname,
             "limit_app_cpus": limit_app_cpus,
             "debug": debug,
+            "unix_socket": socket,
+            "socket_permissions": socket_permissions,
+            "drain": drain,
+            "ml": {"models": models, "scripts": scripts},
 
             # redisai arguments for inference settings
             "rai_args": {
@@ -28,43 +28,202 @@
 
 from itertools import product
 
+from ..error import SmartSimError
+
+
+class AllPermutations:
+    """Lazy, indexable view of all permutations of parameters
+
+    Permutations are decoded from their index on access, in the
+    same order as ``itertools.product``, so that very large
+    parameter spaces never need to be held in memory.
+    """
+
+    def __init__(self, param_names, param_values):
+        self.param_names = param_names
+        self.param_values = param_values
+        self.size = 1
+        for values in param_values:
+            self.size *= len(values)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("permutation index out of range")
+        # mixed radix decoding, the last parameter varies fastest
+        perm = [None] * len(self.param_values)
+        for i in reversed(range(len(self.param_values))):
+            index, digit = divmod(index, len(self.param_values[i]))
+            perm[i] = self.param_values[i][digit]
+        return dict(zip(self.param_names, perm))
+
+    def __iter__(self):
+        for p in product(*self.param_values):
+            yield dict(zip(self.param_names, p))
+
+
+class StepValues:
+    """Lazy, indexable view of stepped parameter values"""
+
+    def __init__(self, param_names, param_values):
+        self.param_names = param_names
+        self.param_values = param_values
+        self._size = min((len(values) for values in param_values), default=0)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("step index out of range")
+        return dict(zip(self.param_names, (v[index] for v in self.param_values)))
+
+    def __iter__(self):
+        for p in zip(*self.param_values):
+            yield dict(zip(self.param_names, p))
+
 
 # create permutations of all parameters
 # single model if parameters only have one value
 def create_all_permutations(param_names, param_values):
-    perms = list(product(*param_values))
-    all_permutations = []
-    for p in perms:
-        temp_model = dict(zip(param_names, p))
-        all_permutations.append(temp_model)
-    return all_permutations
+    return list(AllPermutations(param_names, param_values))
 
 
 def step_values(param_names, param_values):
-    permutations = []
-    for p in zip(*param_values):
-        permutations.append(dict(zip(param_names, p)))
-    return permutations
+    return list(StepValues(param_names, param_values))
 
 
-def random_permutations(param_names, param_values, n_models):
+def random_permutations(param_names, param_values, n_models, seed=None):
     import random
 
     # first, check if we've requested more values than possible.
-    perms = list(product(*param_values))
-    if n_models >= len(perms):
+    perms = AllPermutations(param_names, param_values)
+    # len() is limited to sys.maxsize, the size is not
+    n_perms = perms.size
+    if n_models >= n_perms:
         return create_all_permutations(param_names, param_values)
-    else:
-        permutations = []
-        permutation_strings = set()
-        while len(permutations) < n_models:
-            model_dict = dict(
-                zip(
-                    param_names,
-                    map(lambda x: x[random.randint(0, len(x) - 1)], param_values),
+
+    # sample distinct indices with Floyd's algorithm so that the
+    # product of the parameter values is never enumerated
+    rng = random.Random(seed)
+    indices = []
+    selected = set()
+    for j in range(n_perms - n_models, n_perms):
+        index = rng.randrange(j + 1)
+        if index in selected:
+            index = j
+        selected.add(index)
+        indices.append(index)
+    rng.shuffle(indices)
+    return [perms[i] for i in indices]
+
+
+def latin_hypercube(param_names, param_values, n_models, seed=None):
+    import random
+
+    # split the values of each parameter into n_models strata,
+    # pick a point in each, and pair the strata at random. Parameters
+    # with fewer values than n_models repeat values across strata, so
+    # members can then share a parameter set; duplicates are kept.
+    rng = random.Random(seed)
+    columns = []
+    for values in param_values:
+        strata = list(range(n_models))
+        rng.shuffle(strata)
+        columns.append(
+            [values[int((s + rng.random()) / n_models * len(values))] for s in strata]
+        )
+    return [dict(zip(param_names, p)) for p in zip(*columns)]
+
+
+def halton(param_names, param_values, n_models, skip=1):
+    # quasi-random, low discrepancy sequence with one prime base per parameter.
+    # as with latin_hypercube, few values per parameter can repeat parameter sets
+    bases = _primes(len(param_values))
+    permutations = []
+    for i in range(skip, skip + n_models):
+        perm = []
+        for base, values in zip(bases, param_values):
+            perm.append(values[int(_radical_inverse(i, base) * len(values))])
+        permutations.append(dict(zip(param_names, perm)))
+    return permutations
+
+
+class AdaptiveSampler:
+    """Strategy that proposes ensemble members from the results
+    of previously run members.
+
+    The first call samples the parameter space with ``initial``.
+    Afterwards, results reported with ``tell`` are passed to
+    ``propose`` which returns the parameters of the next members.
+    New members are added to an ``Ensemble`` with ``Ensemble.expand``.
+
+    ``propose`` is called as
+    ``propose(param_names, param_values, history, n_models, **kwargs)``
+    where ``history`` is a list of ``(params, result)`` tuples and
+    ``kwargs`` are the strategy arguments given to the ``Ensemble``
+    and ``Ensemble.expand``. It must return a list of parameter
+    dictionaries.
+    """
+
+    def __init__(self, propose, initial=latin_hypercube):
+        """Initialize an adaptive sampler
+
+        :param propose: callable proposing the next members
+        :type propose: callable
+        :param initial: strategy used for the first members,
+                        defaults to ``latin_hypercube``
+        :type initial: callable, optional
+        """
+        self.propose = propose
+        self.initial = initial
+        self.history = []
+        self._sampled = False
+
+    def tell(self, params, result):
+        """Report the result of a member
+
+        :param params: parameters of the member
+        :type params: dict
+        :param result: result of the member, passed to ``propose`` as is
+        :type result: Any
+        """
+        self.history.append((params, result))
+
+    def __call__(self, param_names, param_values, n_models, **kwargs):
+        if not self.history:
+            # sampling again would repeat the initial members
+            if self._sampled:
+                raise SmartSimError(
+                    "No results reported with tell() since the initial members were sampled"
                 )
-            )
-            if str(model_dict) not in permutation_strings:
-                permutation_strings.add(str(model_dict))
-                permutations.append(model_dict)
-        return permutations
+            self._sampled = True
+            return self.initial(param_names, param_values, n_models, **kwargs)
+        history = list(self.history)
+        return self.propose(param_names, param_values, history, n_models, **kwargs)
+
+
+def _radical_inverse(i, base):
+    inverse = 0.0
+    scale = 1.0 / base
+    while i > 0:
+        i, digit = divmod(i, base)
+        inverse += digit * scale
+        scale /= base
+    return inverse
+
+
+def _primes(n):
+    primes = []
+    candidate = 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes):
+            primes.append(candidate)
+        candidate += 1
+    return primes
@@ -226,7 +226,11 @@ class Experiment:
         :param tag: tag used in `to_configure` generator files
         :type tag: str, optional
         :param overwrite: overwrite existing folders and contents,
-               defaults to False
+               defaults to False. Only directories whose inputs
+               changed since the last generation are rewritten.
+               Directories of unchanged entities are left as is,
+               including outputs of earlier runs such as ``.out``
+               and ``.err`` files or checkpoints.
         :type overwrite: bool, optional
         """
         try:
@@ -339,6 +343,7 @@ class Experiment:
         run_settings=None,
         replicas=None,
         perm_strategy="all_perm",
+        lazy=False,
         **kwargs,
     ):
         """Create an ``Ensemble`` of ``Model`` instances
@@ -383,9 +388,17 @@ class Experiment:
         :type replicas: int
         :param perm_strategy: strategy for expanding ``params`` into
                               ``Model`` instances from params argument
-                              options are "all_perm", "stepped", "random"
-                              or a callable function. Default is "all_perm".
+                              options are "all_perm", "step", "random",
+                              "lhs" (latin hypercube), "halton", or a
+                              callable function. Default is "all_perm".
         :type perm_strategy: str, optional
+        :param lazy: create ``Model`` members on demand rather than
+                     all at once, for very large parameter sweeps.
+                     Only members accessed by index or name keep
+                     changes made to them. Unless run as a batch,
+                     members are launched ``SMARTSIM_LAZY_WINDOW`` at
+                     a time. Default is False.
+        :type lazy: bool, optional
         :raises SmartSimError: if initialization fails
         :return: ``Ensemble`` instance
         :rtype: Ensemble
@@ -398,6 +411,7 @@ class Experiment:
                 run_settings=run_settings,
                 perm_strat=perm_strategy,
                 replicas=replicas,
+                lazy=lazy,
                 **kwargs,
             )
             return new_ensemble
@@ -632,7 +646,9 @@ class Experiment:
 
         :param port: TCP/IP port, defaults to 6379
         :type port: int, optional
-        :param db_nodes: numver of database shards, defaults to 1
+        :param db_nodes: numver of database shards, defaults to 1.
+                         Pass ``replicas_per_shard`` to launch replicas
+                         of each shard as well.
         :type db_nodes: int, optional
         :param batch: Run as a batch workload, defaults to False
         :type batch: bool, optional
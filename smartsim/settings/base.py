@@ -23,6 +23,8 @@
 # CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import copy
+from collections.abc import MutableMapping
 
 from .._core.utils.helpers import (
     expand_exe_path,
@@ -197,6 +199,29 @@ class RunSettings:
             formatted.append(str(value))
         return formatted
 
+    def _copy_on_write(self):
+        """Return a copy of these settings that shares data with them
+
+        ``run_args`` and ``env_vars`` of the copy are overlays that
+        only record changes made to the copy, and mutable values in
+        them are copied when first read. Other lists and dictionaries
+        are copied, with MPMD settings copied in the same way. These
+        settings must not be modified afterwards, as the copy would
+        observe the changes.
+
+        :return: copy of these settings
+        :rtype: RunSettings
+        """
+        new = copy.copy(self)
+        for name, value in vars(self).items():
+            if name in ("run_args", "env_vars"):
+                if isinstance(value, _OverlayDict):
+                    value = dict(value)
+                setattr(new, name, _OverlayDict(value))
+            elif isinstance(value, (list, dict, set)):
+                setattr(new, name, _copy_settings_value(value))
+        return new
+
     def __str__(self): # pragma: no-cover
         string = f"Executable: {self.exe[0]}\n"
         string += f"Executable Arguments: {' '.join((self.exe_args))}"
@@ -209,11 +234,74 @@ class RunSettings:
         return string
 
 
+def _copy_settings_value(value):
+    """Copy a settings attribute, copying nested run settings on write"""
+    if isinstance(value, list):
+        return [
+            v._copy_on_write() if isinstance(v, RunSettings) else copy.deepcopy(v)
+            for v in value
+        ]
+    return copy.deepcopy(value)
+
+
+class _OverlayDict(MutableMapping):
+    """Dictionary that reads through to a shared base dictionary and
+    records changes separately, so the base is never modified.
+    Mutable values are copied into the overlay when first read so
+    they can be changed in place.
+    """
+
+    def __init__(self, base):
+        self._base = base
+        self._changed = {}
+        self._deleted = set()
+
+    def __getitem__(self, key):
+        if key in self._changed:
+            return self._changed[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        value = self._base[key]
+        if isinstance(value, (list, dict, set)):
+            value = self._changed[key] = copy.deepcopy(value)
+        return value
+
+    def __setitem__(self, key, value):
+        self._deleted.discard(key)
+        self._changed[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._changed.pop(key, None)
+        if key in self._base:
+            self._deleted.add(key)
+
+    def __iter__(self):
+        for key in self._base:
+            if key not in self._deleted:
+                yield key
+        for key in self._changed:
+            if key not in self._base:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        return dict(self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
 class BatchSettings:
     def __init__(self, batch_cmd, batch_args=None, **kwargs):
         self._batch_cmd = batch_cmd
         self.batch_args = init_default({}, batch_args, dict)
         self._preamble = []
+        self.max_slots = None
+        self.array = False
         self.set_nodes(kwargs.get("nodes", None))
         self.set_walltime(kwargs.get("time", None))
         self.set_queue(kwargs.get("queue", None))
@@ -261,6 +349,40 @@ class BatchSettings:
         """
         self._batch_cmd = command
 
+    def set_max_slots(self, max_slots):
+        """Limit the slots used at once by the members of the batch
+
+        Each member uses as many slots as the nodes it requests, or
+        one slot if it does not request nodes. Members are started
+        in order, each one as soon as enough slots are free, instead
+        of all at once. Use the number of nodes of the allocation to
+        run a large ensemble in a smaller allocation.
+
+        :param max_slots: slots available to the members
+        :type max_slots: int
+        :raises TypeError: if max_slots is not an int
+        :raises ValueError: if max_slots is not positive
+        """
+        if isinstance(max_slots, bool) or not isinstance(max_slots, int):
+            raise TypeError("max_slots must be an int")
+        if max_slots < 1:
+            raise ValueError("max_slots must be a positive integer")
+        self.max_slots = max_slots
+
+    def set_array(self, array=True):
+        """Run the members of the batch as an array job
+
+        Each member runs as its own task of the array, with the
+        resources of these batch settings, so the scheduler can
+        start and backfill members independently. The status of
+        the batch is the combined status of all tasks. ``max_slots``
+        does not apply to array jobs.
+
+        :param array: whether to use an array job, defaults to True
+        :type array: bool, optional
+        """
+        self.array = bool(array)
+
     def add_preamble(self, lines):
         """Add lines to the batch file preamble. The lines are just
         written (unmodified) at the beginning of the batch file
@@ -24,6 +24,7 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+from ..error import SSUnsupportedError
 from .base import BatchSettings
 
 
@@ -102,6 +103,15 @@ class CobaltBatchSettings(BatchSettings):
         hosts = ",".join(host_list)
         self.batch_args["attrs"] = f"location={hosts}"
 
+    def set_array(self, array=True):
+        """Cobalt does not support array jobs
+
+        :raises SSUnsupportedError: if array is True
+        """
+        if array:
+            raise SSUnsupportedError("Cobalt does not support array jobs")
+        self.array = False
+
     def set_tasks(self, num_tasks):
         """Set total number of processes to start
 
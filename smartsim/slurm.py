@@ -26,8 +26,14 @@
 
 from shutil import which
 
-from ._core.launcher.slurm.slurmCommands import salloc, scancel, sinfo
-from ._core.launcher.slurm.slurmParser import parse_salloc, parse_salloc_error
+from ._core.launcher.slurm.slurmCommands import sacct, salloc, scancel, scontrol
+from ._core.launcher.slurm.slurmInventory import NodeInventory
+from ._core.launcher.slurm.slurmParser import (
+    expand_hostlist,
+    parse_salloc,
+    parse_salloc_error,
+    parse_topology,
+)
 from ._core.launcher.util.launcherUtil import ComputeNode, Partition
 from ._core.utils.helpers import init_default
 from .error import AllocationError, LauncherError
@@ -35,6 +41,9 @@ from .log import get_logger
 
 logger = get_logger(__name__)
 
+# shared by every query so sinfo runs at most once per ttl
+_inventory = NodeInventory()
+
 
 def get_allocation(nodes=1, time=None, account=None, options=None):
     """Request an allocation
@@ -133,11 +142,6 @@ def validate(nodes=1, ppn=1, partition=None):
     :returns: True if resources are available, False otherwise
     :rtype: bool
     """
-    sys_partitions = _get_system_partition_info()
-
-    n_avail_nodes = 0
-    avail_nodes = set()
-
     p_name = partition
     if p_name is None or p_name == "default":
         try:
@@ -147,14 +151,7 @@ def validate(nodes=1, ppn=1, partition=None):
                 "No partition provided and default partition could not be found"
             ) from e
 
-    if not p_name in sys_partitions:
-        raise LauncherError(f"Partition {p_name} is not found on this system")
-
-    for node in sys_partitions[p_name].nodes:
-        if node.ppn >= ppn:
-            avail_nodes.add(node)
-
-    n_avail_nodes = len(avail_nodes)
+    n_avail_nodes = _inventory.count_nodes(p_name, ppn)
     logger.debug(f"Found {n_avail_nodes} nodes that match the constraints provided")
 
     if n_avail_nodes < nodes:
@@ -177,42 +174,83 @@ def get_default_partition():
     :returns: the name of the default partition
     :rtype: str
     """
-    sinfo_output, _ = sinfo(["--noheader", "--format", "%P"])
-
-    default = None
-    for line in sinfo_output.split("\n"):
-        if line.endswith("*"):
-            default = line.strip("*")
-
+    default = _inventory.default_partition
     if not default:
         raise LauncherError("Could not find default partition!")
     return default
 
 
+def select_hosts(num_hosts, partition=None, feature=None, ppn=1):
+    """Pick idle nodes for the instances of an ``Orchestrator``
+
+    The hosts are spread over the idle nodes that match, and can
+    be given to ``Orchestrator.set_hosts``. Hosts are not selected
+    again by later calls until Slurm has run a job on them.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        db = Orchestrator(launcher="slurm", db_nodes=3, batch=True)
+        db.set_hosts(select_hosts(3, partition="compute"))
+
+    :param num_hosts: number of hosts needed
+    :type num_hosts: int
+    :param partition: partition of the hosts, defaults to the default partition
+    :type partition: str, optional
+    :param feature: node feature the hosts must have, defaults to None
+    :type feature: str, optional
+    :param ppn: processes per node the hosts must fit, defaults to 1
+    :type ppn: int, optional
+    :raises LauncherError: if there are not enough idle nodes
+    :return: host names
+    :rtype: list[str]
+    """
+    if partition is None or partition == "default":
+        partition = get_default_partition()
+    return _inventory.select_hosts(num_hosts, partition, feature, ppn)
+
+
+def get_allocation_nodes(alloc_id):
+    """Get the nodes of an allocation
+
+    :param alloc_id: allocation id
+    :type alloc_id: str
+    :raises LauncherError: if the allocation has no nodes yet
+    :return: node names
+    :rtype: list[str]
+    """
+    output, _ = sacct(["-j", str(alloc_id), "-X", "-n", "-P", "-o", "NodeList"])
+    nodes = expand_hostlist(output.strip().split("\n")[0]) if output.strip() else []
+    if not nodes:
+        raise LauncherError(f"Could not find the nodes of allocation {alloc_id}")
+    return nodes
+
+
+def get_topology():
+    """Get the leaf switch of every node from ``scontrol show topology``
+
+    Systems without a topology plugin return an empty mapping.
+
+    :return: switch name of each node
+    :rtype: dict[str, str]
+    """
+    output, _ = scontrol(["show", "topology"])
+    return parse_topology(output)
+
+
 def _get_system_partition_info():
     """Build a dictionary of slurm partitions
     :returns: dict of Partition objects
     :rtype: dict
     """
 
-    sinfo_output, _ = sinfo(["--noheader", "--format", "%R %n %c"])
-
     partitions = {}
-    for line in sinfo_output.split("\n"):
-        line = line.strip()
-        if line == "":
-            continue
-
-        p_info = line.split(" ")
-        p_name = p_info[0]
-        p_node = p_info[1]
-        p_ppn = int(p_info[2])
-
-        if not p_name in partitions:
-            partitions.update({p_name: Partition()})
-
+    for p_name in _inventory.partitions:
+        partitions[p_name] = Partition()
         partitions[p_name].name = p_name
-        partitions[p_name].nodes.add(ComputeNode(node_name=p_node, node_ppn=p_ppn))
+        for node in _inventory.get_nodes(partition=p_name):
+            ppn = _inventory.get_cpus(node)
+            partitions[p_name].nodes.add(ComputeNode(node_name=node, node_ppn=ppn))
 
     return partitions
 
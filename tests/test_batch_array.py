@@ -0,0 +1,72 @@
+import subprocess
+
+import pytest
+
+from smartsim._core.launcher.step import BsubBatchStep, QsubBatchStep, SbatchStep
+from smartsim._core.launcher.stepInfo import SlurmStepInfo, aggregate_step_info
+from smartsim.error import SSUnsupportedError
+from smartsim.settings import (
+    BsubBatchSettings,
+    CobaltBatchSettings,
+    QsubBatchSettings,
+    SbatchSettings,
+)
+from smartsim.status import STATUS_COMPLETED, STATUS_FAILED, STATUS_RUNNING
+
+
+def _array_script(step_cls, settings, test_dir, members=3):
+    settings.set_array()
+    batch = step_cls("batch", test_dir, settings)
+    for i in range(members):
+        batch.step_cmds.append(["echo", f"member_{i}", ">>", f"{test_dir}/log"])
+        batch.step_slots.append(1)
+    with open(batch._write_script()) as f:
+        return f.read()
+
+
+def test_array_scripts(fileutils):
+    test_dir = fileutils.make_test_dir("test_array_scripts")
+
+    script = _array_script(SbatchStep, SbatchSettings(nodes=1), test_dir)
+    assert "#SBATCH --array=0-2\n" in script
+    assert "batch-%a.out" in script
+    assert "case $SLURM_ARRAY_TASK_ID in" in script
+
+    script = _array_script(QsubBatchStep, QsubBatchSettings(nodes=1), test_dir)
+    assert "#PBS -J 0-2\n" in script
+    assert "case $PBS_ARRAY_INDEX in" in script
+
+    settings = BsubBatchSettings(nodes=1, time="01:00", project="A")
+    script = _array_script(BsubBatchStep, settings, test_dir)
+    assert "#BSUB -J batch" in script and "[1-3]\n" in script
+    assert "case $LSB_JOBINDEX in\n    1)" in script
+
+    # a single member is a regular batch
+    script = _array_script(SbatchStep, SbatchSettings(nodes=1), test_dir, members=1)
+    assert "--array" not in script
+
+    with pytest.raises(SSUnsupportedError):
+        CobaltBatchSettings(nodes=1).set_array()
+
+
+def test_array_task_runs_member(fileutils):
+    """Each array index runs only the member at that index"""
+    test_dir = fileutils.make_test_dir("test_array_task_runs_member")
+    script = _array_script(SbatchStep, SbatchSettings(nodes=1), test_dir)
+    with open(f"{test_dir}/batch.sh", "w") as f:
+        f.write(script)
+    for index in ("2", "0"):
+        env = {"SLURM_ARRAY_TASK_ID": index, "PATH": "/usr/bin:/bin"}
+        subprocess.run(["bash", f"{test_dir}/batch.sh"], env=env, check=True)
+    with open(f"{test_dir}/log") as f:
+        assert f.read().split() == ["member_2", "member_0"]
+
+
+def test_aggregate_step_info():
+    def aggregate(*statuses):
+        return aggregate_step_info([SlurmStepInfo(s, "0") for s in statuses])
+
+    assert aggregate("COMPLETED", "RUNNING", "PENDING").status == STATUS_RUNNING
+    assert aggregate("FAILED", "PENDING").launcher_status == "PENDING"
+    assert aggregate("COMPLETED", "FAILED").status == STATUS_FAILED
+    assert aggregate("COMPLETED", "COMPLETED").status == STATUS_COMPLETED
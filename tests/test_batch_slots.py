@@ -0,0 +1,66 @@
+import subprocess
+
+import pytest
+
+from smartsim._core.launcher.step import SbatchStep, SrunStep
+from smartsim._core.launcher.step.step import write_batch_cmds
+from smartsim.settings import SbatchSettings, SrunSettings
+
+
+def test_set_max_slots():
+    sbatch = SbatchSettings(nodes=2)
+    assert sbatch.max_slots is None
+    sbatch.set_max_slots(2)
+    assert sbatch.max_slots == 2
+    with pytest.raises(ValueError):
+        sbatch.set_max_slots(0)
+    with pytest.raises(TypeError):
+        sbatch.set_max_slots("2")
+
+
+def test_batch_slots(fileutils):
+    test_dir = fileutils.make_test_dir("test_batch_slots")
+    batch = SbatchStep("batch", test_dir, SbatchSettings(nodes=2))
+    for nodes in (None, 2, 5):
+        run_settings = SrunSettings("echo", run_args={"nodes": nodes})
+        run_settings.in_batch = True
+        batch.add_to_batch(SrunStep("member", test_dir, run_settings))
+    assert batch.step_slots == [1, 2, 5]
+
+    script = batch._write_script()
+    with open(script) as f:
+        assert "smartsim_acquire_slots" not in f.read()
+
+    batch.batch_settings.set_max_slots(2)
+    script = batch._write_script()
+    with open(script) as f:
+        content = f.read()
+    # the member larger than the allocation runs on its own
+    assert content.count("smartsim_acquire_slots 2") == 2
+    assert content.rstrip().endswith("wait")
+
+
+def test_batch_slots_run(fileutils):
+    """Members start as slots free up and never exceed the limit"""
+    test_dir = fileutils.make_test_dir("test_batch_slots_run")
+    log = f"{test_dir}/members.log"
+    member = f"{test_dir}/member.sh"
+    with open(member, "w") as f:
+        f.write(f"echo start >> {log}\nsleep 0.2\necho end >> {log}\n")
+
+    step_cmds = [["bash", member] for _ in range(6)]
+    step_slots = [1, 1, 2, 1, 1, 1]
+    script = f"{test_dir}/batch.sh"
+    with open(script, "w") as f:
+        f.write("#!/bin/bash\n")
+        write_batch_cmds(f, step_cmds, step_slots, max_slots=2)
+    subprocess.run(["bash", script], check=True, timeout=30)
+
+    running = peak = 0
+    with open(log) as f:
+        events = f.read().split()
+    for event in events:
+        running += 1 if event == "start" else -1
+        peak = max(peak, running)
+    assert events.count("end") == 6
+    assert peak == 2
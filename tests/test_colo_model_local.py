@@ -1,8 +1,14 @@
+import os
+import socket
 import sys
 
 from smartsim import Experiment, status
 
 
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
 
 def test_launch_colocated_model(fileutils):
     """Test the launch of a model with a colocated database and local launcher"""
@@ -42,3 +48,69 @@ def test_launch_colocated_model(fileutils):
     exp.start(colo_model, block=True)
     statuses = exp.get_status(colo_model)
     assert all([stat == status.STATUS_COMPLETED for stat in statuses])
+
+
+def test_launch_colocated_model_uds(fileutils):
+    """Test the launch of a model with a colocated database on a UDS"""
+
+    exp_name = "test-launch-colocated-model-uds"
+    exp = Experiment(exp_name, launcher="local")
+
+    test_dir = fileutils.make_test_dir(exp_name)
+    sr_test_script = fileutils.get_test_conf_path("send_data_local_smartredis.py")
+
+    colo_settings = exp.create_run_settings(
+        exe=sys.executable,
+        exe_args=sr_test_script
+    )
+
+    colo_model = exp.create_model("colocated_model", colo_settings)
+    colo_model.set_path(test_dir)
+    socket = f"/tmp/{exp_name}-{os.getpid()}.sock"
+    colo_model.colocate_db(
+        port=6780,
+        db_cpus=1,
+        limit_app_cpus=False,
+        debug=True,
+        ifname="lo",
+        socket=socket
+    )
+    assert colo_model.run_settings.colocated_db_settings["unix_socket"] == socket
+
+    exp.start(colo_model, block=True)
+    assert colo_model.run_settings.env_vars["SSDB"] == f"unix://{socket}"
+    statuses = exp.get_status(colo_model)
+    assert all([stat == status.STATUS_COMPLETED for stat in statuses])
+
+
+def test_colocated_uds_round_trip(fileutils):
+    """Test that a model reaches its colocated database over the socket"""
+
+    exp_name = "test-colocated-uds-round-trip"
+    exp = Experiment(exp_name, launcher="local")
+
+    test_dir = fileutils.make_test_dir(exp_name)
+    round_trip_script = fileutils.get_test_conf_path("uds_round_trip.py")
+
+    colo_settings = exp.create_run_settings(
+        exe=sys.executable,
+        exe_args=round_trip_script
+    )
+
+    colo_model = exp.create_model("colocated_model", colo_settings)
+    colo_model.set_path(test_dir)
+    socket_path = f"/tmp/{exp_name}-{os.getpid()}.sock"
+    colo_model.colocate_db(
+        port=get_free_port(),
+        db_cpus=1,
+        limit_app_cpus=False,
+        debug=True,
+        ifname="lo",
+        socket=socket_path
+    )
+
+    # the model exits with an error unless SSDB is unix:// and the
+    # socket file exists and answers requests
+    exp.start(colo_model, block=True)
+    statuses = exp.get_status(colo_model)
+    assert all([stat == status.STATUS_COMPLETED for stat in statuses])
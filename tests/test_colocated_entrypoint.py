@@ -0,0 +1,146 @@
+import os
+import socket
+import subprocess
+import time
+from pathlib import Path
+
+import psutil
+import pytest
+
+from smartsim._core.config import CONFIG
+from smartsim._core.entrypoints.colocated import (
+    format_cpulist,
+    get_endpoint,
+    get_nic_numa_node,
+    get_numa_nodes,
+    get_ready_file,
+    has_exited,
+    parse_cpulist,
+    plan_cpu_layout,
+    publish_ready,
+    wait_ready,
+)
+from smartsim.error import SSConfigError
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_cpulist_roundtrip():
+    assert parse_cpulist("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+    assert format_cpulist([11, 0, 1, 2, 3, 8, 10]) == "0-3,8,10-11"
+    assert parse_cpulist("") == []
+
+
+def test_numa_topology(fileutils):
+    test_dir = fileutils.make_test_dir("test_numa_topology")
+    node_root = os.path.join(test_dir, "node")
+    _write(os.path.join(node_root, "node0", "cpulist"), "0-3\n")
+    _write(os.path.join(node_root, "node1", "cpulist"), "4-7\n")
+    _write(os.path.join(node_root, "online"), "0-1\n")
+    assert get_numa_nodes(node_root) == {0: [0, 1, 2, 3], 1: [4, 5, 6, 7]}
+    assert get_numa_nodes(os.path.join(test_dir, "missing")) == {}
+
+    net_root = os.path.join(test_dir, "net")
+    _write(os.path.join(net_root, "ib0", "device", "numa_node"), "0\n")
+    _write(os.path.join(net_root, "eth0", "device", "numa_node"), "-1\n")
+    assert get_nic_numa_node("ib0", net_root) == 0
+    assert get_nic_numa_node("eth0", net_root) is None
+    assert get_nic_numa_node("lo", net_root) is None
+
+
+def test_plan_cpu_layout():
+    nodes = {0: [0, 1, 2, 3], 1: [4, 5, 6, 7]}
+    allowed = list(range(8))
+
+    # the last node is used by default, the app gets everything else
+    node, db, app = plan_cpu_layout(allowed, 2, nodes)
+    assert (node, db, app) == (1, [6, 7], [0, 1, 2, 3, 4, 5])
+
+    # the node of the NIC is preferred
+    node, db, app = plan_cpu_layout(allowed, 2, nodes, preferred=0)
+    assert (node, db) == (0, [2, 3])
+
+    # the database is never split across nodes when one node fits
+    node, db, _ = plan_cpu_layout([0, 1, 2, 3, 4, 5], 3, nodes)
+    assert (node, db) == (0, [1, 2, 3])
+
+    # no node fits, fall back to the last allowed CPUs
+    node, db, app = plan_cpu_layout(allowed, 6, nodes)
+    assert (node, db, app) == (None, [2, 3, 4, 5, 6, 7], [0, 1])
+
+    # without topology information the old placement is kept
+    assert plan_cpu_layout(allowed, 2, {}) == (None, [6, 7], [0, 1, 2, 3, 4, 5])
+    assert plan_cpu_layout([0], 1, {}) == (None, [0], [0])
+
+
+def test_endpoint():
+    command = ["redis-server", "redis.conf", "--port", "6780"]
+    assert get_endpoint(command, "127.0.0.1") == "127.0.0.1:6780"
+    command += ["--unixsocket", "/tmp/db.sock", "--unixsocketperm", "755"]
+    assert get_endpoint(command, "127.0.0.1") == "unix:///tmp/db.sock"
+    assert get_ready_file("smartsim-1234567.lock").name == "smartsim-1234567.ready"
+
+
+def test_publish_ready(fileutils):
+    try:
+        redis_exe = CONFIG.redis_exe
+    except SSConfigError:
+        pytest.skip("redis-server is not available")
+
+    test_dir = fileutils.make_test_dir("test_publish_ready")
+    ready_file = Path(test_dir) / "db.ready"
+    assert not wait_ready(ready_file, 0.2)
+
+    port = get_free_port()
+    endpoint = f"127.0.0.1:{port}"
+    cmd = [redis_exe, "--port", str(port), "--bind", "127.0.0.1", "--save", ""]
+    proc = psutil.Popen(cmd, cwd=test_dir, stdout=subprocess.DEVNULL)
+    try:
+        loaded = []
+        assert publish_ready(
+            ready_file, endpoint, proc, lambda: loaded.append(ready_file), timeout=30
+        )
+        # models are loaded before any rank is let in
+        assert loaded == [ready_file]
+        assert wait_ready(ready_file, 0.2)
+        assert ready_file.read_text().strip() == endpoint
+    finally:
+        proc.terminate()
+        proc.wait()
+    # a database that exited is never announced
+    assert not publish_ready(Path(test_dir) / "dead.ready", endpoint, proc)
+
+
+def test_publish_ready_exited(fileutils):
+    test_dir = fileutils.make_test_dir("test_publish_ready_exited")
+    endpoint = f"127.0.0.1:{get_free_port()}"
+
+    # a database that exited but was not reaped yet is a zombie
+    proc = psutil.Popen(["sh", "-c", "exit 1"])
+    while proc.status() != psutil.STATUS_ZOMBIE:
+        time.sleep(0.05)
+    assert has_exited(proc)
+    start = time.time()
+    assert not publish_ready(Path(test_dir) / "zombie.ready", endpoint, proc)
+    assert time.time() - start < 5
+    proc.wait()
+
+    # a database that never answers is given up on
+    proc = psutil.Popen(["sleep", "30"])
+    try:
+        assert not publish_ready(
+            Path(test_dir) / "silent.ready", endpoint, proc, timeout=0.5
+        )
+    finally:
+        proc.kill()
+        proc.wait()
@@ -11,7 +11,6 @@ def test_all_config_defaults():
     config = Config()
     assert Path(config.redisai).is_file()
     assert Path(config.redis_exe).is_file()
-    assert Path(config.redis_cli).is_file()
     assert Path(config.redis_conf).is_file()
 
     # these will be changed so we will just run them
@@ -58,15 +57,3 @@ def test_redis_exe():
     with pytest.raises(SSConfigError):
         config.redis_exe
     os.environ.pop("REDIS_PATH")
-
-
-def test_redis_cli():
-    config = Config()
-    assert Path(config.redisai).is_file()
-    assert isinstance(config.redisai, str)
-
-    os.environ["REDIS_CLI_PATH"] = "not/a/path"
-    config = Config()
-    with pytest.raises(SSConfigError):
-        config.redis_cli
-    os.environ.pop("REDIS_CLI_PATH")
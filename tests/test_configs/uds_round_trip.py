@@ -0,0 +1,21 @@
+import os
+
+import redis
+
+
+def main():
+    # SSDB points at the socket of the co-located database
+    address = os.environ["SSDB"]
+    assert address.startswith("unix://"), address
+
+    socket_path = address[len("unix://"):]
+    assert os.path.exists(socket_path), socket_path
+
+    client = redis.Redis(unix_socket_path=socket_path)
+    client.set("uds_round_trip", b"\x00\x01\x02")
+    assert client.get("uds_round_trip") == b"\x00\x01\x02"
+    print(f"Round trip over {socket_path} worked!")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,14 @@ import pytest
 from smartsim._core.control import Controller, Manifest
 from smartsim.database import Orchestrator, PBSOrchestrator
 from smartsim.entity import Ensemble, Model
-from smartsim.error import SmartSimError, SSConfigError, SSUnsupportedError
+from smartsim.error import (
+    LauncherError,
+    SmartSimError,
+    SSConfigError,
+    SSUnsupportedError,
+)
 from smartsim.error.errors import SSConfigError, SSUnsupportedError
-from smartsim.settings import RunSettings, SbatchSettings
+from smartsim.settings import RunSettings, SbatchSettings, SrunSettings
 
 
 def test_finished_entity_orc_error():
@@ -72,3 +77,25 @@ def test_bad_orc_checkpoint():
     cont = Controller(launcher="local")
     with pytest.raises(FileNotFoundError):
         cont.reload_saved_db(checkpoint)
+
+
+def test_launch_models_concurrently(fileutils):
+    test_dir = fileutils.make_test_dir("test_launch_models_concurrently")
+    models = [
+        Model(f"model_{i}", {}, test_dir, RunSettings("echo", f"{i}")) for i in range(5)
+    ]
+    cont = Controller(launcher="local")
+    cont._launch(Manifest(*models))
+    assert sorted(cont._jobs.jobs) == [model.name for model in models]
+    for model in models:
+        assert cont._jobs[model.name].entity is model
+
+
+def test_launch_step_creation_failure(fileutils):
+    test_dir = fileutils.make_test_dir("test_launch_step_creation_failure")
+    models = [Model(f"srun_{i}", {}, test_dir, SrunSettings("echo")) for i in range(2)]
+    # srun steps can not be created outside of an allocation
+    cont = Controller(launcher="slurm")
+    with pytest.raises(LauncherError):
+        cont._launch(Manifest(*models))
+    assert not cont._jobs.jobs
@@ -1,10 +1,17 @@
+import gc
 from copy import deepcopy
 
 import pytest
 
 from smartsim import Experiment
 from smartsim.entity import Ensemble, Model
-from smartsim.error import EntityExistsError, SSUnsupportedError, UserStrategyError
+from smartsim.entity.strategies import AdaptiveSampler
+from smartsim.error import (
+    EntityExistsError,
+    SmartSimError,
+    SSUnsupportedError,
+    UserStrategyError,
+)
 from smartsim.settings import RunSettings
 
 """
@@ -91,6 +98,75 @@ def test_random():
     assert all([x in random_ints for x in assigned_params])
 
 
+def test_random_seed():
+    """Test random strategy over a large space with a seed"""
+    params = {f"p{i}": list(range(100)) for i in range(10)}
+    ensemble_1 = Ensemble(
+        "random_test", params, run_settings=rs, perm_strat="random", n_models=50, seed=7
+    )
+    ensemble_2 = Ensemble(
+        "random_test", params, run_settings=rs, perm_strat="random", n_models=50, seed=7
+    )
+    assert len(ensemble_1) == 50
+    params_1 = [m.params for m in ensemble_1]
+    assert params_1 == [m.params for m in ensemble_2]
+    assert len(set(str(p) for p in params_1)) == 50
+
+
+def test_latin_hypercube():
+    """Test that each value of each parameter is sampled once"""
+    params = {"h": list(range(10)), "g": list(range(20, 30))}
+    ensemble = Ensemble(
+        "lhs_test", params, run_settings=rs, perm_strat="lhs", n_models=10, seed=3
+    )
+    assert len(ensemble) == 10
+    assert sorted(m.params["h"] for m in ensemble) == params["h"]
+    assert sorted(m.params["g"] for m in ensemble) == params["g"]
+
+
+def test_halton():
+    params = {"h": list(range(8)), "g": list(range(9))}
+    ensemble = Ensemble(
+        "halton_test", params, run_settings=rs, perm_strat="halton", n_models=8
+    )
+    # base 2 covers every value of the first parameter
+    assert sorted(m.params["h"] for m in ensemble) == params["h"]
+    assert ensemble.entities[0].params == {"h": 4, "g": 3}
+
+
+def test_adaptive_expand():
+    """Test growing an ensemble with an adaptive strategy"""
+
+    def propose(names, values, history, n_models, **kwargs):
+        assert kwargs == {"seed": 0}
+        best = min(history, key=lambda item: item[1])[0]
+        return [dict(best) for _ in range(n_models)]
+
+    sampler = AdaptiveSampler(propose)
+    params = {"h": list(range(10))}
+    ensemble = Ensemble(
+        "adaptive", params, run_settings=rs, perm_strat=sampler, n_models=4, seed=0
+    )
+    assert len(ensemble) == 4
+    # the initial members would be sampled again without results
+    with pytest.raises(SmartSimError):
+        ensemble.expand()
+    for model in ensemble:
+        sampler.tell(model.params, abs(model.params["h"] - 5))
+    best = min(ensemble, key=lambda m: abs(m.params["h"] - 5)).params
+
+    new_models = ensemble.expand(n_models=2)
+    assert len(ensemble) == 6
+    assert [m.name for m in new_models] == ["adaptive_4", "adaptive_5"]
+    assert all(m.params == best for m in new_models)
+
+
+def test_expand_replicas():
+    ensemble = Ensemble("replicas", {}, run_settings=rs, replicas=2)
+    with pytest.raises(SmartSimError):
+        ensemble.expand()
+
+
 def test_user_strategy():
     """Test a user provided strategy"""
     params = {"h": [5, 6], "g": [7, 8]}
@@ -104,6 +180,68 @@ def test_user_strategy():
     assert ensemble.entities[1].params == model_2_params
 
 
+def test_lazy_all_perm():
+    """Test that lazy ensembles create members on demand"""
+    params = {"h": list(range(1000)), "g": list(range(1000))}
+    ensemble = Ensemble("lazy", params, run_settings=rs, lazy=True)
+    assert ensemble.lazy
+    assert len(ensemble) == 1000 * 1000
+    assert ensemble.entities.materialized() == []
+
+    model = ensemble.entities[1001]
+    assert model.name == "lazy_1001"
+    assert model.params == {"h": 1, "g": 1}
+    assert model.query_key_prefixing()
+    # members are reused while they are referenced
+    assert ensemble.entities[1001] is model
+    assert ensemble.entities[-1].params == {"h": 999, "g": 999}
+
+
+def test_lazy_keeps_accessed_members():
+    """Test that changes to members accessed by index or name persist"""
+    params = {"h": list(range(1000)), "g": list(range(1000))}
+    ensemble = Ensemble("lazy", params, run_settings=rs, lazy=True)
+    ensemble["lazy_3"].run_settings.exe_args.append("--changed")
+    ensemble.entities[4].run_settings.exe_args.append("--changed")
+    gc.collect()
+    assert ensemble["lazy_3"].run_settings.exe_args[-1] == "--changed"
+    assert ensemble.entities[4].run_settings.exe_args[-1] == "--changed"
+    assert ensemble["not_a_member"] is None
+    assert ensemble["lazy_1000000"] is None
+    assert len(ensemble.entities.materialized()) == 2
+
+
+def test_lazy_matches_eager():
+    params = {"h": [5, 6], "g_param": ["a", "b"]}
+    eager = Ensemble("ens", params, params_as_args=["g_param"], run_settings=rs)
+    lazy = Ensemble(
+        "ens", params, params_as_args=["g_param"], run_settings=rs, lazy=True
+    )
+    assert len(eager) == len(lazy)
+    for eager_model, lazy_model in zip(eager, lazy):
+        assert eager_model.name == lazy_model.name
+        assert eager_model.params == lazy_model.params
+        assert eager_model.run_settings.exe_args == lazy_model.run_settings.exe_args
+
+
+def test_lazy_member_state():
+    """Test ensemble wide state is applied to lazily created members"""
+    ensemble = Ensemble("lazy", {"h": [5, 6]}, run_settings=rs, lazy=True)
+    incoming = Model("incoming", {}, "", rs)
+    ensemble.register_incoming_entity(incoming)
+    with pytest.raises(EntityExistsError):
+        ensemble.register_incoming_entity(incoming)
+
+    for model in ensemble:
+        assert model.incoming_entities == [incoming]
+
+    with pytest.raises(EntityExistsError):
+        ensemble.add_model(Model("lazy_1", {}, "", rs))
+    ensemble.add_model(Model("lazy_2", {}, "", rs))
+    assert len(ensemble) == 3
+    assert ensemble.entities[2].name == "lazy_2"
+
+
 # ----- Model arguments -------------------------------------
 
 
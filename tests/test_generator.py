@@ -1,3 +1,4 @@
+import os
 from os import path as osp
 
 import pytest
@@ -214,3 +215,105 @@ def test_no_gen_if_symlink_to_dir(fileutils):
     config = fileutils.get_test_conf_path("circular_config")
     with pytest.raises(ValueError):
         ensemble.attach_generator_files(to_configure=config)
+
+
+def test_hardlink_copy_mode(fileutils):
+    """Test that copy files are hardlinked into each member"""
+    test_dir = fileutils.make_test_dir("gen_hardlink_test")
+    exp = Experiment("gen-test", test_dir, launcher="local")
+
+    ensemble = exp.create_ensemble("link_test", params={"P": [0, 1]}, run_settings=rs)
+    conf_dir = fileutils.get_test_dir_path("test_dir")
+    script = fileutils.get_test_conf_path("sleep.py")
+    ensemble.attach_generator_files(to_copy=[conf_dir, script], copy_mode="hardlink")
+    exp.generate(ensemble)
+
+    for model in ensemble:
+        for src, dst in (
+            (script, "sleep.py"),
+            (osp.join(conf_dir, "test.py"), "test.py"),
+            (osp.join(conf_dir, "test_dir_1", "config.txt"), "test_dir_1/config.txt"),
+        ):
+            assert osp.samefile(src, osp.join(model.path, dst))
+
+
+def test_reflink_copy_mode(fileutils):
+    """Test that reflinks fall back to a copy if unsupported"""
+    test_dir = fileutils.make_test_dir("gen_reflink_test")
+    exp = Experiment("gen-test", test_dir, launcher="local")
+
+    model = exp.create_model("model", run_settings=rs)
+    script = fileutils.get_test_conf_path("sleep.py")
+    model.attach_generator_files(to_copy=script, copy_mode="reflink")
+    exp.generate(model)
+
+    dst = osp.join(model.path, "sleep.py")
+    assert not osp.samefile(script, dst)
+    with open(script) as src_file, open(dst) as dst_file:
+        assert src_file.read() == dst_file.read()
+
+
+def test_bad_copy_mode(fileutils):
+    exp = Experiment("bad-copy-mode", launcher="local")
+    model = exp.create_model("model", run_settings=rs)
+    script = fileutils.get_test_conf_path("sleep.py")
+    with pytest.raises(ValueError):
+        model.attach_generator_files(to_copy=script, copy_mode="symlink")
+
+
+def test_incremental_regeneration(fileutils):
+    """Test that overwriting only regenerates members whose inputs changed"""
+    exp = Experiment("gen-test-incremental", launcher="local")
+    test_dir = fileutils.make_test_dir("test_gen_incremental")
+    gen = Generator(test_dir, overwrite=True)
+
+    params = {"THERMO": [10, 20, 30], "STEPS": [10, 20, 30]}
+    ensemble = exp.create_ensemble("test", params=params, run_settings=rs)
+    config = fileutils.get_test_conf_path("in.atm")
+    ensemble.attach_generator_files(to_configure=config)
+    gen.generate_experiment(ensemble)
+
+    stale_dir = osp.join(test_dir, "test", "test_9")
+    os.mkdir(stale_dir)
+    for model in ensemble:
+        open(osp.join(model.path, "sentinel"), "w").close()
+
+    # nothing changed, so no member should be regenerated
+    gen.generate_experiment(ensemble)
+    # the files shared by all members are only described once
+    assert len(gen._files_manifests) == 1
+    for model in ensemble:
+        assert osp.isfile(osp.join(model.path, "sentinel"))
+    assert not osp.isdir(stale_dir)
+
+    ensemble["test_0"].params["THERMO"] = 40
+    gen.generate_experiment(ensemble)
+    assert not osp.isfile(osp.join(test_dir, "test", "test_0", "sentinel"))
+    for i in range(1, 9):
+        assert osp.isfile(osp.join(test_dir, "test", f"test_{i}", "sentinel"))
+    with open(osp.join(test_dir, "test", "test_0", "in.atm")) as f:
+        assert "40" in f.read()
+
+    # changing the tag changes the inputs of every member
+    gen.set_tag("@")
+    gen.generate_experiment(ensemble)
+    for model in ensemble:
+        assert not osp.isfile(osp.join(model.path, "sentinel"))
+
+
+def test_lazy_ensemble(fileutils):
+    """Test generation of members of a lazy ensemble"""
+    test_dir = fileutils.make_test_dir("gen_lazy_test")
+    exp = Experiment("gen-test", test_dir, launcher="local")
+
+    params = {"THERMO": [10, 20, 30], "STEPS": [10, 20, 30]}
+    ensemble = exp.create_ensemble("lazy", params=params, run_settings=rs, lazy=True)
+    config = fileutils.get_test_conf_path("in.atm")
+    ensemble.attach_generator_files(to_configure=config)
+    exp.generate(ensemble)
+
+    for i, model in enumerate(ensemble):
+        assert model.path == osp.join(test_dir, "lazy", f"lazy_{i}")
+        with open(osp.join(model.path, "in.atm")) as f:
+            contents = f.read()
+            assert f"thermo          {model.params['THERMO']}" in contents
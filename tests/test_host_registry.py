@@ -0,0 +1,81 @@
+import os
+import socket
+import time
+
+from smartsim._core.control.registry import NODE_NAME_ENV, REGISTRY_ENV, HostRegistry
+from smartsim._core.entrypoints.redis import register
+from smartsim.entity import DBNode
+from smartsim.settings import RunSettings
+
+
+def test_host_registry():
+    with HostRegistry("lo") as registry:
+        env = registry.get_env("orchestrator_0")
+        assert env[NODE_NAME_ENV] == "orchestrator_0"
+        # only the loopback interface is listened on
+        assert env[REGISTRY_ENV].startswith(f"{registry.token}@127.")
+
+        # the database entrypoint pushes its address from the environment
+        os.environ.update(env)
+        try:
+            register("10.0.0.1")
+        finally:
+            for key in env:
+                os.environ.pop(key)
+
+        start = time.time()
+        hosts = registry.wait({"orchestrator_0": 1}, timeout=10)
+        assert hosts == {"orchestrator_0": ["10.0.0.1"]}
+        assert time.time() - start < 5
+
+
+def test_host_registry_token():
+    with HostRegistry("lo") as registry:
+        host, port = registry.address.split(":")
+        with socket.create_connection((host, int(port))) as sock:
+            sock.sendall(b"not-the-token orchestrator_0 10.0.0.66\n")
+        with socket.create_connection((host, int(port))) as sock:
+            sock.sendall(b"orchestrator_0 10.0.0.66\n")
+        assert registry.wait({"orchestrator_0": 1}, timeout=0.5) == {}
+
+
+def test_host_registry_timeout():
+    with HostRegistry("lo") as registry:
+        registry._register("orchestrator_1", "10.0.0.2")
+        # nodes missing shards are left out for the output files fallback
+        hosts = registry.wait({"orchestrator_1": 2, "orchestrator_2": 1}, timeout=0.2)
+        assert hosts == {}
+        hosts = registry.wait({"orchestrator_1": 1}, timeout=0.2)
+        assert hosts == {"orchestrator_1": ["10.0.0.2"]}
+
+
+def test_host_registry_output_files(fileutils):
+    test_dir = fileutils.make_test_dir("test_host_registry_output_files")
+    dbnode = DBNode("orchestrator_0", test_dir, RunSettings("echo"), [6780])
+    assert dbnode._read_db_hosts() is None
+
+    with open(os.path.join(test_dir, "orchestrator_0.out"), "w") as f:
+        f.write("IPADDRESS: 10.0.0.3\n")
+
+    # shards that can not reach the driver are found without the timeout
+    with HostRegistry("not-an-interface") as registry:
+        assert registry.get_env("orchestrator_0") == {}
+        start = time.time()
+        hosts = registry.wait(
+            {"orchestrator_0": 1},
+            timeout=10,
+            read_files=lambda _: dbnode._read_db_hosts(),
+        )
+        assert hosts == {"orchestrator_0": ["10.0.0.3"]}
+        assert time.time() - start < 5
+
+
+def test_register_unreachable():
+    os.environ[REGISTRY_ENV] = "token@127.0.0.1:1"
+    os.environ[NODE_NAME_ENV] = "orchestrator_0"
+    try:
+        # a driver that can not be reached is not fatal for the shard
+        register("10.0.0.1")
+    finally:
+        os.environ.pop(REGISTRY_ENV)
+        os.environ.pop(NODE_NAME_ENV)
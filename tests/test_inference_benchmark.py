@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from smartsim._core.entrypoints.inference_benchmark import (
+    format_results,
+    percentile,
+    run_sweep,
+    summarize,
+)
+
+
+class _FakeClient:
+    """Stores models and answers requests without a database"""
+
+    models = {}
+    lock = threading.Lock()
+
+    def set_model_from_file(self, name, model_file, backend, **kwargs):
+        with self.lock:
+            self.models[name] = (model_file, backend, kwargs)
+
+    def put_tensor(self, key, data):
+        self.data = data
+
+    def run_model(self, name, inputs, outputs):
+        assert name in self.models
+
+    def get_tensor(self, key):
+        return self.data
+
+
+def test_percentiles():
+    samples = [i / 1000 for i in range(1, 101)]
+    assert percentile(samples, 50) == 0.05
+    assert percentile(samples, 99) == 0.099
+    assert percentile([0.2], 90) == 0.2
+
+    summary = summarize(samples, 2.0)
+    assert summary["requests"] == 100
+    assert summary["throughput"] == 50.0
+    assert round(summary["p90"], 6) == 90.0
+
+
+def test_run_sweep():
+    results = run_sweep(
+        _FakeClient,
+        "model.pt",
+        "TORCH",
+        [1, 4],
+        [0, 8],
+        min_batch_timeout=5,
+        requests=40,
+        concurrency=4,
+    )
+    assert list(results) == [0, 8]
+    assert all(summary["requests"] == 40 for summary in results.values())
+    assert _FakeClient.models["benchmark_model_8"][2] == {
+        "device": "CPU",
+        "batch_size": 8,
+        "min_batch_timeout": 5,
+    }
+    assert len(format_results(results).splitlines()) == 3
+
+
+def test_summarize_empty():
+    summary = summarize([], 1.0)
+    assert summary["requests"] == 0
+    assert summary["throughput"] == 0.0
+
+
+def test_run_sweep_client_error():
+    clients = []
+
+    def make_client():
+        # the admin and first benchmark client connect, the others fail
+        clients.append(None)
+        if len(clients) > 2:
+            raise ConnectionError("database is unreachable")
+        return _FakeClient()
+
+    with pytest.raises(ConnectionError):
+        run_sweep(make_client, "model.pt", "TORCH", [1], [0], concurrency=4)
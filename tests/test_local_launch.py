@@ -1,4 +1,11 @@
+import gc
+import os
+import weakref
+
 from smartsim import Experiment, status
+from smartsim._core.control import Controller, Manifest
+from smartsim.entity import Ensemble
+from smartsim.settings import RunSettings
 
 """
 Test the launch of simple entity types with local launcher
@@ -35,3 +42,47 @@ def test_ensemble(fileutils):
     exp.start(ensemble, block=True, summary=True)
     statuses = exp.get_status(ensemble)
     assert all([stat == status.STATUS_COMPLETED for stat in statuses])
+
+
+class _CountingController(Controller):
+    """Record the peak number of members and steps alive during launch"""
+
+    def __init__(self, ensemble):
+        super().__init__(launcher="local")
+        self.ensemble = ensemble
+        self.steps = weakref.WeakSet()
+        self.peak_steps = 0
+        self.peak_members = 0
+
+    def _create_job_step(self, entity):
+        step = super()._create_job_step(entity)
+        gc.collect()
+        self.steps.add(step)
+        members = self.ensemble.entities.materialized()
+        self.peak_steps = max(self.peak_steps, len(self.steps))
+        self.peak_members = max(self.peak_members, len(members))
+        return step
+
+
+def test_lazy_ensemble_window(fileutils):
+    test_dir = fileutils.make_test_dir("test-lazy-ensemble-window")
+    ensemble = Ensemble(
+        "lazy", {"x": list(range(12))}, run_settings=RunSettings("echo"), lazy=True
+    )
+    ensemble.set_path(test_dir)
+
+    os.environ["SMARTSIM_LAZY_WINDOW"] = "3"
+    try:
+        controller = _CountingController(ensemble)
+        controller.start(Manifest(ensemble), block=True)
+    finally:
+        os.environ.pop("SMARTSIM_LAZY_WINDOW")
+
+    statuses = controller.get_entity_list_status(ensemble)
+    assert statuses == [status.STATUS_COMPLETED] * 12
+    assert controller.finished(ensemble)
+    # only the members in flight and their steps are ever alive
+    assert controller.peak_steps <= 3
+    assert controller.peak_members <= 3
+    gc.collect()
+    assert len(ensemble.entities.materialized()) <= 3
@@ -1,4 +1,11 @@
+import threading
+
+from smartsim._core.control.jobmanager import JobManager
 from smartsim._core.launcher.lsf import lsfParser
+from smartsim._core.launcher.lsf.lsfLauncher import LSFLauncher
+from smartsim._core.launcher.stepInfo import LSFJsrunStepInfo
+from smartsim.entity import Model
+from smartsim.settings import RunSettings
 
 # -- bsub ---------------------------------------------------------
 
@@ -92,3 +99,92 @@ def test_parse_jslist():
     parsed_result = lsfParser.parse_jslist_stepid(output, "1")
     result = ("Running", "0")
     assert parsed_result == result
+
+
+def test_parse_status_tables():
+    """Every step is served from a single jslist and bjobs call"""
+    jslist_out = (
+        "ID   ID       nrs    per RS    per RS    status         status\n"
+        "===============================================================================\n"
+        "    1    1         4   various   various         0        Running\n"
+        "    2    1         1         1         1       137         Killed\n"
+    )
+    steps = lsfParser.parse_jslist(jslist_out)
+    assert steps["1"] == ("Running", "0")
+    assert steps["2"] == ("Killed", "137")
+    assert lsfParser.parse_jslist_stepid(jslist_out, "3") == ("NOTFOUND", None)
+
+    bjobs_out = (
+        "JOBID   USER    STAT  QUEUE      FROM_HOST   EXEC_HOST   JOB_NAME   SUBMIT_TIME\n"
+        "1234567 smartsim RUN   batch      login1      batch3      SmartSim   Jul 24 12:53\n"
+        "1234568 smartsim DONE  batch      login1      batch3      SmartSim   Jul 24 12:54\n"
+    )
+    jobs = lsfParser.parse_bjobs(bjobs_out)
+    assert jobs["1234567"] == ["RUN"]
+    assert jobs["1234568"] == ["DONE"]
+    assert lsfParser.parse_bjobs_jobid(bjobs_out, "1") == "NOTFOUND"
+
+
+def test_resolve_jsrun_ids():
+    """Concurrent jsrun launches are matched to new ids in launch order"""
+    launcher = LSFLauncher()
+    launcher._known_jsrun_ids = {"1234": {"1"}}
+    for i, name in enumerate(["first", "second", "third"]):
+        tag = f"1234.pending-{i}"
+        launcher._pending_jsrun[tag] = ("1234", None, None)
+        launcher.step_mapping.add(name, tag)
+
+    output = (
+        "    1    1         4   various   various         0        Running\n"
+        "    3    1         1         1         1         0        Running\n"
+        "    2    1         1         1         1         0        Running\n"
+    )
+    resolved = launcher._resolve_jsrun_ids(output)
+    assert resolved == {"1234.pending-0": "1234.2", "1234.pending-1": "1234.3"}
+    assert launcher.step_mapping["first"].step_id == "1234.2"
+    assert launcher.step_mapping["second"].step_id == "1234.3"
+    # the last launch is not listed by JSM yet
+    assert launcher.step_mapping["third"].step_id == "1234.pending-2"
+    assert list(launcher._pending_jsrun) == ["1234.pending-2"]
+
+
+def test_resolve_exited_jsrun_ids():
+    """A jsrun that exited before JSM listed it keeps its place"""
+    launcher = LSFLauncher()
+    launcher._known_jsrun_ids = {"1234": {"1"}}
+    exited = LSFJsrunStepInfo("NOTFOUND", 1)
+    launcher._pending_jsrun["1234.pending-0"] = ("1234", None, exited)
+    launcher._pending_jsrun["1234.pending-1"] = ("1234", None, None)
+    launcher.step_mapping.add("exited", "1234.pending-0")
+    launcher.step_mapping.add("running", "1234.pending-1")
+
+    # the id JSM lists later is not given to the next launch
+    output = "    2    1         1         1         1         1        Complete\n"
+    resolved = launcher._resolve_jsrun_ids(output)
+    assert resolved == {"1234.pending-0": "1234.2"}
+    assert launcher.step_mapping["running"].step_id == "1234.pending-1"
+
+    # a step that JSM never lists frees its place
+    launcher._pending_jsrun["1234.pending-2"] = ("1234", None, exited)
+    launcher._pending_jsrun["1234.pending-3"] = ("1234", None, None)
+    launcher.step_mapping.add("failed", "1234.pending-2")
+    launcher.step_mapping.add("last", "1234.pending-3")
+    launcher._resolve_jsrun_ids(output)
+    assert "1234.pending-2" not in launcher._pending_jsrun
+    output += "    3    1         1         1         1         0        Running\n"
+    launcher._resolve_jsrun_ids(output)
+    assert launcher.step_mapping["running"].step_id == "1234.3"
+    assert launcher.step_mapping["last"].step_id == "1234.pending-3"
+
+
+def test_job_id_resolved():
+    """Jobs report the jsrun step id once it replaces the placeholder"""
+    launcher = LSFLauncher()
+    jobs = JobManager(threading.RLock(), launcher)
+    model = Model("model", {}, "", RunSettings("echo"))
+    launcher.step_mapping.add("model-step", "1234.pending-0")
+    jobs.add_job("model-step", "1234.pending-0", model, is_task=False)
+
+    launcher._update_step_id("1234.pending-0", "1234.2")
+    jobs._update_job_id(jobs["model"])
+    assert jobs["model"].jid == "1234.2"
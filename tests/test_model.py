@@ -1,3 +1,5 @@
+import os
+
 import pytest
 
 from smartsim import Experiment
@@ -36,3 +38,48 @@ def test_catch_colo_mpmd_model():
     # make it co-located which should raise and error
     with pytest.raises(SSUnsupportedError):
         model.colocate_db()
+
+
+def test_colo_drain_settings():
+    exp = Experiment("experiment", launcher="local")
+    rs = RunSettings("python", exe_args="sleep.py")
+    model = exp.create_model("colo_model", rs)
+
+    model.colocate_db(drain_keys="result_*", drain_to="dumps", drain_interval=60)
+    drain = model.run_settings.colocated_db_settings["drain"]
+    assert drain["keys"] == ["result_*"]
+    assert drain["to"] == os.path.abspath("dumps")
+    assert drain["interval"] == 60
+    assert "drain_to" not in model.run_settings.colocated_db_settings["extra_db_args"]
+
+    with pytest.raises(TypeError):
+        model.colocate_db(drain_keys=[1])
+    with pytest.raises(ValueError):
+        model.colocate_db(drain_keys=["result_*"], drain_interval=0)
+
+
+def test_colo_preload_settings(fileutils):
+    test_dir = fileutils.make_test_dir("test_colo_preload_settings")
+    model_file = os.path.join(test_dir, "model.pt")
+    with open(model_file, "w") as f:
+        f.write("")
+    exp = Experiment("experiment", launcher="local")
+    rs = RunSettings("python", exe_args="sleep.py")
+    model = exp.create_model("colo_model", rs)
+
+    model.colocate_db(models=[{"name": "cnn", "backend": "TORCH", "model_path": model_file}])
+    ml = model.run_settings.colocated_db_settings["ml"]
+    assert [m["name"] for m in ml["models"]] == ["cnn"]
+    assert ml["scripts"] == []
+    assert "models" not in model.run_settings.colocated_db_settings["extra_db_args"]
+
+    model.colocate_db(
+        models=[{"name": "cnn", "backend": "TORCH", "model_path": model_file}],
+        inference_profiles={"cnn*": {"batch_size": 32, "min_batch_timeout": 2}},
+    )
+    ml = model.run_settings.colocated_db_settings["ml"]
+    assert ml["models"][0]["batch_size"] == 32
+    assert ml["models"][0]["min_batch_timeout"] == 2
+
+    with pytest.raises(FileNotFoundError):
+        model.colocate_db(scripts=[{"name": "pre", "script_path": "missing.py"}])
@@ -1,13 +1,18 @@
+import socket
+import subprocess
+import time
+
 import pytest
 
 from smartsim import Experiment
+from smartsim._core.config import CONFIG
 from smartsim.database import (
     CobaltOrchestrator,
     Orchestrator,
     PBSOrchestrator,
     SlurmOrchestrator,
 )
-from smartsim.error import SmartSimError
+from smartsim.error import SmartSimError, SSConfigError
 from smartsim.error.errors import SSUnsupportedError
 
 
@@ -67,6 +72,42 @@ def test_orc_active_functions(fileutils):
         db.get_address()
 
 
+def test_orc_admin_clients(fileutils):
+    try:
+        redis_exe = CONFIG.redis_exe
+    except SSConfigError:
+        pytest.skip("redis-server is not available")
+
+    test_dir = fileutils.make_test_dir("test_orc_admin_clients")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    cmd = [redis_exe, "--port", str(port), "--bind", "127.0.0.1", "--save", ""]
+    proc = subprocess.Popen(cmd, cwd=test_dir, stdout=subprocess.DEVNULL)
+    try:
+        db = Orchestrator(port=port)
+        db._hosts = ["127.0.0.1"]
+        deadline = time.time() + 10
+        while not db.is_active():
+            assert time.time() < deadline
+            time.sleep(0.1)
+
+        # the same pooled connection serves every admin call
+        clients = db._admin_clients()
+        db.set_db_conf("maxclients", "100")
+        assert db._admin_clients() is clients
+        client = clients[("127.0.0.1", port)]
+        assert client.config_get("maxclients") == {"maxclients": "100"}
+        with pytest.raises(SmartSimError):
+            db.set_db_conf("maxclients", "not-a-number")
+        with pytest.raises(TypeError):
+            db.set_db_conf("maxclients", 100)
+    finally:
+        proc.terminate()
+        proc.wait()
+    assert not db.is_active()
+
+
 def test_catch_local_db_errors():
 
     # local database with more than one node not allowed
@@ -120,6 +161,40 @@ def test_slurm_set_run_arg():
     )
 
 
+def test_slurm_replicas():
+    orc = SlurmOrchestrator(
+        6780, db_nodes=3, batch=True, interface="lo", replicas_per_shard=2
+    )
+    assert orc.num_shards == 3
+    assert orc.db_nodes == 9
+    assert orc.batch_settings.batch_args["nodes"] == 9
+    assert len(orc.entities) == 9
+
+    with pytest.raises(SSUnsupportedError):
+        SlurmOrchestrator(6780, db_nodes=1, interface="lo", replicas_per_shard=1)
+    with pytest.raises(ValueError):
+        SlurmOrchestrator(6780, db_nodes=3, interface="lo", replicas_per_shard=-1)
+    with pytest.raises(TypeError):
+        SlurmOrchestrator(6780, db_nodes=3, interface="lo", replicas_per_shard=True)
+
+
+def test_reshard_errors():
+    orc = SlurmOrchestrator(6780, db_nodes=3, batch=False, interface="lo")
+    with pytest.raises(SmartSimError):
+        orc.add_shards(1)
+    with pytest.raises(ValueError):
+        orc.add_shards(0)
+    with pytest.raises(TypeError):
+        orc.remove_shards(True)
+
+    orc = SlurmOrchestrator(6780, db_nodes=3, batch=True, interface="lo")
+    with pytest.raises(SSUnsupportedError):
+        orc.add_shards(1)
+    orc = SlurmOrchestrator(6780, db_nodes=1, batch=False, interface="lo")
+    with pytest.raises(SSUnsupportedError):
+        orc.add_shards(1)
+
+
 def test_slurm_set_batch_arg():
     orc = SlurmOrchestrator(6780, db_nodes=3, batch=False, interface="lo")
     with pytest.raises(SmartSimError):
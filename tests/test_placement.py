@@ -0,0 +1,42 @@
+import pytest
+
+from smartsim._core.utils.placement import place_hosts
+from smartsim.database import Orchestrator
+from smartsim.error import SmartSimError
+from smartsim.settings import MpirunSettings, SrunSettings
+
+NODES = [f"nid{i}" for i in range(6)]
+SWITCHES = {"nid0": "s0", "nid1": "s0", "nid2": "s0", "nid3": "s1", "nid4": "s1"}
+
+
+def test_place_hosts():
+    # one host per switch in turn, unknown nodes are their own switch
+    assert place_hosts(NODES, 3, SWITCHES) == ["nid0", "nid3", "nid5"]
+    assert place_hosts(NODES, 6, SWITCHES) == NODES[:1] + [
+        "nid3",
+        "nid5",
+        "nid1",
+        "nid4",
+        "nid2",
+    ]
+    # without topology the order of the nodes is kept
+    assert place_hosts(NODES, 2) == ["nid0", "nid1"]
+    with pytest.raises(SmartSimError):
+        place_hosts(NODES, 7)
+
+
+def test_place_hosts_avoid():
+    avoid = ["nid0", "nid3"]
+    assert place_hosts(NODES, 3, SWITCHES, avoid) == ["nid1", "nid4", "nid5"]
+    # avoided nodes are used last rather than failing
+    assert place_hosts(NODES, 6, SWITCHES, avoid)[-2:] == ["nid0", "nid3"]
+
+
+def test_orc_place():
+    db = Orchestrator(launcher="slurm", run_command="srun", db_nodes=3, interface="lo")
+    srun = SrunSettings("python")
+    mpirun = MpirunSettings("python")
+    hosts = db.place(NODES, SWITCHES, app_settings=[srun, mpirun])
+    assert hosts == ["nid0", "nid3", "nid5"]
+    assert [node.run_settings.run_args["nodelist"] for node in db] == hosts
+    assert srun.run_args["exclude"] == "nid0,nid3,nid5"
@@ -0,0 +1,341 @@
+import socket
+import socketserver
+import subprocess
+import threading
+import time
+
+import pytest
+import redis
+from rediscluster import RedisCluster
+
+from smartsim._core.config import CONFIG
+from smartsim._core.utils.redis import (
+    _NUM_SLOTS,
+    _assign_replicas,
+    _migrate_slots,
+    _owned_slots,
+    _plan_slot_moves,
+    _slot_range,
+    add_cluster_shards,
+    apply_inference_profiles,
+    check_cluster_status,
+    create_cluster,
+    drain_keys,
+    inference_profile,
+    ml_model_spec,
+    ml_script_spec,
+    preload_ml,
+    remove_cluster_shards,
+    resolve_hosts,
+    restore_keys,
+    wait_for_shards,
+)
+from smartsim.error import SSConfigError, SSInternalError
+
+
+class PongHandler(socketserver.StreamRequestHandler):
+    """Reply to every command like a database shard answering PING"""
+
+    def handle(self):
+        while self.rfile.readline():
+            self.wfile.write(b"+PONG\r\n")
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_resolve_hosts():
+    assert resolve_hosts(["127.0.0.1", "localhost"]) == ["127.0.0.1", "127.0.0.1"]
+
+
+def test_wait_for_shards():
+    servers = []
+    for _ in range(3):
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), PongHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    try:
+        for server in servers:
+            wait_for_shards(["127.0.0.1"], [server.server_address[1]], timeout=5)
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+def test_wait_for_shards_timeout():
+    with pytest.raises(SSInternalError):
+        wait_for_shards(["127.0.0.1"], [get_free_port()], timeout=0.2)
+
+
+def test_wait_for_shards_failed():
+    start = time.time()
+    with pytest.raises(SSInternalError):
+        wait_for_shards(
+            ["127.0.0.1"], [get_free_port()], timeout=30, failed=lambda: True
+        )
+    assert time.time() - start < 5
+
+
+def test_slot_ranges():
+    for num_primaries in (3, 7, 128):
+        ranges = [_slot_range(i, num_primaries) for i in range(num_primaries)]
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == _NUM_SLOTS
+        for (_, stop), (start, _) in zip(ranges, ranges[1:]):
+            assert stop == start
+
+
+def test_create_cluster_too_few_primaries():
+    with pytest.raises(SSInternalError):
+        create_cluster(["127.0.0.1"], [6780, 6781, 6782, 6783], replicas=1)
+
+
+def test_assign_replicas():
+    hosts = ["A", "B", "C"]
+    addresses = [(host, port) for port in (1, 2) for host in hosts]
+    replica_of = _assign_replicas(addresses[:3], addresses[3:], 1)
+    assert sorted(replica_of.values()) == sorted(addresses[:3])
+    for replica, primary in replica_of.items():
+        assert replica[0] != primary[0]
+
+    addresses = [(host, port) for port in (1, 2, 3) for host in hosts]
+    replica_of = _assign_replicas(addresses[:3], addresses[3:], 2)
+    for primary in addresses[:3]:
+        followers = [r for r, p in replica_of.items() if p == primary]
+        assert len(followers) == 2
+        assert all(r[0] != primary[0] for r in followers)
+
+
+def test_plan_slot_moves():
+    a, b, c, d = [("10.0.0.1", p) for p in range(4)]
+    owned = {a: list(range(0, 5461)), b: list(range(5461, 10922))}
+    owned[c] = list(range(10922, _NUM_SLOTS))
+    moves = _plan_slot_moves({**owned, d: []}, [a, b, c, d])
+    assert set(dst for _, dst in moves) == {d}
+    assert sum(len(slots) for slots in moves.values()) == _NUM_SLOTS // 4
+
+    # draining a primary hands all of its slots to the others
+    moves = _plan_slot_moves(owned, [a, b])
+    assert set(src for src, _ in moves) == {c}
+    assert sorted(s for slots in moves.values() for s in slots) == owned[c]
+    assert _plan_slot_moves(owned, [a, b, c]) == {}
+
+
+@pytest.mark.parametrize("replicas", [0, 1])
+def test_create_cluster(fileutils, replicas):
+    try:
+        redis_exe = CONFIG.redis_exe
+    except SSConfigError:
+        pytest.skip("redis-server is not available")
+
+    test_dir = fileutils.make_test_dir(f"test_create_cluster_{replicas}")
+    # the cluster bus listens on port + 10000, which must be valid too
+    ports = set()
+    while len(ports) < 3 * (replicas + 1):
+        port = get_free_port()
+        if port + 10000 < 65536:
+            ports.add(port)
+    ports = sorted(ports)
+    procs = []
+    for port in ports:
+        cmd = [redis_exe, "--port", str(port), "--bind", "127.0.0.1"]
+        cmd += ["--cluster-enabled", "yes", "--save", ""]
+        cmd += ["--cluster-config-file", f"nodes-{port}.conf"]
+        procs.append(subprocess.Popen(cmd, cwd=test_dir, stdout=subprocess.DEVNULL))
+    try:
+        wait_for_shards(["127.0.0.1"], ports, timeout=10)
+        create_cluster(["127.0.0.1"], ports, replicas=replicas)
+        # a retried creation picks up where the first one stopped
+        create_cluster(["127.0.0.1"], ports, replicas=replicas)
+        check_cluster_status(["127.0.0.1"], ports, trials=1)
+
+        client = redis.Redis(host="127.0.0.1", port=ports[0])
+        nodes = client.execute_command("CLUSTER NODES")
+        roles = [node["flags"] for node in nodes.values()]
+        assert sum("master" in flags for flags in roles) == 3
+        assert sum("slave" in flags for flags in roles) == 3 * replicas
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+
+
+def test_reshard_cluster(fileutils):
+    try:
+        redis_exe = CONFIG.redis_exe
+    except SSConfigError:
+        pytest.skip("redis-server is not available")
+
+    test_dir = fileutils.make_test_dir("test_reshard_cluster")
+    port = get_free_port()
+    while port + 10000 >= 65536:
+        port = get_free_port()
+    hosts = [f"127.0.0.{i}" for i in range(1, 5)]
+    procs = []
+    for host in hosts:
+        cmd = [redis_exe, "--port", str(port), "--bind", host]
+        cmd += ["--cluster-enabled", "yes", "--save", ""]
+        cmd += ["--cluster-config-file", f"nodes-{host}.conf"]
+        procs.append(subprocess.Popen(cmd, cwd=test_dir, stdout=subprocess.DEVNULL))
+    try:
+        wait_for_shards(hosts, [port], timeout=10)
+        create_cluster(hosts[:3], [port])
+        cluster = RedisCluster(host=hosts[0], port=port, decode_responses=True)
+        for i in range(500):
+            cluster.set(f"key_{i}", i)
+        # key names are not required to be text
+        binary = RedisCluster(host=hosts[0], port=port)
+        for i in range(50):
+            binary.set(b"\xff\xfe" + bytes([i]), i)
+
+        # a failed move leaves the slots stable so it can be retried
+        clients = {(h, port): redis.Redis(host=h, port=port) for h in hosts[:2]}
+        src, dst = list(clients)
+        # the new owner is unknown to the current one
+        node_ids = {src: clients[src].execute_command("CLUSTER MYID"), dst: "0" * 40}
+        slot = min(_owned_slots(clients[src]))
+        with pytest.raises(redis.ResponseError):
+            _migrate_slots(clients, src, dst, [slot], node_ids, [src, dst])
+        for client in clients.values():
+            nodes = client.execute_command("CLUSTER NODES").values()
+            assert not any(s[0].startswith("[") for n in nodes for s in n["slots"])
+
+        add_cluster_shards(hosts[:3], [port], hosts[3:])
+        client = redis.Redis(host=hosts[3], port=port, decode_responses=True)
+        owned = [len(_owned_slots(redis.Redis(host=h, port=port))) for h in hosts]
+        assert owned == [_NUM_SLOTS // 4] * 4
+        assert client.dbsize() > 0
+        check_cluster_status(hosts, [port], trials=1)
+
+        remove_cluster_shards(hosts[:3], [port], hosts[3:])
+        assert client.dbsize() == 0
+        check_cluster_status(hosts[:3], [port], trials=1)
+        cluster = RedisCluster(host=hosts[0], port=port, decode_responses=True)
+        assert all(cluster.get(f"key_{i}") == str(i) for i in range(500))
+        binary = RedisCluster(host=hosts[0], port=port)
+        assert all(binary.get(b"\xff\xfe" + bytes([i])) == b"%d" % i for i in range(50))
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+
+
+def test_drain_keys(fileutils):
+    try:
+        redis_exe = CONFIG.redis_exe
+    except SSConfigError:
+        pytest.skip("redis-server is not available")
+
+    test_dir = fileutils.make_test_dir("test_drain_keys")
+    ports = [get_free_port(), get_free_port()]
+    procs = []
+    for port in ports:
+        cmd = [redis_exe, "--port", str(port), "--bind", "127.0.0.1", "--save", ""]
+        procs.append(subprocess.Popen(cmd, cwd=test_dir, stdout=subprocess.DEVNULL))
+    try:
+        wait_for_shards(["127.0.0.1"], ports, timeout=10)
+        source, target = [redis.Redis(host="127.0.0.1", port=port) for port in ports]
+        for i in range(25):
+            source.set(f"result_{i}", i)
+            source.set(f"scratch_{i}", i)
+        source.expire("result_0", 1000)
+
+        # batches smaller than the number of keys are pipelined in turn
+        assert drain_keys(source, ["result_*"], target, batch_size=10) == 25
+        assert sorted(target.keys()) == sorted(source.keys("result_*"))
+        assert 0 < target.pttl("result_0") <= 1000 * 1000
+        assert target.pttl("result_1") == -1
+
+        source.set(b"scratch_1\xff", b"\x00\xff")
+        source.set("scratch_1_expiring", 1, px=300)
+        dump_file = f"{test_dir}/node.dump"
+        with open(dump_file, "wb") as f:
+            assert drain_keys(source, ["scratch_1*", "result_2"], f) == 14
+        # the expiry is absolute, keys that expired on disk are skipped
+        time.sleep(0.5)
+        assert restore_keys(dump_file, target, batch_size=5) == 13
+        assert target.get("scratch_10") == b"10"
+        assert target.get(b"scratch_1\xff") == b"\x00\xff"
+        assert not target.exists("scratch_1_expiring")
+
+        with open(dump_file, "rb") as f:
+            content = f.read()
+        with open(dump_file, "wb") as f:
+            f.write(content[:-1])
+        with pytest.raises(SSInternalError):
+            restore_keys(dump_file, target)
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+
+
+class _RecordingClient:
+    def __init__(self):
+        self.calls = []
+
+    def set_model_from_file(self, name, model_file, backend, **kwargs):
+        self.calls.append(("model", name, model_file, backend, kwargs))
+
+    def set_script_from_file(self, name, file, device="CPU"):
+        self.calls.append(("script", name, file, device))
+
+
+def test_preload_ml(fileutils):
+    test_dir = fileutils.make_test_dir("test_preload_ml")
+    model_file = f"{test_dir}/model.pt"
+    script_file = f"{test_dir}/script.py"
+    for path in (model_file, script_file):
+        with open(path, "w") as f:
+            f.write("")
+
+    model = ml_model_spec("cnn", "torch", model_file, device="gpu", batch_size=8)
+    assert model["backend"] == "TORCH" and model["device"] == "GPU"
+    script = ml_script_spec("pre", script_file)
+    with pytest.raises(ValueError):
+        ml_model_spec("cnn", "caffe", model_file)
+    with pytest.raises(ValueError):
+        ml_model_spec("cnn", "TORCH", model_file, batch_size=-1)
+    with pytest.raises(FileNotFoundError):
+        ml_script_spec("pre", f"{test_dir}/missing.py")
+
+    client = _RecordingClient()
+    preload_ml(client, [model], [script])
+    assert client.calls[0][:4] == ("model", "cnn", model_file, "TORCH")
+    assert client.calls[0][4]["batch_size"] == 8
+    # only passed when set, older clients do not know it
+    assert "min_batch_timeout" not in client.calls[0][4]
+    assert client.calls[1] == ("script", "pre", script_file, "CPU")
+
+
+def test_inference_profiles(fileutils):
+    test_dir = fileutils.make_test_dir("test_inference_profiles")
+    model_file = f"{test_dir}/model.pt"
+    with open(model_file, "w") as f:
+        f.write("")
+    models = [
+        ml_model_spec("cnn_small", "TORCH", model_file, batch_size=4),
+        ml_model_spec("cnn_large", "TORCH", model_file),
+        ml_model_spec("mlp", "TORCH", model_file),
+    ]
+    assert inference_profile(device="gpu", min_batch_size=2) == {
+        "device": "GPU",
+        "min_batch_size": 2,
+    }
+    with pytest.raises(ValueError):
+        inference_profile(batch_size=-1)
+
+    profiles = {
+        "cnn_*": inference_profile(batch_size=16, min_batch_timeout=5),
+        "cnn_large": inference_profile(device="GPU", batch_size=64),
+    }
+    profiled = apply_inference_profiles(models, profiles)
+    assert [m["batch_size"] for m in profiled] == [16, 64, 0]
+    assert [m["device"] for m in profiled] == ["CPU", "GPU", "CPU"]
+    assert profiled[1]["min_batch_timeout"] == 5
+    # the added models are left untouched
+    assert models[0]["batch_size"] == 4
@@ -89,3 +89,44 @@ def test_bad_exe_args_2():
     with pytest.raises(TypeError):
         _ = RunSettings("python", exe_args=exe_args)
 
+
+def test_copy_on_write():
+    """test that copies record changes without modifying the original"""
+    settings = RunSettings(
+        "python", exe_args="sleep.py", run_args={"a": 1, "b": 2}, env_vars={"X": "1"}
+    )
+    rs_copy = settings._copy_on_write()
+    assert rs_copy.run_args == {"a": 1, "b": 2}
+    assert rs_copy.env_vars == {"X": "1"}
+
+    rs_copy.run_args["c"] = 3
+    del rs_copy.run_args["a"]
+    rs_copy.update_env({"Y": "2"})
+    rs_copy.add_exe_args("--time=5")
+
+    assert rs_copy.run_args == {"b": 2, "c": 3}
+    assert rs_copy.env_vars == {"X": "1", "Y": "2"}
+    assert rs_copy.exe_args == ["sleep.py", "--time=5"]
+    assert rs_copy.format_run_args() == ["b", "2", "c", "3"]
+
+    assert settings.run_args == {"a": 1, "b": 2}
+    assert settings.env_vars == {"X": "1"}
+    assert settings.exe_args == ["sleep.py"]
+
+    with pytest.raises(KeyError):
+        del rs_copy.run_args["a"]
+
+
+def test_copy_on_write_nested():
+    """test that nested values and MPMD settings are not shared"""
+    settings = MpirunSettings("python", run_args={"host": ["a", "b"]})
+    settings.make_mpmd(MpirunSettings("python", run_args={"np": 2}))
+    rs_copy = settings._copy_on_write()
+
+    rs_copy.run_args["host"].append("c")
+    rs_copy.mpmd[0].run_args["np"] = 4
+    assert rs_copy.run_args["host"] == ["a", "b", "c"]
+    assert rs_copy.mpmd[0].run_args["np"] == 4
+
+    assert settings.run_args["host"] == ["a", "b"]
+    assert settings.mpmd[0].run_args["np"] == 2
@@ -0,0 +1,80 @@
+import pytest
+
+from smartsim._core.launcher.slurm.slurmInventory import NodeInventory
+from smartsim.error import LauncherError
+
+SINFO_OUTPUT = (
+    "debug*|nid00001|36|idle|haswell\n"
+    "debug*|nid00002|36|alloc|haswell\n"
+    "debug*|nid00003|68|idle~|knl,quad\n"
+    "compute|nid00001|36|idle|haswell\n"
+    "compute|nid00004|36|idle|haswell\n"
+    "compute|nid00005|36|mix|haswell\n"
+    "compute|nid00006|36|idle|haswell\n"
+    "compute|nid00007|36|idle|haswell\n"
+    "compute|nid00008|36|drain*|(null)\n"
+)
+
+
+def get_inventory():
+    # the ttl keeps the loaded inventory, sinfo is never called
+    inventory = NodeInventory(ttl=3600)
+    inventory.load(SINFO_OUTPUT)
+    return inventory
+
+
+def test_inventory_partitions():
+    inventory = get_inventory()
+    assert inventory.default_partition == "debug"
+    assert sorted(inventory.partitions) == ["compute", "debug"]
+    assert inventory.get_cpus("nid00003") == 68
+
+
+def test_inventory_count_nodes():
+    inventory = get_inventory()
+    assert inventory.count_nodes("debug") == 3
+    assert inventory.count_nodes("debug", min_cpus=37) == 1
+    assert inventory.count_nodes("compute", min_cpus=100) == 0
+    with pytest.raises(LauncherError):
+        inventory.count_nodes("gpu")
+
+
+def test_inventory_get_nodes():
+    inventory = get_inventory()
+    assert inventory.get_nodes(feature="knl") == ["nid00003"]
+    assert inventory.get_nodes(partition="debug", state="idle") == [
+        "nid00001",
+        "nid00003",
+    ]
+    assert inventory.get_nodes(state="drain") == ["nid00008"]
+    assert inventory.get_nodes(partition="debug", min_cpus=40) == ["nid00003"]
+
+
+def test_inventory_select_hosts():
+    inventory = get_inventory()
+    # hosts are spread over the idle nodes
+    assert inventory.select_hosts(4, partition="compute") == [
+        "nid00001",
+        "nid00004",
+        "nid00006",
+        "nid00007",
+    ]
+    with pytest.raises(LauncherError):
+        inventory.select_hosts(5, partition="compute")
+
+
+def test_inventory_select_hosts_handed_out():
+    inventory = get_inventory()
+    assert inventory.select_hosts(2, partition="compute") == ["nid00001", "nid00006"]
+    # hosts already handed out are not idle anymore, before sinfo is queried
+    assert inventory.select_hosts(2, partition="compute") == ["nid00004", "nid00007"]
+    with pytest.raises(LauncherError):
+        inventory.select_hosts(1, partition="compute")
+
+    # a host is only released once sinfo has seen its job
+    inventory.load(SINFO_OUTPUT)
+    assert inventory.get_nodes(partition="compute", state="idle") == []
+    busy = SINFO_OUTPUT.replace("nid00004|36|idle", "nid00004|36|alloc")
+    inventory.load(busy)
+    inventory.load(SINFO_OUTPUT)
+    assert inventory.get_nodes(partition="compute", state="idle") == ["nid00004"]
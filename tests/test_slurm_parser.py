@@ -251,3 +251,46 @@ def test_parse_sacct_status_2():
     status = ("FAILED", "1")
     parsed_status = slurmParser.parse_sacct(output, "22999.1")
     assert status == parsed_status
+
+
+def test_parse_sacct_array():
+    """test retrieval of the status of every task of an array job"""
+    output = (
+        "1234_0|COMPLETED|0:0|\n"
+        "1234_0.batch|COMPLETED|0:0|\n"
+        "1234_1|RUNNING|0:0|\n"
+        "1234_[2-5]|PENDING|0:0|\n"
+        "12345|FAILED|1:0|\n"
+    )
+    tasks = slurmParser.parse_sacct_array(output, "1234")
+    assert tasks == [("COMPLETED", "0"), ("RUNNING", "0"), ("PENDING", "0")]
+    assert slurmParser.parse_sacct_array(output, "12345") == []
+
+
+def test_expand_hostlist():
+    hostlist = "nid[00008-00010,00012],login1,gpu[1-2]-ib"
+    assert slurmParser.expand_hostlist(hostlist) == [
+        "nid00008",
+        "nid00009",
+        "nid00010",
+        "nid00012",
+        "login1",
+        "gpu1-ib",
+        "gpu2-ib",
+    ]
+    assert slurmParser.expand_hostlist("None assigned") == ["None assigned"]
+    assert slurmParser.expand_hostlist("") == []
+
+
+def test_parse_topology():
+    output = (
+        "SwitchName=s0 Level=0 LinkSpeed=1 Nodes=nid[001-002]\n"
+        "SwitchName=s1 Level=0 LinkSpeed=1 Nodes=nid[003-004]\n"
+        "SwitchName=s2 Level=1 LinkSpeed=1 Switches=s[0-1]\n"
+    )
+    assert slurmParser.parse_topology(output) == {
+        "nid001": "s0",
+        "nid002": "s0",
+        "nid003": "s1",
+        "nid004": "s1",
+    }
@@ -0,0 +1,34 @@
+import time
+
+from smartsim._core.launcher.taskManager import TaskManager
+
+
+def _wait_for_exit(task_manager, task_id, timeout=10):
+    start = time.time()
+    while time.time() - start < timeout:
+        _, rc, _, _ = task_manager.get_task_update(task_id)
+        if rc is not None:
+            return rc
+        time.sleep(0.1)
+    return None
+
+
+def test_task_manager_restarts():
+    task_manager = TaskManager()
+    assert not task_manager.actively_monitoring
+
+    # starting a task starts the monitor without the launcher asking
+    task_id = task_manager.start_task(["true"], ".")
+    assert task_manager.actively_monitoring
+    assert _wait_for_exit(task_manager, task_id) == 0
+
+    # the monitor stops once no tasks are left...
+    start = time.time()
+    while task_manager.actively_monitoring and time.time() - start < 10:
+        time.sleep(0.1)
+    assert not task_manager.actively_monitoring
+
+    # ...and the next task starts it again
+    task_id = task_manager.start_task(["sleep", "0.5"], ".")
+    assert task_manager.actively_monitoring
+    assert _wait_for_exit(task_manager, task_id) == 0
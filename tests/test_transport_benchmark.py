@@ -0,0 +1,27 @@
+from smartsim._core.entrypoints.transport_benchmark import compare, format_results
+
+
+class _FakeRedis:
+    """Stores values in memory instead of a database"""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def get(self, key):
+        return self.data[key]
+
+    def delete(self, key):
+        self.data.pop(key)
+
+
+def test_compare_transports():
+    clients = {"tcp": _FakeRedis(), "uds": _FakeRedis()}
+    results = compare(clients, size=16, requests=50)
+    assert list(results) == ["tcp", "uds"]
+    assert all(0 <= r["p50"] <= r["p99"] for r in results.values())
+    # the benchmark value is removed afterwards
+    assert all(not client.data for client in clients.values())
+    assert len(format_results(results).splitlines()) == 3